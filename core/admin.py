@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Brigade, Detachment, User, UserSession, Nomenclature, Equipment, Testing
+from .models import Brigade, Detachment, User, UserSession, Category, Nomenclature, Equipment, Testing, BrigadeEquipmentType
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 @admin.register(Brigade)
@@ -25,6 +25,11 @@ class UserSessionAdmin(admin.ModelAdmin):
     list_display = ("id","user","session_id","expires_at")
     search_fields = ("session_id","user__username")
 
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("id","name")
+    search_fields = ("name",)
+
 @admin.register(Nomenclature)
 class NomenclatureAdmin(admin.ModelAdmin):
     list_display = ("id","name","category","slug","unit","active")
@@ -34,10 +39,15 @@ class NomenclatureAdmin(admin.ModelAdmin):
 @admin.register(Equipment)
 class EquipmentAdmin(admin.ModelAdmin):
     list_display = ("id","inventory_number","name","type","brigade","nomenclature","detachment")
-    list_filter = ("brigade","type","nomenclature__category")
+    list_filter = ("brigade","category_ref")
     search_fields = ("inventory_number","name")
 
 @admin.register(Testing)
 class TestingAdmin(admin.ModelAdmin):
     list_display = ("id","equipment","date","result","next_date")
     list_filter = ("result","date")
+
+@admin.register(BrigadeEquipmentType)
+class BrigadeEquipmentTypeAdmin(admin.ModelAdmin):
+    list_display = ("id","brigade","type_id","name")
+    list_filter = ("brigade",)
@@ -0,0 +1,52 @@
+"""
+Дерево бригада → загони для адмінки.
+
+Будується фіксованою кількістю запитів (бригади, загони, пари
+brigade/detachment з Equipment) і кешується; кеш скидається сигналами
+при зміні Equipment / Brigade / Detachment (див. core.signals).
+"""
+from django.core.cache import cache
+
+from .models import Brigade, Detachment, Equipment
+
+ADMIN_TREE_CACHE_KEY = "core:admin_tree"
+ADMIN_TREE_TTL = 60 * 60
+
+
+def build_admin_tree() -> dict:
+    dets = {d["id"]: d for d in Detachment.objects.order_by("id").values("id", "name")}
+    pairs = (
+        Equipment.objects.filter(detachment__isnull=False)
+        .values_list("brigade_id", "detachment_id")
+        .order_by()
+        .distinct()
+    )
+    by_brigade: dict[int, set] = {}
+    used = set()
+    for brigade_id, det_id in pairs:
+        by_brigade.setdefault(brigade_id, set()).add(det_id)
+        used.add(det_id)
+
+    brigades = []
+    for b in Brigade.objects.order_by("id").values("id", "name"):
+        ids = sorted(by_brigade.get(b["id"], ()))
+        brigades.append({
+            "id": b["id"],
+            "name": b["name"],
+            "detachments": [dets[i] for i in ids if i in dets],
+        })
+    # Загони, які взагалі ні до якої бригади не "підв’язані" через Equipment
+    unassigned = [d for i, d in dets.items() if i not in used]
+    return {"brigades": brigades, "unassignedDetachments": unassigned}
+
+
+def get_admin_tree() -> dict:
+    tree = cache.get(ADMIN_TREE_CACHE_KEY)
+    if tree is None:
+        tree = build_admin_tree()
+        cache.set(ADMIN_TREE_CACHE_KEY, tree, ADMIN_TREE_TTL)
+    return tree
+
+
+def invalidate_admin_tree():
+    cache.delete(ADMIN_TREE_CACHE_KEY)
@@ -0,0 +1,125 @@
+"""
+Async-варіанти read-ендпоінтів для ASGI (uvicorn / daphne).
+
+Під WSGI ці view не використовуються. Під ASGI (ASYNC_READ_VIEWS, вмикається
+в asgi.py) GET/HEAD відповідних маршрутів обслуговує async-view з async ORM,
+тож запит не тримає потік, поки чекає на MySQL; решта методів іде в
+синхронний DRF-view. Вихід і кеш відповідей — спільні з синхронними view.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.views import View
+from rest_framework import exceptions
+
+from .authentication import aauthenticate_session
+from .categories import afilter_category
+from .conditional import acatalog_conditional
+from .fast_serializers import FastEquipmentSerializer, FastJavaTestingSerializer, FastTestingTextSerializer
+from .models import Equipment, Testing
+from .pagination import EquipmentPagination, TestingPagination
+from .renderers import OrjsonResponse
+from .response_cache import abrigade_cached
+from .scoping import get_scope
+from .streaming import aiter_rows, ndjson_response, wants_ndjson
+from .type_registry import aall_type_names, aresolve_type, stable_id
+
+
+def read_view(sync_cls, async_cls):
+    """View для urls.py: під ASGI — GET/HEAD через async_cls, інше — sync_cls."""
+    sync_view = sync_cls.as_view()
+    if not getattr(settings, "ASYNC_READ_VIEWS", False):
+        return sync_view
+    async_view = async_cls.as_view()
+    sync_call = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await async_view(request, *args, **kwargs)
+        return await sync_call(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    view.cls = sync_cls  # бюджети запитів беруться з синхронного view (core.instrumentation)
+    return view
+
+
+async def alist_response(request, qs, lister, paginator):
+    """Async-аналог views.list_response (лише fast-серіалізатори)."""
+    if wants_ndjson(request):
+        return ndjson_response(aiter_rows(lister.rows(qs, named=True), lister.to_representation, paginator))
+    page = await paginator.apaginate_queryset(lister.rows(qs, named=True), request)
+    if page is not None:
+        return OrjsonResponse(paginator.get_paginated_data(lister.many(page)))
+    return OrjsonResponse(lister.many([row async for row in lister.rows(qs)]))
+
+
+class AsyncReadView(View):
+    """Сесійна авторизація (SessionIDAuthentication) і права як у DRF-view, включно з областю доступу."""
+    http_method_names = ["get", "head", "options"]
+    require_rw = False
+    cache_name = None  # назва синхронного view — спільний кеш відповідей
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await aauthenticate_session(request)
+        except exceptions.AuthenticationFailed as exc:
+            return OrjsonResponse({"detail": str(exc.detail)}, status=403)
+        if user is None:
+            return OrjsonResponse({"detail": str(exceptions.NotAuthenticated.default_detail)}, status=403)
+        if self.require_rw and not (user.is_superuser or user.mode in ("RW", "GOD")):
+            return OrjsonResponse({"detail": str(exceptions.PermissionDenied.default_detail)}, status=403)
+        if "brigade_id" in kwargs and not get_scope(user).allows_brigade(kwargs["brigade_id"]):
+            return OrjsonResponse({"detail": "brigade is outside of user scope"}, status=403)  # як views.BrigadeScoped
+        request.user = user
+        request.query_params = request.GET  # спільні хелпери (пагінація, stream) читають DRF-атрибут
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncBrigadeEquipmentList(AsyncReadView):
+    cache_name = "BrigadeEquipmentList"
+
+    @abrigade_cached()
+    async def get(self, request, brigade_id: int):
+        category_id = request.GET.get("category_id")
+        category = request.GET.get("category")
+        qs = get_scope(request.user).equipment(Equipment.objects.filter(brigade_id=brigade_id))
+        if category_id:
+            qs = qs.filter(nomenclature_id=category_id)
+        elif category:
+            qs = await afilter_category(qs, category)
+        return await alist_response(request, qs, FastEquipmentSerializer(request), EquipmentPagination())
+
+
+class AsyncEquipmentTypesPseudoView(AsyncReadView):
+    @acatalog_conditional
+    async def get(self, request):
+        names = await aall_type_names()
+        return OrjsonResponse([{"id": stable_id(n), "name": n, "slug": ""} for n in sorted(names)])
+
+
+class AsyncJavaTestingEquipmentView(AsyncReadView):
+    require_rw = True
+    cache_name = "JavaTestingEquipmentView"
+
+    @abrigade_cached()
+    async def get(self, request, brigade_id: int, equip_type_id: int):
+        type_name = await aresolve_type(brigade_id, equip_type_id)
+        if type_name is None:
+            return OrjsonResponse({"message":"equipment type not found"}, status=404)
+        qs = await afilter_category(get_scope(request.user).equipment(Testing.objects.filter(
+            equipment__brigade_id=brigade_id
+        ), "equipment__"), type_name, "equipment__")
+        lister = FastJavaTestingSerializer(request)
+        return OrjsonResponse({"testingItems": lister.many([row async for row in lister.rows(qs)])})
+
+
+class AsyncTestingByTypeTextView(AsyncReadView):
+    cache_name = "TestingByTypeTextView"
+
+    @abrigade_cached(lambda request, **kwargs: request.user.brigade_id)
+    async def get(self, request, type_text: str):
+        tt = type_text.lower()
+        qs = get_scope(request.user).equipment(
+            Testing.objects.filter(equipment__brigade_id=request.user.brigade_id), "equipment__"
+        ).filter(Q(equipment__type__icontains=tt) | Q(equipment__category_ref__name__icontains=tt))
+        return await alist_response(request, qs, FastTestingTextSerializer(request), TestingPagination())
@@ -1,21 +1,49 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
-from django.utils import timezone
 from .models import UserSession
+from .session_cache import session_cache
+
+
+def get_session_id(request):
+    return request.META.get("HTTP_SESSION_ID") or request.headers.get("session-id")
+
 
 class SessionIDAuthentication(BaseAuthentication):
     """
     Читає заголовок 'session-id' і аутентифікує користувача через UserSession.
+    Сесії кешуються (див. core.session_cache), тож у сталому режимі БД не чіпаємо.
     """
     def authenticate(self, request):
-        sid = request.META.get("HTTP_SESSION_ID") or request.headers.get("session-id")
+        sid = get_session_id(request)
         if not sid:
             return None
+        entry = session_cache.get(sid)
+        if entry is None:
+            try:
+                entry = session_cache.load(sid)
+            except UserSession.DoesNotExist:
+                raise exceptions.AuthenticationFailed("Session expired")
+        if session_cache.expired(sid, entry):
+            raise exceptions.AuthenticationFailed("Session expired")
+        session_cache.touch(sid, entry)
+        return (entry.user, None)
+
+
+async def aauthenticate_session(request):
+    """
+    Те саме для async-view (поза DRF): користувач або None без заголовка;
+    кидає AuthenticationFailed для невалідної / протермінованої сесії.
+    """
+    sid = get_session_id(request)
+    if not sid:
+        return None
+    entry = await session_cache.aget(sid)
+    if entry is None:
         try:
-            s = UserSession.objects.select_related("user").get(session_id=sid)
+            entry = await session_cache.aload(sid)
         except UserSession.DoesNotExist:
             raise exceptions.AuthenticationFailed("Session expired")
-        if not s.is_active():
-            s.delete()
-            raise exceptions.AuthenticationFailed("Session expired")
-        return (s.user, None)
+    if await session_cache.aexpired(sid, entry):
+        raise exceptions.AuthenticationFailed("Session expired")
+    await session_cache.atouch(sid, entry)
+    return entry.user
@@ -0,0 +1,37 @@
+"""
+MySQL-бекенд з опційним пулом з'єднань (ENGINE = 'core.backends.mysql').
+
+Під ASGI постійні з'єднання (CONN_MAX_AGE) не рекомендуються — з'єднання
+прив'язане до потоку і закривається в кінці запиту. З DATABASES[...]['POOL']
+«закриття» повертає з'єднання драйвера в пул (core.backends.mysql.pool), а
+наступне відкриття бере його звідти: замість TCP + auth handshake — нічого
+або ping. Без POOL поводиться як django.db.backends.mysql.
+"""
+from django.db.backends.mysql import base as mysql
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(mysql.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get("POOL")
+        return get_pool(self.alias, options) if options else None
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.errors_occurred or self.in_atomic_block:
+                # зламане або закрите посеред транзакції — не повертаємо в пул
+                pool.discard(self.connection)
+            else:
+                pool.release(self.connection)
@@ -0,0 +1,89 @@
+"""
+In-process пул «сирих» з'єднань драйвера БД.
+
+Не залежить від Django: `acquire(connect)` віддає вільне з'єднання (LIFO,
+найсвіжіше) або створює нове через `connect()`; `release(conn)` відкочує
+незавершену транзакцію і повертає з'єднання в пул (або закриває, якщо пул
+повний). З'єднання, що простояло довше `check_after` секунд, перед видачею
+перевіряється ping(); довше `max_idle` — закривається.
+"""
+import threading
+import time
+
+
+class ConnectionPool:
+    def __init__(self, max_size: int = 10, max_idle: float = 300.0, check_after: float = 10.0, ping=None):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.ping = ping or (lambda conn: conn.ping())
+        self._idle = []  # [(conn, returned_at)]
+        self._lock = threading.Lock()
+        self.created = self.reused = self.discarded = 0
+
+    def acquire(self, connect):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, returned_at = self._idle.pop()
+            idle = time.monotonic() - returned_at
+            if idle > self.max_idle:
+                self.discard(conn)
+                continue
+            if idle > self.check_after:
+                try:
+                    self.ping(conn)
+                except Exception:
+                    self.discard(conn)
+                    continue
+            with self._lock:
+                self.reused += 1
+            return conn
+        conn = connect()
+        with self._lock:
+            self.created += 1
+        return conn
+
+    def release(self, conn):
+        try:
+            conn.rollback()  # незавершена транзакція не переходить до наступного запиту
+        except Exception:
+            self.discard(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self.discard(conn)
+
+    def discard(self, conn):
+        with self._lock:
+            self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self.discard(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"idle": len(self._idle), "created": self.created,
+                    "reused": self.reused, "discarded": self.discarded}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, options: dict) -> ConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(**options)
+        return pool
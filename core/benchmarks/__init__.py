@@ -0,0 +1,14 @@
+"""
+Бенчмарки та навантажувальні тести API.
+
+  manage.py bench_seed   — синтетичний датасет (brigades / detachments / nomenclature /
+                           equipment / testing), префікс "bench-";
+  manage.py bench_api    — прогін усіх маршрутів core/urls.py через Django test client
+                           (p50/p95/p99, к-сть SQL, пам'ять) і/або HTTP-навантаження
+                           на запущений сервер; порівняння з baseline;
+  manage.py bench_asgi   — WSGI проти ASGI (async-view) на тих самих read-маршрутах, напр.:
+                             gunicorn pozeza_project.wsgi -w 1 --threads 8 -b :8000
+                             uvicorn pozeza_project.asgi:application --port 8001
+                             manage.py bench_asgi --wsgi http://127.0.0.1:8000 --asgi http://127.0.0.1:8001
+  manage.py bench_db     — вартість з'єднання з БД на запит: нове / постійне / пул, драйвер.
+"""
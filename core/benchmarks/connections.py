@@ -0,0 +1,93 @@
+"""
+Накладні витрати на з'єднання з БД у розрахунку на один запит.
+
+Кожна «ітерація» — це те, що робить запит до API з точки зору з'єднання:
+отримати з'єднання, виконати SELECT 1, віддати. Режими:
+
+  connect     — нове з'єднання на кожен запит (CONN_MAX_AGE=0, як було);
+  persistent  — одне постійне з'єднання (CONN_MAX_AGE > 0);
+  health      — постійне + перевірка на початку запиту (CONN_HEALTH_CHECKS);
+  pool        — core.backends.mysql.pool (ASGI), ping лише після простою;
+  pool-ping   — пул з ping при кожній видачі (найгірший випадок).
+"""
+import time
+
+from django.db import connections
+
+from ..backends.mysql.pool import ConnectionPool
+from .stats import summarize
+
+
+def _query(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT 1")
+    cur.fetchall()
+    cur.close()
+
+
+def _ping(conn):
+    ping = getattr(conn, "ping", None)
+    if ping is not None:
+        ping()
+    else:  # sqlite та ін. — як is_usable() бекендів без ping
+        _query(conn)
+
+
+def driver_name(alias: str = "default") -> str:
+    db = connections[alias].Database
+    return f"{db.__name__} {getattr(db, '__version__', '')}".strip()
+
+
+def run(alias: str = "default", iterations: int = 200, log=print) -> dict:
+    wrapper = connections[alias]
+    params = wrapper.get_connection_params()
+    connect = lambda: wrapper.Database.connect(**params)  # noqa: E731
+
+    def per_request_connect():
+        conn = connect()
+        _query(conn)
+        conn.close()
+
+    persistent = connect()
+
+    def per_request_persistent():
+        _query(persistent)
+
+    def per_request_health():
+        _ping(persistent)
+        _query(persistent)
+
+    pool = ConnectionPool(max_size=4, ping=_ping)
+    pool_ping = ConnectionPool(max_size=4, check_after=0, ping=_ping)
+
+    def via(p):
+        def per_request():
+            conn = p.acquire(connect)
+            _query(conn)
+            p.release(conn)
+        return per_request
+
+    modes = {
+        "connect": per_request_connect,
+        "persistent": per_request_persistent,
+        "health": per_request_health,
+        "pool": via(pool),
+        "pool-ping": via(pool_ping),
+    }
+    results = {}
+    try:
+        for name, fn in modes.items():
+            fn()  # прогрів
+            latencies = []
+            for _ in range(iterations):
+                t0 = time.perf_counter()
+                fn()
+                latencies.append(time.perf_counter() - t0)
+            r = results[f"db:{name}"] = summarize(latencies)
+            r["mean"] = round(sum(latencies) / len(latencies) * 1000, 3)
+            log(f"db:{name:<12} mean {r['mean']:8.3f}  p50 {r['p50']:8.3f}  p95 {r['p95']:8.3f} ms")
+    finally:
+        persistent.close()
+        pool.close_all()
+        pool_ping.close_all()
+    return results
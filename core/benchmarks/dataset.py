@@ -0,0 +1,139 @@
+"""Синтетичний датасет для бенчмарків (усе з префіксом "bench-")."""
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import categories
+from core.latest_testing import refresh_latest_testing
+from core.models import Brigade, Detachment, Equipment, Nomenclature, Testing, User, UserSession
+from core.serializers import _guess_category
+from core.signals import bulk_equipment_changed
+from core.stats import rebuild as rebuild_stats
+from core.type_registry import stable_id
+
+PREFIX = "bench-"
+USERNAME = "bench-admin"
+PASSWORD = "bench-pass"
+BATCH = 5000
+
+# базові назви → різні категорії через _guess_category
+NOMENCLATURE_STEMS = ("Драбина", "Мотузка", "Рукавиці", "Ремінь", "Карабін")
+RESULTS = ("придатно", "непридатно")
+
+
+@dataclass
+class BenchContext:
+    user: User
+    brigade: Brigade
+    detachment: Detachment
+    equipment: Equipment
+    testing: Testing
+    type_name: str
+
+    @property
+    def type_id(self) -> int:
+        return stable_id(self.type_name)
+
+
+def clean():
+    Brigade.objects.filter(name__startswith=PREFIX).delete()
+    Detachment.objects.filter(name__startswith=PREFIX).delete()
+    Nomenclature.objects.filter(slug__startswith=PREFIX).delete()
+    User.objects.filter(username=USERNAME).delete()
+
+
+def _batched(objs, model):
+    batch = []
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) >= BATCH:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed(brigades=3, detachments=6, nomenclature=20, equipment=3000, testings=30000, log=print):
+    """Створює датасет; testing-рядки генеруються потоково, пам'ять не росте з їх кількістю."""
+    clean()
+    with transaction.atomic():
+        user = User(username=USERNAME, mode=User.MODE_GOD)
+        user.set_password(PASSWORD)
+        user.save()
+        Brigade.objects.bulk_create([Brigade(name=f"{PREFIX}brigade-{i}") for i in range(brigades)])
+        Detachment.objects.bulk_create([Detachment(name=f"{PREFIX}det-{i}") for i in range(detachments)])
+        names = [f"{NOMENCLATURE_STEMS[i % len(NOMENCLATURE_STEMS)]} {PREFIX}{i}" for i in range(nomenclature)]
+        category_ids = categories.category_ids(_guess_category(name) for name in names)
+        Nomenclature.objects.bulk_create([
+            Nomenclature(name=name, category=_guess_category(name), category_ref_id=category_ids[_guess_category(name)],
+                         slug=f"{PREFIX}{i}")
+            for i, name in enumerate(names)
+        ])
+
+        brigade_ids = list(Brigade.objects.filter(name__startswith=PREFIX).values_list("id", flat=True))
+        det_ids = list(Detachment.objects.filter(name__startswith=PREFIX).values_list("id", flat=True))
+        noms = list(Nomenclature.objects.filter(slug__startswith=PREFIX))
+        user.brigade_id = brigade_ids[0]
+        user.save(update_fields=["brigade"])
+        user.detachments.set(det_ids[:2])
+
+        log(f"equipment: {equipment}")
+        _batched((
+            Equipment(
+                brigade_id=brigade_ids[i % len(brigade_ids)],
+                inventory_number=f"BN{i:08d}",
+                name=noms[i % len(noms)].name,
+                type=noms[i % len(noms)].category,
+                nomenclature=noms[i % len(noms)],
+                category_ref_id=noms[i % len(noms)].category_ref_id,
+                description=f"{PREFIX}item {i}",
+                detachment_id=det_ids[i % len(det_ids)] if det_ids else None,
+            ) for i in range(equipment)
+        ), Equipment)
+
+    eq_ids = list(Equipment.objects.filter(brigade_id__in=brigade_ids).order_by("id").values_list("id", flat=True))
+    start = date.today() - timedelta(days=3 * 365)
+    log(f"testing: {testings}")
+    with transaction.atomic():
+        _batched((
+            Testing(
+                equipment_id=eq_ids[i % len(eq_ids)],
+                date=start + timedelta(days=(i // len(eq_ids)) * 30 + i % 30),
+                result=RESULTS[i % 7 == 0],
+                next_date=start + timedelta(days=(i // len(eq_ids)) * 30 + i % 30 + 365),
+            ) for i in range(testings)
+        ), Testing)
+
+    log("derived data (registry, search, snapshots, stats) ...")
+    for brigade_id in brigade_ids:
+        bulk_equipment_changed(brigade_id)
+    for s in range(0, len(eq_ids), BATCH):
+        with transaction.atomic():
+            refresh_latest_testing(eq_ids[s:s + BATCH])
+    rebuild_stats(brigade_ids)
+    return context()
+
+
+def context() -> BenchContext:
+    user = User.objects.get(username=USERNAME)
+    brigade = Brigade.objects.filter(name__startswith=PREFIX).order_by("id").first()
+    if brigade is None:
+        raise LookupError("bench dataset not found, run `manage.py bench_seed` first")
+    equipment = Equipment.objects.filter(brigade=brigade).exclude(testings=None).order_by("id").first()
+    return BenchContext(
+        user=user,
+        brigade=brigade,
+        detachment=Detachment.objects.filter(name__startswith=PREFIX).order_by("id").first(),
+        equipment=equipment,
+        testing=Testing.objects.filter(equipment=equipment).first(),
+        type_name=equipment.type,
+    )
+
+
+def new_session(user) -> str:
+    sid = f"{PREFIX}{uuid.uuid4().hex}"[:64]
+    UserSession.objects.create(user=user, session_id=sid, expires_at=timezone.now() + timedelta(hours=8))
+    return sid
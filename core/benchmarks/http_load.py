@@ -0,0 +1,72 @@
+"""
+Конкурентне HTTP-навантаження на запущений сервер (runserver / gunicorn / uvicorn).
+
+Лише GET-маршрути (записи змінювали б датасет). Використовує stdlib:
+потоки + urllib, тож нічого додатково ставити не треба.
+"""
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from .dataset import PASSWORD, USERNAME
+from .routes import ROUTES, resolve
+from .stats import summarize
+
+
+def login(base_url: str) -> str:
+    req = urllib.request.Request(
+        base_url.rstrip("/") + "/api/login",
+        data=json.dumps({"username": USERNAME, "password": PASSWORD}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())["sessionId"]
+
+
+def _fetch(url: str, sid: str):
+    req = urllib.request.Request(url, headers={"session-id": sid})
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except OSError:
+        status = 0
+    return time.perf_counter() - t0, status
+
+
+def run(ctx, base_url: str, concurrency=16, duration=10.0, only=None, log=print) -> dict:
+    sid = login(base_url)
+    routes = [r for r in ROUTES if r.method == "get" and not r.write and (not only or any(o in r.name for o in only))]
+    base = base_url.rstrip("/")
+    results = {}
+    for route in routes:
+        url = base + urllib.parse.quote(resolve(route, ctx), safe="/?&=")
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        def worker(_):
+            out, failed = [], 0
+            while time.perf_counter() < deadline:
+                dt, status = _fetch(url, sid)
+                out.append(dt)
+                failed += status != 200
+            return out, failed
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for part, failed in pool.map(worker, range(concurrency)):
+                latencies.extend(part)
+                errors += failed
+        r = summarize(latencies)
+        r["rps"] = round(len(latencies) / duration, 1)
+        r["errors"] = errors
+        results[f"http:{route.name}"] = r
+        log(f"http:{route.name:<27} p50 {r['p50']:8.2f}  p95 {r['p95']:8.2f}  p99 {r['p99']:8.2f} ms"
+            f"  {r['rps']:8.1f} rps  errors={errors}")
+    return results
@@ -0,0 +1,106 @@
+"""
+Маршрути core/urls.py для бенчмарку.
+
+Шляхи — шаблони з полями BenchContext; записи (write=True) виконуються в
+транзакції, що відкочується, тож датасет між ітераціями не змінюється.
+При додаванні ендпоінта в core/urls.py додайте його й сюди.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    method: str
+    path: str                                  # format(**ctx_fields)
+    body: Optional[Callable] = None            # body(ctx, i) -> dict | list
+    write: bool = False
+    multipart: bool = False
+    fresh_session: bool = False                # logout гасить сесію
+
+
+def _fields(ctx) -> dict:
+    return {
+        "brigade": ctx.brigade.id,
+        "detachment": ctx.detachment.id if ctx.detachment else "",
+        "equipment": ctx.equipment.id,
+        "inventory": ctx.equipment.inventory_number,
+        "testing": ctx.testing.id,
+        "type_id": ctx.type_id,
+        "type_text": ctx.type_name[:5],
+    }
+
+
+def resolve(route: Route, ctx) -> str:
+    return "/api/" + route.path.format(**_fields(ctx))
+
+
+def _java_item(ctx, i):
+    return {
+        "deviceInventoryNumber": ctx.equipment.inventory_number,
+        "testingDate": 1700000000000 + i * 86400000,
+        "testingResult": "придатно",
+    }
+
+
+ROUTES = (
+    # auth
+    Route("login", "post", "login", body=lambda ctx, i: {"username": "bench-admin", "password": "bench-pass"}, write=True),
+    Route("logout", "post", "logout", write=True, fresh_session=True),
+
+    # admin
+    Route("admin.registration", "post", "admin/registration", write=True, body=lambda ctx, i: {
+        "username": f"bench-u{i}", "password": "x", "confirmPassword": "x", "mode": "RO"}),
+    Route("admin.brigade.list", "get", "admin/brigade"),
+    Route("admin.brigade.create", "post", "admin/brigade", write=True, body=lambda ctx, i: {"name": f"bench-new-{i}"}),
+    Route("admin.brigade.update", "put", "admin/brigade", write=True,
+          body=lambda ctx, i: {"id": ctx.brigade.id, "name": ctx.brigade.name}),
+    Route("admin.detachment.list", "get", "admin/detachment"),
+    Route("admin.detachment.create", "post", "admin/detachment", write=True, body=lambda ctx, i: {"name": f"bench-nd-{i}"}),
+    Route("admin.tree", "get", "admin/tree"),
+
+    # nomenclature
+    Route("nomenclature.list", "get", "nomenclature"),
+    Route("nomenclature.create", "post", "nomenclature", write=True, body=lambda ctx, i: {"name": f"Драбина bench-new-{i}"}),
+    Route("nomenclature.categories", "get", "nomenclature/categories"),
+
+    # brigade equipment
+    Route("brigade.equipment.create", "post", "brigade/{brigade}/equipment", write=True,
+          body=lambda ctx, i: {"nomenclatureName": ctx.equipment.name, "inventory_number": f"BNEW{i}"}),
+    Route("brigade.equipment.bulk", "post", "brigade/{brigade}/equipment/bulk", write=True,
+          body=lambda ctx, i: [{"nomenclatureName": ctx.equipment.name, "inventory_number": f"BBULK{i}-{k}"}
+                               for k in range(100)]),
+    Route("brigade.equipment.list", "get", "brigade/{brigade}/equipment/list"),
+    Route("brigade.equipment.list.page", "get", "brigade/{brigade}/equipment/list?limit=100"),
+
+    # java-style testing
+    Route("testing.types", "get", "testing/equipments"),
+    Route("testing.java.list", "get", "testing/brigade/{brigade}/equipment/{type_id}"),
+    Route("testing.java.create", "post", "testing/brigade/{brigade}/equipment/{type_id}", write=True, body=_java_item),
+    Route("testing.java.update", "put", "testing/brigade/{brigade}/equipment/{type_id}", write=True,
+          body=lambda ctx, i: {**_java_item(ctx, i), "testingId": ctx.testing.id}),
+    Route("testing.java.bulk", "post", "testing/brigade/{brigade}/equipment/{type_id}/bulk", write=True,
+          body=lambda ctx, i: [_java_item(ctx, i + k) for k in range(100)]),
+
+    # search / inspections / tabs
+    Route("search", "get", "search?q={type_text}"),
+    Route("inspections.due", "get", "inspections/due?brigade={brigade}&days=30"),
+    Route("testing.by_type", "get", "testing/{type_text}/"),
+    Route("testing.by_type.page", "get", "testing/{type_text}/?limit=100"),
+    Route("stats", "get", "stats?brigade={brigade}"),
+    Route("sync.reset", "get", "sync?brigade={brigade}"),
+    Route("metrics", "get", "metrics"),
+
+    # router
+    Route("equipment.list", "get", "equipment/?brigade={brigade}"),
+    Route("equipment.detail", "get", "equipment/{equipment}/"),
+    Route("equipment.update", "patch", "equipment/{equipment}/", write=True,
+          body=lambda ctx, i: {"description": f"bench {i}"}),
+    Route("testing.list", "get", "testing/?limit=100"),
+    Route("testing.detail", "get", "testing/{testing}/"),
+    Route("testing.file", "get", "testing/{testing}/file"),
+    Route("testing.export.csv", "get", "brigade/{brigade}/testing/export.csv"),
+    Route("testing.create", "post", "testing/", write=True, multipart=True, body=lambda ctx, i: {
+        "equipment": ctx.equipment.id, "date": "2024-01-01", "result": "придатно"}),
+)
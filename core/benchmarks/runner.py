@@ -0,0 +1,85 @@
+"""Прогін маршрутів через Django test client: латентність, SQL, пам'ять."""
+import time
+import tracemalloc
+
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .dataset import new_session
+from .routes import ROUTES, resolve
+from .stats import summarize
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _call(client, route, ctx, sid, i):
+    path = resolve(route, ctx)
+    kwargs = {"HTTP_SESSION_ID": sid}
+    if route.body is not None:
+        body = route.body(ctx, i)
+        if route.multipart:
+            return getattr(client, route.method)(path, body, **kwargs)
+        return getattr(client, route.method)(path, body, content_type="application/json", **kwargs)
+    return getattr(client, route.method)(path, **kwargs)
+
+
+def _consume(response):
+    if getattr(response, "streaming", False):
+        for _ in response.streaming_content:
+            pass
+    return response.status_code
+
+
+def _once(client, route, ctx, sid, i):
+    """Одна ітерація; повертає (секунди, к-сть SQL, статус)."""
+    if route.fresh_session:
+        sid = new_session(ctx.user)
+    with CaptureQueriesContext(connection) as q:
+        if route.write:
+            try:
+                with transaction.atomic():
+                    t0 = time.perf_counter()
+                    status = _consume(_call(client, route, ctx, sid, i))
+                    dt = time.perf_counter() - t0
+                    raise _Rollback
+            except _Rollback:
+                pass
+        else:
+            t0 = time.perf_counter()
+            status = _consume(_call(client, route, ctx, sid, i))
+            dt = time.perf_counter() - t0
+    return dt, len(q), status
+
+
+def run(ctx, iterations=20, warmup=2, routes=ROUTES, only=None, log=print) -> dict:
+    client = Client()
+    sid = new_session(ctx.user)
+    results = {}
+    for route in routes:
+        if only and not any(o in route.name for o in only):
+            continue
+        for i in range(warmup):
+            _once(client, route, ctx, sid, i)
+        latencies, queries, statuses = [], [], set()
+        for i in range(iterations):
+            dt, nq, status = _once(client, route, ctx, sid, warmup + i)
+            latencies.append(dt)
+            queries.append(nq)
+            statuses.add(status)
+        # окремий прохід під tracemalloc — він сам сповільнює виконання
+        tracemalloc.start()
+        _once(client, route, ctx, sid, warmup + iterations)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[route.name] = summarize(latencies, queries, peak / 1024)
+        results[route.name]["status"] = sorted(statuses)
+        log(_line(route.name, results[route.name]))
+    return results
+
+
+def _line(name, r) -> str:
+    return (f"{name:<32} p50 {r['p50']:8.2f}  p95 {r['p95']:8.2f}  p99 {r['p99']:8.2f} ms"
+            f"  q={r.get('queries', 0):<4} peak={r.get('peak_kb', 0):8.0f} KB  {r.get('status', '')}")
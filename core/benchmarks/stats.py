@@ -0,0 +1,55 @@
+"""Перцентилі та порівняння з baseline."""
+import json
+import math
+from pathlib import Path
+
+
+def percentile(values, p: float) -> float:
+    """Nearest-rank перцентиль; values — у секундах, результат — у мс."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[k] * 1000
+
+
+def summarize(latencies, queries=(), peak_kb=None) -> dict:
+    out = {
+        "n": len(latencies),
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+    }
+    if queries:
+        out["queries"] = max(queries)
+    if peak_kb is not None:
+        out["peak_kb"] = round(peak_kb, 1)
+    return out
+
+
+def load_baseline(path):
+    p = Path(path)
+    return json.loads(p.read_text(encoding="utf-8")) if p.exists() else None
+
+
+def save_baseline(path, results: dict):
+    Path(path).write_text(json.dumps(results, indent=2, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Регресії: p95 більший за baseline * (1 + tolerance) або більше SQL-запитів.
+    Повертає список рядків з описом; порожній — усе гаразд.
+    """
+    problems = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base.get("p95") and cur["p95"] > base["p95"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {cur['p95']:.1f} ms > {base['p95']:.1f} ms (+{tolerance:.0%})")
+        if "queries" in base and cur.get("queries", 0) > base["queries"]:
+            problems.append(f"{name}: {cur['queries']} queries > baseline {base['queries']}")
+        if base.get("peak_kb") and cur.get("peak_kb", 0) > base["peak_kb"] * (1 + tolerance):
+            problems.append(f"{name}: peak {cur['peak_kb']:.0f} KB > {base['peak_kb']:.0f} KB (+{tolerance:.0%})")
+    return problems
@@ -0,0 +1,333 @@
+"""
+Масові операції: імпорт спорядження бригади, пакетні результати випробувань.
+
+Рядки валідуються без звернень до БД, далі всі залежності (номенклатура,
+загони, наявні інвентарні номери) резолвляться кількома запитами `IN`,
+а вставка йде `bulk_create` пачками в одній транзакції.
+"""
+import csv
+import io
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import categories, changelog, stats
+from .models import Detachment, Equipment, Nomenclature, Testing
+from .serializers import (
+    BrigadeEquipmentRowSerializer, JavaTestingInSerializer,
+    _guess_category, _unique_slugs, java_testing_out,
+)
+from .signals import bulk_equipment_changed, bulk_testing_changed
+
+BULK_BATCH_SIZE = 1000
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+# ===================== parsing =====================
+
+def _clean_row(row: dict) -> dict:
+    # порожні клітинки CSV/XLSX = поле не передано
+    out = {}
+    for k, v in row.items():
+        if k is None:
+            continue
+        k = str(k).strip()
+        if isinstance(v, str):
+            v = v.strip()
+        if v is None or v == "":
+            continue
+        out[k] = v
+    return out
+
+
+def _rows_from_csv(f):
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    for row in csv.DictReader(text, dialect=dialect):
+        yield _clean_row(row)
+
+
+def _rows_from_xlsx(f):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX import requires openpyxl")
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else None for h in next(rows, ())]
+        for values in rows:
+            if not any(v is not None for v in values):
+                continue
+            yield _clean_row(dict(zip(header, values)))
+    finally:
+        wb.close()
+
+
+def parse_item_list(data, key: str) -> list:
+    """JSON-масив або {key: [...]}."""
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        raise ImportFormatError(f"Expected a JSON array or {{\"{key}\": [...]}}")
+    limit = getattr(settings, "BULK_IMPORT_MAX_ROWS", 20000)
+    if len(data) > limit:
+        raise ImportFormatError(f"Too many rows ({len(data)} > {limit})")
+    return data
+
+
+def parse_import_rows(request) -> list:
+    """JSON-масив (або {"items": [...]}) чи файл `file` (.csv / .xlsx)."""
+    upload = request.FILES.get("file")
+    if upload is None:
+        return parse_item_list(request.data, "items")
+    name = (upload.name or "").lower()
+    if name.endswith(".xlsx"):
+        rows = list(_rows_from_xlsx(upload))
+    elif name.endswith(".csv") or upload.content_type in ("text/csv", "application/csv"):
+        rows = list(_rows_from_csv(upload))
+    else:
+        raise ImportFormatError("Unsupported file type, expected .csv or .xlsx")
+    return parse_item_list(rows, "items")
+
+
+# ===================== equipment =====================
+
+def _resolve_nomenclature(valid: list) -> tuple[dict, dict]:
+    """Повертає ({id: Nomenclature}, {name: Nomenclature}); відсутні назви створює пачкою."""
+    ids = {d["nomenclatureId"] for _, d in valid if d.get("nomenclatureId")}
+    names = {d["nomenclatureName"] for _, d in valid if not d.get("nomenclatureId")}
+
+    noms = Nomenclature.objects.select_related("category_ref")  # назва категорії — для зведення (core.stats)
+    by_id = {n.id: n for n in noms.filter(id__in=ids, active=True)} if ids else {}
+    by_name = {}
+    if names:
+        # як get_or_create(name=...) — беремо найстаріший запис з такою назвою
+        for n in noms.filter(name__in=names).order_by("-id"):
+            by_name[n.name] = n
+        missing = sorted(names - by_name.keys())
+        if missing:
+            slugs = _unique_slugs(missing)
+            guessed = {name: _guess_category(name) for name in missing}
+            category_ids = categories.category_ids(guessed.values())
+            Nomenclature.objects.bulk_create([
+                Nomenclature(name=name, category=guessed[name], category_ref_id=category_ids[guessed[name]],
+                             slug=slugs[name], unit="шт", active=True)
+                for name in missing
+            ], batch_size=BULK_BATCH_SIZE)
+            # MySQL не повертає pk з bulk_create — дочитуємо
+            for n in noms.filter(slug__in=slugs.values()):
+                by_name[n.name] = n
+            changelog.record(changelog.CATALOG_STREAM, [
+                (changelog.NOMENCLATURE, by_name[name].pk, False) for name in missing
+            ], fresh=True)
+    return by_id, by_name
+
+
+def import_equipment(brigade_id: int, rows: list) -> tuple[int, list]:
+    """
+    Імпортує рядки спорядження в бригаду. Повертає (кількість створених, помилки),
+    де помилки — [{"row": індекс, "errors": {...}}]; валідні рядки створюються.
+    """
+    child = BrigadeEquipmentRowSerializer()
+    valid, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            valid.append((i, child.run_validation(row)))
+        except serializers.ValidationError as exc:
+            errors.append({"row": i, "errors": exc.detail})
+
+    # дублікати в самому файлі та вже наявні в бригаді
+    invs = [d["inventory_number"] for _, d in valid]
+    existing = set(
+        Equipment.objects.filter(brigade_id=brigade_id, inventory_number__in=set(invs))
+        .values_list("inventory_number", flat=True)
+    ) if invs else set()
+    det_ids = {d["detachment"] for _, d in valid if d.get("detachment")}
+    known_dets = set(Detachment.objects.filter(id__in=det_ids).values_list("id", flat=True)) if det_ids else set()
+
+    seen = set()
+    checked = []
+    for i, d in valid:
+        inv = d["inventory_number"]
+        if inv in existing or inv in seen:
+            errors.append({"row": i, "errors": {"inventory_number": ["Already exists in brigade"]}})
+            continue
+        if d.get("detachment") and d["detachment"] not in known_dets:
+            errors.append({"row": i, "errors": {"detachment": ["Not found"]}})
+            continue
+        seen.add(inv)
+        checked.append((i, d))
+
+    with transaction.atomic():
+        by_id, by_name = _resolve_nomenclature(checked)
+        objs = []
+        for i, d in checked:
+            if d.get("nomenclatureId"):
+                n = by_id.get(d["nomenclatureId"])
+                if n is None:
+                    errors.append({"row": i, "errors": {"nomenclatureId": ["Not found"]}})
+                    continue
+            else:
+                n = by_name[d["nomenclatureName"]]
+            objs.append(Equipment(
+                brigade_id=brigade_id,
+                inventory_number=d["inventory_number"],
+                name=n.name,
+                type=n.category,  # legacy
+                nomenclature=n,
+                category_ref_id=n.category_ref_id,
+                description=d.get("description", ""),
+                detachment_id=d.get("detachment"),
+            ))
+        Equipment.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+        if objs:
+            created_ids = Equipment.objects.filter(
+                brigade_id=brigade_id, inventory_number__in=[o.inventory_number for o in objs]
+            ).values_list("id", flat=True)
+            changelog.record(brigade_id, [(changelog.EQUIPMENT, i, False) for i in created_ids], fresh=True)
+            stats.apply(Counter(), Counter(
+                stats.stat_key(brigade_id, o.detachment_id, o.nomenclature.category_ref.name, "") for o in objs
+            ))
+            transaction.on_commit(lambda: bulk_equipment_changed(brigade_id))
+
+    errors.sort(key=lambda e: e["row"])
+    return len(objs), errors
+
+
+# ===================== testing (java-style) =====================
+
+TESTING_FIELDS = ("date", "result", "next_date", "external_url")
+
+
+def _validate_items(items: list, outcomes: list):
+    child = JavaTestingInSerializer()
+    valid = []
+    for i, item in enumerate(items):
+        try:
+            valid.append((i, item, child.run_validation(item)))
+        except serializers.ValidationError as exc:
+            outcomes[i] = {"index": i, "status": "error", "errors": exc.detail}
+    return valid
+
+
+def _assign_pks(objs: list, stamp):
+    """
+    MySQL не повертає pk з bulk_create. Дочитуємо вставлені рядки за спільним
+    created_at і зіставляємо за (equipment, поля) у порядку вставки.
+    """
+    if not objs or objs[0].pk is not None:
+        return
+    pending = {}
+    for t in objs:
+        pending.setdefault((t.equipment_id, *(getattr(t, f) for f in TESTING_FIELDS)), []).append(t)
+    rows = (
+        Testing.objects.filter(created_at=stamp, equipment_id__in={t.equipment_id for t in objs})
+        .order_by("id").values_list("id", "equipment_id", *TESTING_FIELDS)
+    )
+    for pk, eq_id, *vals in rows:
+        bucket = pending.get((eq_id, *vals))
+        if bucket:
+            bucket.pop(0).pk = pk
+
+
+def ingest_testings(brigade_id: int, type_name: str, items: list) -> list:
+    """
+    Пакетне створення випробувань. Інвентарні номери резолвляться одним `IN`,
+    вставка — bulk_create. Повертає результат для кожного елемента в порядку запиту.
+    """
+    outcomes = [None] * len(items)
+    valid = _validate_items(items, outcomes)
+
+    invs = {d["deviceInventoryNumber"] for _, _, d in valid}
+    equipment = {
+        inv: eq_id for eq_id, inv in
+        categories.filter_category(Equipment.objects.filter(brigade_id=brigade_id, inventory_number__in=invs), type_name)
+        .values_list("id", "inventory_number")
+    } if invs else {}
+
+    stamp = timezone.now()
+    created = []
+    for i, _, d in valid:
+        eq_id = equipment.get(d["deviceInventoryNumber"])
+        if eq_id is None:
+            outcomes[i] = {"index": i, "status": "error",
+                           "message": "equipment not found for brigade/type/inventory"}
+            continue
+        t = Testing(equipment_id=eq_id, created_at=stamp, **{f: d.get(f) for f in TESTING_FIELDS})
+        created.append((i, d["deviceInventoryNumber"], t))
+
+    with transaction.atomic():
+        objs = [t for _, _, t in created]
+        Testing.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+        _assign_pks(objs, stamp)
+        bulk_testing_changed({t.equipment_id for t in objs})
+        changelog.record_testings(brigade_id, [(t.pk, t.equipment_id) for t in objs])
+
+    for i, inv, t in created:
+        outcomes[i] = {"index": i, "status": "created", **java_testing_out(t, inv)}
+    return outcomes
+
+
+def _testing_id(value):
+    """int із JSON-числа або рядка з цифр; інакше None."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def update_testings(brigade_id: int, items: list) -> list:
+    """Пакетне виправлення: кожен елемент має `testingId`; одне читання + bulk_update."""
+    outcomes = [None] * len(items)
+    valid = []
+    for i, item, d in _validate_items(items, outcomes):
+        raw = item.get("testingId") if isinstance(item, dict) else None
+        if raw is None or raw == "":
+            outcomes[i] = {"index": i, "status": "error", "message": "testingId required"}
+            continue
+        testing_id = _testing_id(raw)
+        if testing_id is None:
+            outcomes[i] = {"index": i, "status": "error", "message": "testingId must be an integer"}
+            continue
+        valid.append((i, testing_id, d))
+
+    found = {
+        t.id: t for t in
+        Testing.objects.filter(id__in={tid for _, tid, _ in valid}).select_related("equipment")
+    } if valid else {}
+
+    changed = []
+    for i, testing_id, d in valid:
+        t = found.get(testing_id)
+        if t is None:
+            outcomes[i] = {"index": i, "status": "error", "message": "testing not found"}
+            continue
+        if t.equipment.brigade_id != brigade_id or t.equipment.inventory_number != d["deviceInventoryNumber"]:
+            outcomes[i] = {"index": i, "status": "error",
+                           "message": "testing belongs to another equipment/brigade"}
+            continue
+        for f in TESTING_FIELDS:
+            setattr(t, f, d.get(f))
+        changed.append((i, t))
+
+    with transaction.atomic():
+        Testing.objects.bulk_update([t for _, t in changed], TESTING_FIELDS, batch_size=BULK_BATCH_SIZE)
+        bulk_testing_changed({t.equipment_id for _, t in changed})
+        changelog.record_testings(brigade_id, [(t.pk, t.equipment_id) for _, t in changed])
+
+    for i, t in changed:
+        outcomes[i] = {"index": i, "status": "updated", **java_testing_out(t, t.equipment.inventory_number)}
+    return outcomes
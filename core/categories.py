@@ -0,0 +1,68 @@
+"""
+Нормалізовані категорії спорядження (Category).
+
+Фільтр «за категорією» був `Q(type=c) | Q(nomenclature__category=c)` — OR
+через JOIN, який MySQL не обслуговує одним індексом. Тепер Equipment має
+category_ref — ефективну категорію (категорія номенклатури, інакше legacy
+type, а для порожнього — _guess_category з назви). filter_category() один раз
+знаходить id категорії за назвою і фільтрує `category_ref_id = id` по індексу
+(brigade, category_ref); невідома назва — порожній результат.
+
+Фільтр за точною назвою відповідає лише ефективній категорії: спорядження,
+чий legacy type розійшовся з категорією номенклатури, за старим type більше
+не знаходиться.
+
+Рядкові Nomenclature.category / Equipment.type лишаються (API, сумісність);
+category_ref на обох моделях підтримують сигнали (core.signals) і масові
+шляхи (core.bulk).
+"""
+from .collation import fold
+from .models import Category
+from .serializers import _guess_category
+
+
+def category_name(value: str, name: str = "") -> str:
+    """Категорія з legacy-рядка (type / Nomenclature.category); порожній — вгадуємо з назви."""
+    return value or _guess_category(name)
+
+
+def category_ids(names) -> dict:
+    """{назва: id Category}; відсутні категорії створює."""
+    names = {n for n in names if n}
+    if not names:
+        return {}
+    found = dict(Category.objects.filter(name__in=names).values_list("name", "id"))
+    if names - found.keys():
+        Category.objects.bulk_create([Category(name=n) for n in names - found.keys()], ignore_conflicts=True)
+        found.update(Category.objects.filter(name__in=names - found.keys()).values_list("name", "id"))
+    # MySQL (collation *_ci, PAD SPACE) знаходить «Драбини » за «драбини» — рядок один, ключ інший
+    folded = {fold(k): v for k, v in found.items()}
+    return {n: found.get(n) or folded.get(fold(n)) for n in names}
+
+
+def category_id(name: str):
+    return category_ids([name]).get(name)
+
+
+def _lookup(name):
+    return Category.objects.filter(name=name).values_list("id", flat=True)
+
+
+def filter_category(qs, name: str, prefix: str = ""):
+    """Фільтр за назвою категорії (без створення); prefix "equipment__" — для Testing."""
+    category = _lookup(name).first() if name else None
+    return qs.filter(**{f"{prefix}category_ref_id": category}) if category is not None else qs.none()
+
+
+async def afilter_category(qs, name: str, prefix: str = ""):
+    category = await _lookup(name).afirst() if name else None
+    return qs.filter(**{f"{prefix}category_ref_id": category}) if category is not None else qs.none()
+
+
+def equipment_category(equipment) -> tuple:
+    """(id, назва) ефективної категорії Equipment; номенклатура зазвичай уже в кеші об'єкта."""
+    nomenclature = equipment.nomenclature if equipment.nomenclature_id else None
+    if nomenclature is not None and nomenclature.category_ref_id:
+        return nomenclature.category_ref_id, category_name(nomenclature.category, nomenclature.name)
+    name = category_name(equipment.type, equipment.name)
+    return category_id(name), name
@@ -0,0 +1,223 @@
+"""
+Журнал змін для дельта-синхронізації польових клієнтів (/api/sync).
+
+Кожна бригада — окремий потік з монотонним номером (SyncStream), плюс
+спільний потік каталогу (номенклатура, id = 0). На кожен create / update /
+delete Equipment, Testing, Nomenclature у тій самій транзакції пишеться
+SyncChange з наступним номером; для об'єкта зберігається лише остання зміна
+(попередня видаляється), тож журнал не росте швидше за кількість об'єктів,
+а видалені об'єкти лишаються надгробками до prune_sync_log.
+
+Номер видається `UPDATE seq = seq + n` по рядку потоку: блокування тримається
+до коміту, тож зміни одного потоку комітяться в порядку номерів, і клієнт,
+що прочитав до номера N, не пропустить меншого номера, закоміченого пізніше.
+
+Токен синхронізації — непрозорий курсор (як у core.pagination) з
+[бригада, номер потоку бригади, номер каталогу].
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ParseError
+
+from .fast_serializers import FastEquipmentSerializer, FastNomenclatureSerializer, FastTestingSerializer
+from .models import Equipment, Nomenclature, SyncChange, SyncStream, Testing
+from .pagination import KeysetPagination
+
+CATALOG_STREAM = 0
+EQUIPMENT, TESTING, NOMENCLATURE = SyncChange.KIND_EQUIPMENT, SyncChange.KIND_TESTING, SyncChange.KIND_NOMENCLATURE
+SYNC_MAX_CHANGES = 5000
+BATCH_SIZE = 1000
+
+
+# --- запис ---
+
+def _reserve(stream: int, n: int) -> int:
+    """Резервує n номерів у потоці (рядок лишається заблокованим до коміту); повертає останній."""
+    now = timezone.now()
+    if not SyncStream.objects.filter(pk=stream).update(seq=F("seq") + n, changed_at=now):
+        try:
+            with transaction.atomic():
+                SyncStream.objects.create(pk=stream, seq=n, changed_at=now)
+        except IntegrityError:
+            # паралельна транзакція створила потік першою
+            SyncStream.objects.filter(pk=stream).update(seq=F("seq") + n, changed_at=now)
+    return SyncStream.objects.values_list("seq", flat=True).get(pk=stream)
+
+
+def record(stream, changes, fresh: bool = False) -> int:
+    """
+    `changes` — [(kind, object_id, deleted)]; для повторів того самого об'єкта діє останній.
+    fresh — об'єкти щойно створені, попередніх записів у журналі немає.
+    """
+    latest = {}
+    for kind, object_id, deleted in changes:
+        if object_id:
+            latest[(kind, object_id)] = deleted
+    if stream is None or not latest:
+        return 0
+    # без savepoint: помилка тут і так відкочує транзакцію зміни
+    with transaction.atomic(savepoint=False):
+        last = _reserve(stream, len(latest))
+        if not fresh:
+            by_kind = defaultdict(list)
+            for kind, object_id in latest:
+                by_kind[kind].append(object_id)
+            same = Q()
+            for kind, ids in by_kind.items():
+                same |= Q(kind=kind, object_id__in=ids)
+            SyncChange.objects.filter(stream=stream).filter(same).delete()
+        now = timezone.now()
+        first = last - len(latest) + 1
+        SyncChange.objects.bulk_create([
+            SyncChange(stream=stream, seq=first + i, kind=kind, object_id=object_id, deleted=deleted, changed_at=now)
+            for i, ((kind, object_id), deleted) in enumerate(latest.items())
+        ], batch_size=BATCH_SIZE)
+    return len(latest)
+
+
+def record_testings(brigade_id, testing_pairs, deleted: bool = False) -> int:
+    """`testing_pairs` — [(testing_id, equipment_id)]; разом зі знімком останнього випробування на Equipment."""
+    changes = [(TESTING, t, deleted) for t, _ in testing_pairs]
+    changes += [(EQUIPMENT, e, False) for _, e in testing_pairs]
+    return record(brigade_id, changes)
+
+
+def drop_stream(stream: int):
+    SyncChange.objects.filter(stream=stream).delete()
+    SyncStream.objects.filter(pk=stream).delete()
+    # типи каталогу залежать і від обладнання бригади — Last-Modified не має відкотитись
+    SyncStream.objects.filter(pk=CATALOG_STREAM).update(changed_at=timezone.now())
+
+
+def _state(row) -> tuple:
+    return f"{row['seq'] or 0}.{row['streams']}", row["changed_at"]
+
+
+def catalog_state() -> tuple:
+    """
+    (версія, час останньої зміни) даних каталогу — з лічильників потоків у БД,
+    тож однакові в усіх воркерах і змінюються в транзакції запису. Рахує всі
+    потоки: каталог залежить і від обладнання бригад (типи).
+    """
+    return _state(SyncStream.objects.aggregate(seq=Sum("seq"), streams=Count("pk"), changed_at=Max("changed_at")))
+
+
+async def acatalog_state() -> tuple:
+    return _state(await SyncStream.objects.aaggregate(seq=Sum("seq"), streams=Count("pk"), changed_at=Max("changed_at")))
+
+
+def prune_tombstones(older_than) -> int:
+    """Прибирає надгробки, старші за `older_than`; клієнти з токеном до них отримають reset."""
+    removed = 0
+    cutoffs = (
+        SyncChange.objects.filter(deleted=True, changed_at__lt=older_than)
+        .values("stream").annotate(top=Max("seq")).values_list("stream", "top")
+    )
+    for stream, top in list(cutoffs):
+        SyncStream.objects.filter(pk=stream, floor__lt=top).update(floor=top)
+        while True:
+            pks = list(
+                SyncChange.objects.filter(stream=stream, deleted=True, seq__lte=top)
+                .values_list("pk", flat=True)[:BATCH_SIZE]
+            )
+            if not pks:
+                break
+            removed += SyncChange.objects.filter(pk__in=pks).delete()[0]
+    return removed
+
+
+# --- читання ---
+
+def encode_token(brigade_id: int, brigade_seq: int, catalog_seq: int) -> str:
+    return KeysetPagination.encode_cursor([brigade_id, brigade_seq, catalog_seq])
+
+
+def decode_token(token: str, brigade_id: int):
+    try:
+        token_brigade, brigade_seq, catalog_seq = KeysetPagination.decode_cursor(token)
+        brigade_seq, catalog_seq = int(brigade_seq), int(catalog_seq)
+    except (NotFound, ValueError, TypeError):
+        raise ParseError("Invalid sync token")
+    if token_brigade != brigade_id:
+        raise ParseError("Sync token belongs to another brigade")
+    return brigade_seq, catalog_seq
+
+
+def _changes(stream: int, since: int, limit: int):
+    rows = list(
+        SyncChange.objects.filter(stream=stream, seq__gt=since).order_by("seq")
+        .values_list("seq", "kind", "object_id", "deleted")[:limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
+
+
+def _table(lister, qs, ids):
+    return lister.table(lister.rows(qs.filter(id__in=ids))) if ids else {"fields": list(lister.keys), "rows": []}
+
+
+def _hidden(table, ids) -> list:
+    """Змінені id, яких немає у відповіді (поза областю клієнта): для нього вони видалені."""
+    i = table["fields"].index("id")
+    shown = {row[i] for row in table["rows"]}
+    return [object_id for object_id in ids if object_id not in shown]
+
+
+def _scoped(scope, qs, prefix=""):
+    return scope.equipment(qs, prefix) if scope is not None else qs
+
+
+def sync_payload(request, brigade_id: int, token=None, limit: int = None, scope=None) -> dict:
+    """
+    Без токена — лише поточна позиція (`reset`: клієнт вантажить повні списки
+    і далі синхронізується від неї). З токеном — змінені рядки в компактній
+    формі ({fields, rows}) і списки id видалених; `more` — є ще зміни.
+    `scope` (core.scoping) відсікає рядки поза загонами користувача; змінені
+    рядки, яких клієнт уже не бачить (перенесені в чужий загін), — у deleted.
+    """
+    limit = limit or getattr(settings, "SYNC_MAX_CHANGES", SYNC_MAX_CHANGES)
+    streams = {
+        pk: (seq, floor) for pk, seq, floor in
+        SyncStream.objects.filter(pk__in=(brigade_id, CATALOG_STREAM)).values_list("pk", "seq", "floor")
+    }
+    b_seq, b_floor = streams.get(brigade_id, (0, 0))
+    c_seq, c_floor = streams.get(CATALOG_STREAM, (0, 0))
+    if token:
+        b_since, c_since = decode_token(token, brigade_id)
+        # надгробки вже прибрані / токен із майбутнього (відновлення БД) — повна перезагрузка
+        if b_since < b_floor or c_since < c_floor or b_since > b_seq or c_since > c_seq:
+            token = None
+    if not token:
+        return {"token": encode_token(brigade_id, b_seq, c_seq), "reset": True, "more": False}
+
+    b_rows, b_more = _changes(brigade_id, b_since, limit)
+    c_rows, c_more = _changes(CATALOG_STREAM, c_since, limit)
+    changed, deleted = defaultdict(list), defaultdict(list)
+    for _, kind, object_id, is_deleted in b_rows + c_rows:
+        (deleted if is_deleted else changed)[kind].append(object_id)
+
+    equipment = _table(FastEquipmentSerializer(request), _scoped(scope,
+                       Equipment.objects.filter(brigade_id=brigade_id)), changed[EQUIPMENT])
+    testing = _table(FastTestingSerializer(request), _scoped(scope,
+                     Testing.objects.filter(equipment__brigade_id=brigade_id), "equipment__"), changed[TESTING])
+    deleted[EQUIPMENT] += _hidden(equipment, changed[EQUIPMENT])
+    deleted[TESTING] += _hidden(testing, changed[TESTING])
+
+    return {
+        "token": encode_token(
+            brigade_id, b_rows[-1][0] if b_rows else b_since, c_rows[-1][0] if c_rows else c_since,
+        ),
+        "reset": False,
+        "more": b_more or c_more,
+        "equipment": equipment,
+        "testing": testing,
+        "nomenclature": _table(FastNomenclatureSerializer(request), Nomenclature.objects.all(), changed[NOMENCLATURE]),
+        "deleted": {
+            "equipment": deleted[EQUIPMENT],
+            "testing": deleted[TESTING],
+            "nomenclature": deleted[NOMENCLATURE],
+        },
+    }
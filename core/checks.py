@@ -0,0 +1,33 @@
+"""
+System checks для налаштувань, що тихо ламаються при кількох воркерах.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+LOCMEM = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register(Tags.caches)
+def session_cache_shared(app_configs, **kwargs):
+    # LocMem — окремий кеш у кожному процесі: відкликання сесії не дійде до інших воркерів
+    alias = getattr(settings, "AUTH_SESSION_CACHE_ALIAS", None)
+    if alias and settings.CACHES.get(alias, {}).get("BACKEND") == LOCMEM:
+        return [Error(
+            f"AUTH_SESSION_CACHE_ALIAS={alias!r} вказує на LocMemCache, він не спільний між воркерами.",
+            hint="Вкажіть спільний бекенд (redis / memcached) або None — лише in-process кеш.",
+            id="core.E001",
+        )]
+    return []
+
+
+@register(Tags.caches, deploy=True)
+def versions_cache_shared(app_configs, **kwargs):
+    # версії кешу відповідей (core.versioning) мусять бути спільними між воркерами
+    if settings.CACHES.get("default", {}).get("BACKEND") == LOCMEM:
+        return [Warning(
+            "CACHES['default'] — LocMemCache: версії кешу відповідей окремі в кожному воркері, "
+            "після запису інші воркери віддаватимуть застарілі відповіді.",
+            hint="Для кількох воркерів вкажіть спільний бекенд (redis / memcached).",
+            id="core.W002",
+        )]
+    return []
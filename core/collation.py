@@ -0,0 +1,12 @@
+"""
+Порівняння назв так, як їх порівнює MySQL (collation *_ci, PAD SPACE):
+без регістру й без пробілів у кінці.
+
+Модуль без залежностей від моделей: ним користуються і core.categories,
+і міграція 0010 — правило має бути одне, інакше бекфіл і рантайм
+по-різному зіставлятимуть назви з рядками Category.
+"""
+
+
+def fold(name: str) -> str:
+    return name.casefold().rstrip(" ")
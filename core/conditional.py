@@ -0,0 +1,53 @@
+"""
+ETag / Last-Modified для довідникових ендпоінтів (номенклатура, типи).
+
+ETag = версія каталогу + хеш query-параметрів, тому перевірка If-None-Match /
+If-Modified-Since не виконує ні основного запиту, ні серіалізації — у
+відповідь одразу 304. Версія й час зміни беруться з лічильників журналу змін
+у БД (core.changelog.catalog_state, один запит по малій таблиці), а не з
+in-process кешу: воркер, що не обробляв запис, не віддасть 304 на застарілі дані.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from .changelog import acatalog_state, catalog_state
+
+CATALOG = "catalog"
+
+
+def _etag(request, version) -> str:
+    params = request.META.get("QUERY_STRING", "")
+    digest = hashlib.md5(f"{request.path}?{params}".encode("utf-8")).hexdigest()[:10]
+    return f"{CATALOG}-{version}-{digest}"
+
+
+def catalog_conditional(view_method):
+    """Декоратор методу APIView: ETag/Last-Modified + 304, клієнт завжди ревалідує."""
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        version, last_modified = catalog_state()  # один запит на обидва валідатори
+        decorated = method_decorator(condition(
+            etag_func=lambda *a, **kw: _etag(request, version), last_modified_func=lambda *a, **kw: last_modified,
+        ))(view_method)
+        response = decorated(self, request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
+
+
+def acatalog_conditional(view_method):
+    """catalog_conditional для async-методу view: валідатори читаються async заздалегідь."""
+    @wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        version, last_modified = await acatalog_state()
+        decorated = condition(
+            etag_func=lambda *a, **kw: _etag(request, version), last_modified_func=lambda *a, **kw: last_modified,
+        )(view_method.__get__(self))
+        response = await decorated(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
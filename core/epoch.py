@@ -0,0 +1,94 @@
+"""
+Дати ↔ epoch ms для Java-клієнтів (testingDate / nextTestingDate).
+
+Дата на дроті — північ цього дня в TIME_ZONE: так її завжди віддавав
+`datetime.combine(d, time.min).timestamp()` (Django ставить TZ процесу =
+TIME_ZONE). Вхідні мс читаються в тій самій зоні — раніше вхід читався як
+UTC, і північ за Києвом (22:00 / 21:00 UTC попереднього дня) ставала
+вчорашньою датою. Тепер decode(encode(d)) == d для будь-якої дати.
+
+Перетворення — арифметика над номером дня (date.toordinal() мінус номер
+епохи) плюс зсув зони опівночі цього дня; зсуви кешуються по дню, тож на
+рядок немає ні datetime-, ні tz-об'єктів. encode_column() / decode_column()
+перетворюють цілий стовпець: кожне різне значення — один раз (у списках
+дати сильно повторюються), далі — map по словнику.
+"""
+import zoneinfo
+from datetime import date, datetime
+from functools import lru_cache
+
+from django.conf import settings
+
+DAY_MS = 86_400_000
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MIN_ORDINAL, MAX_ORDINAL = date.min.toordinal() + 1, date.max.toordinal() - 1
+OFFSET_CACHE_SIZE = 100_000  # днів; лише від довільних вхідних мс
+
+
+class EpochCodec:
+    def __init__(self, tz):
+        self.tz = tz
+        self._offsets = {}  # ordinal дня → зсув зони опівночі, мс
+        self._days = {}     # ordinal UTC-дня → ((північ, дата), ...) місцевих діб, що його перетинають
+
+    def offset(self, ordinal: int) -> int:
+        off = self._offsets.get(ordinal)
+        if off is None:
+            d = date.fromordinal(ordinal)
+            off = int(datetime(d.year, d.month, d.day, tzinfo=self.tz).utcoffset().total_seconds()) * 1000
+            if len(self._offsets) >= OFFSET_CACHE_SIZE:
+                self._offsets.clear()
+            self._offsets[ordinal] = off
+        return off
+
+    def _midnight(self, ordinal: int) -> int:
+        return (ordinal - EPOCH_ORDINAL) * DAY_MS - self.offset(ordinal)
+
+    def encode(self, d: date) -> int:
+        return self._midnight(d.toordinal())
+
+    def decode(self, ms: int) -> date:
+        """Дата в зоні кодека, що містить момент ms. ValueError — поза межами date."""
+        utc = ms // DAY_MS + EPOCH_ORDINAL
+        days = self._days.get(utc)
+        if days is None:
+            if not MIN_ORDINAL <= utc <= MAX_ORDINAL:
+                raise ValueError(f"epoch ms out of range: {ms}")
+            # зсув зони < доби, тож місцева дата — сусідня з UTC-датою або вона сама
+            days = tuple((self._midnight(o), date.fromordinal(o)) for o in (utc + 1, utc, utc - 1))
+            if len(self._days) >= OFFSET_CACHE_SIZE:
+                self._days.clear()
+            self._days[utc] = days
+        for midnight, d in days:
+            if ms >= midnight:
+                return d
+
+    def encode_column(self, values) -> list:
+        """Стовпець дат (None лишається None) → epoch ms."""
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        table = {v: self.encode(v) for v in set(values) if v is not None}
+        table[None] = None
+        return list(map(table.__getitem__, values))
+
+    def decode_column(self, values) -> list:
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        table = {v: self.decode(v) for v in set(values) if v is not None}
+        table[None] = None
+        return list(map(table.__getitem__, values))
+
+
+@lru_cache(maxsize=None)
+def _codec(tz_name: str) -> EpochCodec:
+    return EpochCodec(zoneinfo.ZoneInfo(tz_name))
+
+
+def get_codec() -> EpochCodec:
+    return _codec(settings.TIME_ZONE or "UTC")
+
+
+def date_to_ms(d):
+    return get_codec().encode(d) if d is not None else None
+
+
+def ms_to_date(ms):
+    return get_codec().decode(ms) if ms is not None else None
@@ -0,0 +1,131 @@
+"""
+Вивантаження історії випробувань бригади (аудит) у CSV / XLSX.
+
+Рядки читаються keyset-пачками по (date, id): MySQL-драйвер буферизує весь
+результат `.iterator()` на клієнті, тож серверного курсора там немає, а
+пачки з `WHERE (date, id) > (...) LIMIT n` тримають пам'ять сталою на
+будь-якій кількості рядків. JOIN з equipment / category / detachment —
+в тому ж `values_list`, без об'єктів моделей.
+
+CSV віддається потоком (StreamingHttpResponse). XLSX пишеться write-only
+книгою openpyxl (рядки одразу йдуть у тимчасовий файл), а готовий файл
+віддається FileResponse; понад ліміт рядків аркуша — наступний аркуш.
+Під ASGI обидва тіла view перетворює на async-ітератори
+(core.streaming.asgi_streaming), інакше Django зібрав би їх у пам'яті цілими.
+"""
+import csv
+import tempfile
+
+from django.db.models import F
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .categories import filter_category
+from .models import Testing
+from .pagination import KeysetPagination
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_SHEET_ROWS = 1_048_575  # ліміт Excel мінус рядок заголовка
+
+# (заголовок колонки, шлях ORM)
+COLUMNS = (
+    ("testing_id", "id"),
+    ("date", "date"),
+    ("inventory_number", "equipment__inventory_number"),
+    ("name", "equipment__name"),
+    ("category", "category"),
+    ("detachment", "equipment__detachment__name"),
+    ("result", "result"),
+    ("next_date", "next_date"),
+    ("external_url", "external_url"),
+    ("file", "file"),
+)
+SOURCES = tuple(src for _, src in COLUMNS)
+ORDERING = ("date", "id")
+
+
+class ExportFormatError(Exception):
+    pass
+
+
+def export_queryset(brigade_id, date_from=None, date_to=None, detachment_id=None, category=None):
+    qs = Testing.objects.filter(equipment__brigade_id=brigade_id)
+    if date_from:
+        qs = qs.filter(date__gte=date_from)
+    if date_to:
+        qs = qs.filter(date__lte=date_to)
+    if detachment_id:
+        qs = qs.filter(equipment__detachment_id=detachment_id)
+    if category:
+        qs = filter_category(qs, category, "equipment__")
+    return qs.annotate(category=F("equipment__category_ref__name"))
+
+
+def iter_export_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Кортежі в порядку COLUMNS, keyset-пачками по ORDERING."""
+    keyset = KeysetPagination(ORDERING)
+    base = queryset.order_by(*ORDERING).values_list(*SOURCES)
+    key_idx = [SOURCES.index(f) for f in ORDERING]
+    qs = base
+    while True:
+        chunk = list(qs[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        qs = base.filter(keyset._after([chunk[-1][i] for i in key_idx]))
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: write() повертає рядок замість запису."""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(rows, filename: str) -> StreamingHttpResponse:
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield "\ufeff"  # BOM — Excel інакше відкриває UTF-8 як cp1251
+        yield writer.writerow([name for name, _ in COLUMNS])
+        for row in rows:
+            yield writer.writerow([_cell(v) for v in row])
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    return response
+
+
+def xlsx_response(rows, filename: str) -> FileResponse:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportFormatError("XLSX export requires openpyxl")
+    wb = Workbook(write_only=True)
+    header = [name for name, _ in COLUMNS]
+    ws, left = None, 0
+    for row in rows:
+        if left == 0:
+            ws = wb.create_sheet(f"testing-{len(wb.worksheets) + 1}")
+            ws.append(header)
+            left = XLSX_SHEET_ROWS
+        ws.append(row)
+        left -= 1
+    if ws is None:
+        wb.create_sheet("testing-1").append(header)
+    f = tempfile.TemporaryFile()
+    wb.save(f)
+    f.seek(0)
+    return FileResponse(
+        f, as_attachment=True, filename=filename,
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+EXPORTERS = {"csv": csv_response, "xlsx": xlsx_response}
@@ -0,0 +1,172 @@
+"""
+Швидкі read-only серіалізатори для великих списків.
+
+Замість DRF field-by-field серіалізації об'єктів моделі: один
+`values_list(...)` і заздалегідь скомпільоване перетворення кортежу в dict
+(імена ключів + лише ті конвертери, що справді потрібні). Вихід збігається
+з відповідними DRF-серіалізаторами (EquipmentSerializer, TestingSerializer,
+JavaTestingOutSerializer).
+"""
+from .epoch import date_to_ms, get_codec
+from .file_serving import act_url_builder
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _ms(value):
+    return date_to_ms(value)
+
+
+def _ms_column(values):
+    return get_codec().encode_column(values)
+
+
+# конвертери, що вміють цілий стовпець за раз (many())
+COLUMN_CONVERTERS = {_ms: _ms_column}
+
+
+def _blank(value):
+    return value or ""
+
+
+class FastSerializer:
+    # (ключ у відповіді, шлях ORM, конвертер | None)
+    fields = ()
+
+    def __init__(self, request=None):
+        self.request = request
+        self.keys = tuple(f[0] for f in self.fields)
+        self.sources = tuple(f[1] for f in self.fields)
+        self.converters = tuple((i, f[2]) for i, f in enumerate(self.fields) if f[2] is not None)
+
+    def rows(self, queryset, named: bool = False):
+        return queryset.values_list(*self.sources, named=named)
+
+    def to_representation(self, row) -> dict:
+        if self.converters:
+            row = list(row)
+            for i, fn in self.converters:
+                row[i] = fn(row[i])
+        return dict(zip(self.keys, row))
+
+    def many(self, rows) -> list:
+        keys, converters, z = self.keys, self.converters, zip
+        if not converters:
+            return [dict(z(keys, r)) for r in rows]
+        # по стовпцях: map замість циклу по рядках, дати — раз на різне значення
+        rows = list(rows)
+        if not rows:
+            return []
+        cols = list(z(*rows))
+        for i, fn in converters:
+            column = COLUMN_CONVERTERS.get(fn)
+            cols[i] = column(cols[i]) if column is not None else list(map(fn, cols[i]))
+        return [dict(z(keys, r)) for r in z(*cols)]
+
+    def serialize(self, queryset) -> list:
+        return self.many(self.rows(queryset))
+
+    def table(self, rows) -> dict:
+        """Компактна форма (дельта-синхронізація): ключі один раз, рядки — масиви."""
+        return {"fields": list(self.keys), "rows": [list(d.values()) for d in self.many(rows)]}
+
+
+class FastEquipmentSerializer(FastSerializer):
+    fields = (
+        ("id", "id", None),
+        ("inventory_number", "inventory_number", None),
+        ("name", "name", None),
+        ("type", "type", None),
+        ("brigade", "brigade_id", None),
+        ("nomenclatureId", "nomenclature_id", None),
+        ("description", "description", None),
+        ("detachment", "detachment_id", None),
+        ("last_test_date", "last_test_date", _iso),
+        ("last_test_result", "last_test_result", None),
+        ("next_test_date", "next_test_date", _iso),
+    )
+
+
+class FastNomenclatureSerializer(FastSerializer):
+    fields = (
+        ("id", "id", None),
+        ("name", "name", None),
+        ("category", "category", None),
+        ("slug", "slug", None),
+        ("unit", "unit", None),
+        ("active", "active", None),
+    )
+
+
+class FastTestingSerializer(FastSerializer):
+    fields = (
+        ("id", "id", None),
+        ("equipment", "equipment_id", None),
+        ("date", "date", _iso),
+        ("result", "result", None),
+        ("next_date", "next_date", _iso),
+        ("external_url", "external_url", None),
+        ("file", "file", None),  # ім'я у сховищі → захищена адреса за id, див. _with_urls
+    )
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self._act_url = act_url_builder(request)
+
+    def _with_urls(self, items):
+        # як serializers.ActFileField: None для порожнього, інакше адреса TestingFileView
+        act_url = self._act_url
+        for d in items:
+            d["file"] = act_url(d["id"]) if d["file"] else None
+        return items
+
+    def to_representation(self, row) -> dict:
+        return self._with_urls([super().to_representation(row)])[0]
+
+    def many(self, rows) -> list:
+        return self._with_urls(super().many(rows))
+
+
+class FastJavaTestingSerializer(FastSerializer):
+    fields = (
+        ("testingId", "id", None),
+        ("deviceInventoryNumber", "equipment__inventory_number", None),
+        ("testingDate", "date", _ms),
+        ("testingResult", "result", None),
+        ("nextTestingDate", "next_date", _ms),
+        ("url", "external_url", _blank),
+    )
+
+
+class FastTestingTextSerializer(FastSerializer):
+    """Рядок для TestingByTypeTextView (дати у форматі дд.мм.рррр)."""
+    fields = (
+        ("inventory_number", "equipment__inventory_number", None),
+        ("date", "date", lambda d: d.strftime("%d.%m.%Y")),
+        ("result", "result", None),
+        ("next_date", "next_date", lambda d: d.strftime("%d.%m.%Y") if d else None),
+        ("external_url", "external_url", _blank),
+        ("id", "id", None),
+    )
+
+
+class ModelSerializerLister:
+    """Адаптер звичайного DRF-серіалізатора до інтерфейсу FastSerializer."""
+
+    def __init__(self, serializer_class, request=None):
+        self.serializer_class = serializer_class
+        self.context = {"request": request} if request is not None else {}
+
+    def rows(self, queryset, named: bool = False):
+        return queryset
+
+    def to_representation(self, obj) -> dict:
+        return self.serializer_class(obj, context=self.context).data
+
+    def many(self, objs) -> list:
+        return self.serializer_class(objs, many=True, context=self.context).data
+
+    def serialize(self, queryset) -> list:
+        return self.many(queryset)
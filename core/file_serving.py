@@ -0,0 +1,121 @@
+"""
+Віддача захищених файлів (акти випробувань).
+
+Доступ перевіряє Django, а байти передає фронтовий веб-сервер — воркер
+звільняється одразу. Режим — PROTECTED_MEDIA_SERVER:
+
+  "nginx"  — X-Accel-Redirect на internal-location, напр.
+                 location /protected-media/ { internal; alias /srv/pozeza/media/; }
+  "apache" — X-Sendfile з абсолютним шляхом (mod_xsendfile; lighttpd теж);
+  None     — FileResponse з підтримкою Range (runserver / локально); під ASGI
+             тіло — async-ітератор блоків (core.streaming.asgi_streaming).
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils.http import content_disposition_header
+
+from .streaming import asgi_streaming
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def _finish(response, download_name: str):
+    response["Content-Disposition"] = content_disposition_header(False, download_name)
+    response["Cache-Control"] = "private"
+    response["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
+def _parse_range(header: str, size: int):
+    """(start, end) включно; None — віддати файл цілим; ValueError — 416."""
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None  # кілька діапазонів / інші одиниці — ігноруємо, як дозволяє RFC 9110
+    first, last = m.groups()
+    if not first:
+        if not last:
+            return None
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+class _Slice:
+    """Файл, обрізаний до [start, end] — читається блоками FileResponse."""
+
+    def __init__(self, f, start: int, end: int):
+        f.seek(start)
+        self.f, self.remaining = f, end - start + 1
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def _ranged_response(request, storage, name: str):
+    size = storage.size(name)
+    header = request.META.get("HTTP_RANGE")
+    try:
+        byte_range = _parse_range(header, size) if header else None
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    f = storage.open(name, "rb")
+    if byte_range is None:
+        response = FileResponse(f, content_type=_content_type(name))
+    else:
+        start, end = byte_range
+        response = FileResponse(_Slice(f, start, end), status=206, content_type=_content_type(name))
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def act_url_builder(request=None):
+    """
+    testing_id → адреса файлу акту через TestingFileView (з перевіркою доступу),
+    а не пряма /media/-адреса сховища. Маршрут резолвиться один раз на виклик.
+    """
+    head, tail = reverse("testing-file", args=[0]).rsplit("/0/", 1)
+    base = request.build_absolute_uri(head) if request is not None else head
+    return lambda testing_id: f"{base}/{testing_id}/{tail}"
+
+
+def protected_file_response(request, name: str, download_name: str, storage=default_storage):
+    mode = getattr(settings, "PROTECTED_MEDIA_SERVER", None)
+    if mode == "nginx":
+        response = HttpResponse(content_type=_content_type(name))
+        prefix = getattr(settings, "PROTECTED_MEDIA_INTERNAL_URL", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix + quote(name)
+    elif mode == "apache":
+        response = HttpResponse(content_type=_content_type(name))
+        response["X-Sendfile"] = os.fsencode(storage.path(name)).decode("latin-1")
+    else:
+        if not storage.exists(name):
+            return None
+        response = asgi_streaming(request, _ranged_response(request, storage, name))
+    return _finish(response, download_name)
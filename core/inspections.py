@@ -0,0 +1,55 @@
+"""
+Прострочені / найближчі випробування.
+
+Рахується в SQL по знімку Equipment.next_test_date (core.latest_testing) з
+індексом (brigade, next_test_date) — без перебору core_testing.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .categories import filter_category
+from .models import Equipment
+
+DEFAULT_DAYS = 30
+MAX_ITEMS = 1000
+
+
+def inspection_queryset(brigade_id, detachment_id=None, category=None):
+    qs = Equipment.objects.filter(brigade_id=brigade_id)
+    if detachment_id:
+        qs = qs.filter(detachment_id=detachment_id)
+    if category:
+        qs = filter_category(qs, category)
+    return qs
+
+
+def inspection_report(qs, days: int = DEFAULT_DAYS, limit: int = MAX_ITEMS) -> dict:
+    today = timezone.localdate()
+    horizon = today + timedelta(days=days)
+    overdue_q = Q(next_test_date__lt=today)
+    due_q = Q(next_test_date__gte=today, next_test_date__lte=horizon)
+
+    counts = qs.aggregate(
+        overdue=Count("id", filter=overdue_q),
+        dueSoon=Count("id", filter=due_q),
+        untested=Count("id", filter=Q(last_test_date__isnull=True)),
+        total=Count("id"),
+    )
+    by_category = list(
+        qs.filter(overdue_q | due_q)
+        .annotate(category=F("category_ref__name"))
+        .values("category")
+        .annotate(overdue=Count("id", filter=overdue_q), dueSoon=Count("id", filter=due_q))
+        .order_by("category")
+    )
+    fields = ("id", "inventory_number", "name", "detachment_id", "last_test_date", "last_test_result", "next_test_date")
+    return {
+        "today": today,
+        "horizon": horizon,
+        "counts": counts,
+        "byCategory": by_category,
+        "overdue": list(qs.filter(overdue_q).order_by("next_test_date", "id").values(*fields)[:limit]),
+        "dueSoon": list(qs.filter(due_q).order_by("next_test_date", "id").values(*fields)[:limit]),
+    }
@@ -0,0 +1,225 @@
+"""
+Інструментація запитів: к-сть SQL, час у БД, час рендеру (серіалізації в JSON)
+і загальна латентність.
+
+  * QueryMetricsMiddleware — міряє кожен запит, додає заголовок Server-Timing,
+    накопичує метрики по маршрутах (in-process, на воркер) для /api/metrics;
+  * query_budget(n) на методі view або `query_budgets = {"list": n, ...}` на
+    класі (ViewSet — за назвою action) — бюджет SQL-запитів на весь запит;
+    перевищення при QUERY_BUDGET_STRICT кидає QueryBudgetExceeded (тести),
+    інакше пишеться warning у лог (прод).
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("core.instrumentation")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit: int):
+    """Декоратор методу APIView (get/post/...): максимум SQL-запитів на весь запит."""
+    def decorator(fn):
+        fn.query_budget = limit
+        return fn
+    return decorator
+
+
+def _budget_for(request):
+    match = getattr(request, "resolver_match", None)
+    view_class = getattr(getattr(match, "func", None), "cls", None) or getattr(getattr(match, "func", None), "view_class", None)
+    if view_class is None:
+        return None
+    method = request.method.lower()
+    actions = getattr(match.func, "actions", None)  # ViewSet: {'get': 'list', ...}
+    if actions:
+        method = actions.get(method, method)
+    handler = getattr(view_class, method, None)
+    budget = getattr(handler, "query_budget", None)
+    if budget is None:
+        budget = getattr(view_class, "query_budgets", {}).get(method)
+    return budget
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _RequestMetrics:
+    __slots__ = ("queries", "db_time", "render_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+
+# Метрики поточного запиту. ContextVar, а не connection.execute_wrapper():
+# з'єднання прив'язані до потоку, а під ASGI запити async-view виконуються
+# в потоках sync_to_async, куди контекст копіюється.
+_current: ContextVar = ContextVar("query_metrics", default=None)
+
+
+def _execute(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - t0
+        metrics.queries += 1
+
+
+def _install(conn):
+    if _execute not in conn.execute_wrappers:
+        conn.execute_wrappers.append(_execute)
+
+
+def _connection_created(sender, connection, **kwargs):
+    _install(connection)
+
+
+connection_created.connect(_connection_created, dispatch_uid="core.instrumentation")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = defaultdict(lambda: {
+            "count": 0, "duration": 0.0, "db": 0.0, "render": 0.0, "queries": 0,
+            "buckets": [0] * len(LATENCY_BUCKETS), "over_budget": 0,
+        })
+
+    def observe(self, route, method, status, total, m: _RequestMetrics, over_budget: bool):
+        with self._lock:
+            s = self._series[(route, method, status)]
+            s["count"] += 1
+            s["duration"] += total
+            s["db"] += m.db_time
+            s["render"] += m.render_time
+            s["queries"] += m.queries
+            s["over_budget"] += over_budget
+            for i, le in enumerate(LATENCY_BUCKETS):
+                if total <= le:
+                    s["buckets"][i] += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            series = {k: {**v, "buckets": list(v["buckets"])} for k, v in self._series.items()}
+        lines = [
+            "# HELP pozeza_requests_total HTTP requests.",
+            "# TYPE pozeza_requests_total counter",
+        ]
+        def labels(route, method, status, **extra):
+            items = {"route": route, "method": method, "status": status, **extra}
+            return ",".join(f'{k}="{_escape(v)}"' for k, v in items.items())
+        for (route, method, status), s in sorted(series.items()):
+            lines.append(f"pozeza_requests_total{{{labels(route, method, status)}}} {s['count']}")
+        for name, key, help_ in (
+            ("pozeza_db_seconds_total", "db", "Time spent in SQL."),
+            ("pozeza_render_seconds_total", "render", "Time spent rendering responses."),
+            ("pozeza_db_queries_total", "queries", "SQL queries executed."),
+            ("pozeza_query_budget_exceeded_total", "over_budget", "Requests over their query budget."),
+        ):
+            lines += [f"# HELP {name} {help_}", f"# TYPE {name} counter"]
+            for (route, method, status), s in sorted(series.items()):
+                lines.append(f"{name}{{{labels(route, method, status)}}} {s[key]}")
+        lines += [
+            "# HELP pozeza_request_duration_seconds Request latency.",
+            "# TYPE pozeza_request_duration_seconds histogram",
+        ]
+        for (route, method, status), s in sorted(series.items()):
+            for le, n in zip(LATENCY_BUCKETS, s["buckets"]):
+                lines.append(f"pozeza_request_duration_seconds_bucket{{{labels(route, method, status, le=le)}}} {n}")
+            lines.append(f"pozeza_request_duration_seconds_bucket{{{labels(route, method, status, le='+Inf')}}} {s['count']}")
+            lines.append(f"pozeza_request_duration_seconds_sum{{{labels(route, method, status)}}} {s['duration']:.6f}")
+            lines.append(f"pozeza_request_duration_seconds_count{{{labels(route, method, status)}}} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class QueryMetricsMiddleware:
+    sync_capable = True
+    async_capable = True  # під ASGI не змушує async-view працювати в потоці
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        _install(connection)
+        metrics = request._query_metrics = _RequestMetrics()
+        token = _current.set(metrics)
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, t0)
+
+    async def __acall__(self, request):
+        metrics = request._query_metrics = _RequestMetrics()
+        token = _current.set(metrics)
+        t0 = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, t0)
+
+    def _finish(self, request, response, metrics, t0):
+        total = time.perf_counter() - t0  # для StreamingHttpResponse — без часу передачі тіла
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+        budget = _budget_for(request) if match else None
+        over = budget is not None and metrics.queries > budget
+
+        if getattr(settings, "SERVER_TIMING", True):
+            response["Server-Timing"] = (
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries", '
+                f"render;dur={metrics.render_time * 1000:.2f}, "
+                f"total;dur={total * 1000:.2f}"
+            )
+        registry.observe(route, request.method, response.status_code, total, metrics, over)
+
+        if over:
+            msg = f"{request.method} {route}: {metrics.queries} queries > budget {budget}"
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(msg)
+            logger.warning(msg)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response рендериться після цього хука — міряємо сам рендер
+        metrics = getattr(request, "_query_metrics", None)
+        if metrics is not None:
+            t0 = time.perf_counter()
+            def done(rendered):
+                metrics.render_time += time.perf_counter() - t0
+            response.add_post_render_callback(done)
+        return response
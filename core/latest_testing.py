@@ -0,0 +1,38 @@
+"""
+Знімок останнього випробування на Equipment (last_test_date / last_test_result /
+next_test_date).
+
+Останнім вважається запис з найбільшими (date, id) — той самий порядок, що й
+Testing.Meta.ordering. Оновлюється в тій самій транзакції, що й зміна Testing
+(сигнали + явні виклики з масових операцій); разом зі знімком зсувається
+зведення за результатами (core.stats).
+"""
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from . import stats
+from .models import Equipment, Testing
+
+SNAPSHOT_FIELDS = {
+    "last_test_date": "date",
+    "last_test_result": "result",
+    "next_test_date": "next_date",
+}
+
+
+def refresh_latest_testing(equipment_ids) -> int:
+    """Перераховує знімок для набору Equipment одним UPDATE з корельованими підзапитами."""
+    ids = {i for i in equipment_ids if i}
+    if not ids:
+        return 0
+    latest = Testing.objects.filter(equipment_id=OuterRef("pk")).order_by("-date", "-id")
+    updates = {
+        field: Subquery(latest.values(source)[:1])
+        for field, source in SNAPSHOT_FIELDS.items()
+    }
+    # без випробувань підзапит дає NULL, а last_test_result — NOT NULL
+    updates["last_test_result"] = Coalesce(updates["last_test_result"], Value(""))
+    before = stats.snapshot(ids)
+    updated = Equipment.objects.filter(id__in=ids).update(**updates)
+    stats.apply(before, stats.snapshot(ids))
+    return updated
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.latest_testing import refresh_latest_testing
+from core.models import Equipment
+
+
+class Command(BaseCommand):
+    help = "Перераховує знімок останнього випробування (last_test_*) для всього спорядження."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--brigade", type=int, help="лише одна бригада")
+
+    def handle(self, *args, **opts):
+        qs = Equipment.objects.order_by("id")
+        if opts["brigade"]:
+            qs = qs.filter(brigade_id=opts["brigade"])
+        ids = qs.values_list("id", flat=True)
+        batch_size = opts["batch_size"]
+        last_id, total = 0, 0
+        while True:
+            chunk = list(ids.filter(id__gt=last_id)[:batch_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                total += refresh_latest_testing(chunk)
+            last_id = chunk[-1]
+        self.stdout.write(self.style.SUCCESS(f"updated {total} equipment rows"))
@@ -0,0 +1,60 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import dataset, http_load, runner
+from core.benchmarks.stats import compare, load_baseline, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Бенчмарк усіх маршрутів API на датасеті bench_seed: p50/p95/p99, SQL, пам'ять; "
+        "опційно HTTP-навантаження (--http) і порівняння з baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--only", nargs="*", help="підрядки назв маршрутів")
+        parser.add_argument("--http", metavar="URL", help="базовий URL запущеного сервера для навантаження")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10.0, help="секунд на маршрут у режимі --http")
+        parser.add_argument("--skip-client", action="store_true", help="лише HTTP-навантаження")
+        parser.add_argument("--baseline", default="bench_baseline.json")
+        parser.add_argument("--save-baseline", action="store_true")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="допустиме погіршення p95 / пам'яті")
+        parser.add_argument("--output", help="записати результати в JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            ctx = dataset.context()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        results = {}
+        if not opts["skip_client"]:
+            results.update(runner.run(ctx, iterations=opts["iterations"], warmup=opts["warmup"],
+                                      only=opts["only"], log=self.stdout.write))
+        if opts["http"]:
+            results.update(http_load.run(ctx, opts["http"], concurrency=opts["concurrency"],
+                                         duration=opts["duration"], only=opts["only"], log=self.stdout.write))
+
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+
+        if opts["save_baseline"]:
+            save_baseline(opts["baseline"], results)
+            self.stdout.write(self.style.SUCCESS(f"baseline saved to {opts['baseline']}"))
+            return
+
+        baseline = load_baseline(opts["baseline"])
+        if baseline is None:
+            self.stdout.write(f"no baseline at {opts['baseline']} (use --save-baseline)")
+            return
+        problems = compare(results, baseline, opts["tolerance"])
+        if problems:
+            for p in problems:
+                self.stderr.write(p)
+            raise CommandError(f"{len(problems)} regression(s) against {opts['baseline']}")
+        self.stdout.write(self.style.SUCCESS("within baseline thresholds"))
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import dataset, http_load
+
+# маршрути, що під ASGI обслуговують async-view (core.async_views)
+ASYNC_ROUTES = ("brigade.equipment.list", "testing.types", "testing.java.list", "testing.by_type")
+
+
+class Command(BaseCommand):
+    help = (
+        "Пропускна здатність read-ендпоінтів при високій конкурентності: "
+        "WSGI-сервер (--wsgi) проти ASGI-сервера з async-view (--asgi) на одній БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi", metavar="URL", required=True, help="напр. gunicorn pozeza_project.wsgi")
+        parser.add_argument("--asgi", metavar="URL", required=True, help="напр. uvicorn pozeza_project.asgi:application")
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--duration", type=float, default=10.0, help="секунд на маршрут")
+        parser.add_argument("--output", help="записати результати в JSON")
+
+    def handle(self, *args, **opts):
+        try:
+            ctx = dataset.context()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        results = {}
+        for label in ("wsgi", "asgi"):
+            self.stdout.write(f"--- {label}: {opts[label]}")
+            results[label] = http_load.run(ctx, opts[label], concurrency=opts["concurrency"],
+                                           duration=opts["duration"], only=ASYNC_ROUTES, log=self.stdout.write)
+
+        self.stdout.write(f"\n{'route':<32} {'wsgi rps':>10} {'asgi rps':>10} {'x':>6} {'wsgi p95':>10} {'asgi p95':>10}")
+        for name, w in results["wsgi"].items():
+            a = results["asgi"].get(name)
+            if a is None:
+                continue
+            ratio = a["rps"] / w["rps"] if w["rps"] else 0.0
+            self.stdout.write(f"{name:<32} {w['rps']:>10.1f} {a['rps']:>10.1f} {ratio:>6.2f} "
+                              f"{w['p95']:>10.2f} {a['p95']:>10.2f}")
+
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
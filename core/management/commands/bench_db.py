@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Накладні витрати з'єднання з БД на запит: нове з'єднання / постійне / "
+        "постійне з health check / пул. Показує, який драйвер використовується."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--output", help="записати результати в JSON")
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f"driver: {connections.driver_name(opts['database'])}")
+        results = connections.run(opts["database"], iterations=opts["iterations"], log=self.stdout.write)
+        base = results["db:connect"]["mean"]
+        for name, r in results.items():
+            if name != "db:connect" and r["mean"]:
+                self.stdout.write(f"{name:<15} {base / r['mean']:6.1f}x vs connect")
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
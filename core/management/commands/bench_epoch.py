@@ -0,0 +1,67 @@
+"""
+Мікробенчмарк перетворень дата ↔ epoch ms (core.epoch) проти попередніх
+`datetime.combine(...).timestamp()` / `datetime.utcfromtimestamp(...)`.
+
+Без БД: стовпці дат генеруються в пам'яті (як у списках випробувань —
+із повторами). Заодно звіряє, що кодек віддає ті самі мс, що й старий код.
+"""
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.epoch import get_codec
+
+
+def _legacy_encode(d):
+    return int(datetime.combine(d, datetime.min.time()).timestamp() * 1000)
+
+
+def _legacy_decode(ms):
+    return datetime.fromtimestamp(ms / 1000.0, dt_timezone.utc).date()
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+class Command(BaseCommand):
+    help = "Бенчмарк дата ↔ epoch ms: старий код vs core.epoch (по значенню і по стовпцю)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+        parser.add_argument("--days", type=int, default=1000, help="різних дат у стовпці")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        rows, repeat = opts["rows"], opts["repeat"]
+        start = date(2020, 1, 1)
+        dates = [start + timedelta(days=i % opts["days"]) for i in range(rows)]
+        codec = get_codec()
+        self.stdout.write(f"{rows} rows, {opts['days']} distinct dates, zone {codec.tz}")
+
+        slow_t, legacy = _best(lambda: [_legacy_encode(d) for d in dates], repeat)
+        value_t, _ = _best(lambda: [codec.encode(d) for d in dates], repeat)
+        column_t, encoded = _best(lambda: codec.encode_column(dates), repeat)
+        if encoded != legacy:
+            raise CommandError("codec output differs from the legacy encoder")
+        self._report("encode", slow_t, value_t, column_t)
+
+        slow_t, _ = _best(lambda: [_legacy_decode(ms) for ms in encoded], repeat)
+        value_t, _ = _best(lambda: [codec.decode(ms) for ms in encoded], repeat)
+        column_t, decoded = _best(lambda: codec.decode_column(encoded), repeat)
+        if decoded != dates:
+            raise CommandError("decode(encode(d)) != d")
+        self._report("decode", slow_t, value_t, column_t)
+
+    def _report(self, name, slow_t, value_t, column_t):
+        self.stdout.write(
+            f"{name:<8} legacy {slow_t * 1000:8.1f} ms   per value {value_t * 1000:8.1f} ms"
+            f"   column {column_t * 1000:8.1f} ms   x{slow_t / column_t:5.1f}"
+        )
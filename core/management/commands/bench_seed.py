@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import dataset
+
+
+class Command(BaseCommand):
+    help = "Створює (або видаляє з --clean) синтетичний датасет для bench_api. Не запускати на проді."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--brigades", type=int, default=3)
+        parser.add_argument("--detachments", type=int, default=6)
+        parser.add_argument("--nomenclature", type=int, default=20)
+        parser.add_argument("--equipment", type=int, default=3000)
+        parser.add_argument("--testings", type=int, default=30000)
+        parser.add_argument("--clean", action="store_true", help="лише видалити bench-дані")
+
+    def handle(self, *args, **opts):
+        if opts["clean"]:
+            dataset.clean()
+            self.stdout.write(self.style.SUCCESS("bench data removed"))
+            return
+        ctx = dataset.seed(
+            brigades=opts["brigades"],
+            detachments=opts["detachments"],
+            nomenclature=opts["nomenclature"],
+            equipment=opts["equipment"],
+            testings=opts["testings"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"seeded; login {dataset.USERNAME}/{dataset.PASSWORD}, brigade {ctx.brigade.id}, type {ctx.type_id}"
+        ))
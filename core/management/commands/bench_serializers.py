@@ -0,0 +1,94 @@
+"""
+Порівняння DRF-серіалізаторів зі швидкими (core.fast_serializers).
+
+Синтетичні дані створюються в транзакції, яка в кінці відкочується,
+тож команду можна запускати на робочій БД.
+"""
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.fast_serializers import (
+    FastEquipmentSerializer, FastJavaTestingSerializer, FastTestingSerializer, ModelSerializerLister,
+)
+from core.models import Brigade, Equipment, Testing
+from core.renderers import OrjsonRenderer
+from core.serializers import EquipmentSerializer, TestingSerializer, java_testing_out
+from rest_framework.renderers import JSONRenderer
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+class Command(BaseCommand):
+    help = "Бенчмарк серіалізації списків: DRF vs fast (values_list) і JSON vs orjson."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        try:
+            with transaction.atomic():
+                self._run(opts["rows"], opts["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, rows):
+        brigade = Brigade.objects.create(name=f"bench-{time.time_ns()}")
+        Equipment.objects.bulk_create(
+            [Equipment(brigade=brigade, inventory_number=f"B{i:07d}", name="Мотузка рятувальна",
+                       type="мотузки", description="bench") for i in range(rows)],
+            batch_size=2000,
+        )
+        eq_ids = list(Equipment.objects.filter(brigade=brigade).values_list("id", flat=True))
+        start = date(2020, 1, 1)
+        Testing.objects.bulk_create(
+            [Testing(equipment_id=eq_id, date=start + timedelta(days=i % 1000), result="придатно",
+                     next_date=start + timedelta(days=i % 1000 + 365)) for i, eq_id in enumerate(eq_ids)],
+            batch_size=2000,
+        )
+        return brigade
+
+    def _run(self, rows, repeat):
+        self.stdout.write(f"seeding {rows} equipment + {rows} testing rows ...")
+        brigade = self._seed(rows)
+        equipment = Equipment.objects.filter(brigade=brigade)
+        testing = Testing.objects.filter(equipment__brigade=brigade)
+
+        cases = [
+            ("equipment", ModelSerializerLister(EquipmentSerializer), FastEquipmentSerializer(), equipment),
+            ("testing", ModelSerializerLister(TestingSerializer), FastTestingSerializer(), testing),
+        ]
+        for name, slow, fast, qs in cases:
+            slow_t, _ = _best(lambda: slow.serialize(qs), repeat)
+            fast_t, _ = _best(lambda: fast.serialize(qs), repeat)
+            self._report(name, slow_t, fast_t)
+
+        java_qs = testing.select_related("equipment")
+        slow_t, _ = _best(lambda: [java_testing_out(t, t.equipment.inventory_number) for t in java_qs], repeat)
+        fast_t, data = _best(lambda: FastJavaTestingSerializer().serialize(java_qs), repeat)
+        self._report("java testing", slow_t, fast_t)
+
+        json_t, _ = _best(lambda: JSONRenderer().render(data), repeat)
+        orjson_t, _ = _best(lambda: OrjsonRenderer().render(data), repeat)
+        self._report("render json/orjson", json_t, orjson_t)
+
+    def _report(self, name, slow_t, fast_t):
+        self.stdout.write(
+            f"{name:<20} slow {slow_t * 1000:9.1f} ms   fast {fast_t * 1000:9.1f} ms   x{slow_t / fast_t:5.1f}"
+        )
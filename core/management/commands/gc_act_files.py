@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Testing
+
+ROOT = "acts"
+
+
+def _walk(storage, path):
+    dirs, files = storage.listdir(path)
+    for name in files:
+        yield f"{path}/{name}"
+    for d in dirs:
+        yield from _walk(storage, f"{path}/{d}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Звіряє файли актів (acts/) з Testing.file: видаляє файли, на які ніхто не посилається, "
+        "і показує записи, чий файл зник."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="лише показати, нічого не видаляти")
+        parser.add_argument("--grace-hours", type=float, default=24,
+                            help="не чіпати свіжіші файли (завантаження, чий Testing ще не закомічено)")
+        parser.add_argument("--clear-missing", action="store_true", help="обнулити Testing.file без файлу на диску")
+
+    def handle(self, *args, **opts):
+        storage = Testing._meta.get_field("file").storage
+        dry = opts["dry_run"]
+        referenced = set(
+            Testing.objects.exclude(file="").exclude(file__isnull=True)
+            .values_list("file", flat=True).distinct().iterator()
+        )
+        cutoff = timezone.now() - timedelta(hours=opts["grace_hours"])
+
+        on_disk = set()
+        removed = recent = relinked = freed = 0
+        if storage.exists(ROOT):
+            for name in _walk(storage, ROOT):
+                on_disk.add(name)
+                if name in referenced:
+                    continue
+                if storage.get_modified_time(name) > cutoff:
+                    recent += 1
+                    continue
+                # список посилань прочитано на початку — файл могли перевикористати (дедуплікація) відтоді
+                if Testing.objects.filter(file=name).exists():
+                    relinked += 1
+                    continue
+                freed += storage.size(name)
+                removed += 1
+                if not dry:
+                    storage.delete(name)
+
+        missing = sorted(referenced - on_disk)
+        for name in missing[:20]:
+            self.stderr.write(f"missing: {name}")
+        if missing and opts["clear_missing"] and not dry:
+            for i in range(0, len(missing), 1000):
+                Testing.objects.filter(file__in=missing[i:i + 1000]).update(file="")
+
+        verb = "would remove" if dry else "removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {removed} orphaned files ({freed / 1024 / 1024:.1f} MiB), "
+            f"kept {recent} recent, {len(referenced) + relinked} referenced, {len(missing)} missing"
+        ))
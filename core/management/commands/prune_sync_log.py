@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.changelog import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Прибирає надгробки журналу синхронізації (core_sync_change), старші за --days. "
+        "Клієнти з токеном, старшим за прибрані надгробки, отримають reset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=float, default=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+
+    def handle(self, *args, **opts):
+        removed = prune_tombstones(timezone.now() - timedelta(days=opts["days"]))
+        self.stdout.write(self.style.SUCCESS(f"removed {removed} tombstones"))
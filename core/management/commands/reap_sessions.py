@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models import UserSession
+from core.session_reaper import REAP_BATCH_SIZE, expired_cutoff, reap_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє протерміновані сесії (core_user_session) пачками. "
+        "Для cron; у процесі сервера те саме робить AUTH_SESSION_REAP_INTERVAL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REAP_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None, help="обмежити тривалість одного запуску")
+        parser.add_argument("--dry-run", action="store_true", help="лише порахувати")
+        parser.add_argument("--optimize", action="store_true",
+                            help="після видалення — OPTIMIZE TABLE (MySQL), щоб віддати місце індексів")
+
+    def handle(self, *args, **opts):
+        if opts["dry_run"]:
+            n = UserSession.objects.filter(expires_at__lt=expired_cutoff()).count()
+            self.stdout.write(self.style.SUCCESS(f"would remove {n} expired sessions"))
+            return
+        removed = reap_expired(opts["batch_size"], opts["max_batches"])
+        if opts["optimize"] and removed:
+            if connection.vendor == "mysql":
+                with connection.cursor() as cursor:
+                    cursor.execute(f"OPTIMIZE TABLE {UserSession._meta.db_table}")
+                    cursor.fetchall()
+            else:
+                self.stderr.write(f"--optimize: not supported on {connection.vendor}, skipped")
+        left = UserSession.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"removed {removed} expired sessions, {left} left"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core import search
+from core.models import Equipment
+
+
+class Command(BaseCommand):
+    help = "Перебудовує пошуковий індекс спорядження (core_search_document / core_search_trigram)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--brigade", type=int, help="лише одна бригада")
+
+    def handle(self, *args, **opts):
+        if opts["brigade"]:
+            total = search.index_brigade(opts["brigade"])
+        else:
+            total = search.index_equipment(Equipment.objects.values_list("id", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"indexed {total} equipment rows"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Brigade
+from core.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Повністю перераховує зведену статистику спорядження (core_equipment_stat) — лагодить дрейф."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--brigade", type=int, action="append", help="лише ці бригади (можна повторювати)")
+
+    def handle(self, *args, **opts):
+        brigade_ids = opts["brigade"] or list(Brigade.objects.order_by("id").values_list("id", flat=True))
+        cells = 0
+        # по бригаді в транзакції — не тримаємо блокування на всю таблицю
+        for brigade_id in brigade_ids:
+            cells += rebuild([brigade_id])
+        self.stdout.write(self.style.SUCCESS(f"rebuilt {cells} stat cells for {len(brigade_ids)} brigades"))
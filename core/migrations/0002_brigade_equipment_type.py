@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:19
+
+import hashlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_types(apps, schema_editor):
+    Equipment = apps.get_model("core", "Equipment")
+    BrigadeEquipmentType = apps.get_model("core", "BrigadeEquipmentType")
+    pairs = set(Equipment.objects.values_list("brigade_id", "type"))
+    pairs |= set(
+        Equipment.objects.filter(nomenclature__isnull=False)
+        .values_list("brigade_id", "nomenclature__category")
+    )
+    rows = [
+        BrigadeEquipmentType(
+            brigade_id=brigade_id,
+            type_id=int(hashlib.md5(name.encode("utf-8")).hexdigest()[:8], 16),
+            name=name,
+        )
+        for brigade_id, name in pairs if name
+    ]
+    BrigadeEquipmentType.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrigadeEquipmentType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type_id', models.BigIntegerField()),
+                ('name', models.CharField(max_length=50)),
+                ('brigade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equipment_types', to='core.brigade')),
+            ],
+            options={
+                'db_table': 'core_brigade_equipment_type',
+                'ordering': ['name'],
+                'unique_together': {('brigade', 'type_id')},
+            },
+        ),
+        migrations.RunPython(backfill_types, migrations.RunPython.noop),
+    ]
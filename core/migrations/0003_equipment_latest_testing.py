@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_brigade_equipment_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='last_test_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='last_test_result',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='next_test_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_equipment_latest_testing'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['brigade', 'next_test_date'], name='equipment_brigade_next_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testing',
+            index=models.Index(fields=['equipment', 'date', 'id'], name='testing_equipment_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testing',
+            index=models.Index(fields=['next_date'], name='testing_next_date_idx'),
+        ),
+    ]
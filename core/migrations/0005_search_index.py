@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# нормалізація та триграми мусять збігатися з рантаймом (core.search) — інакше пошук не знайде документ
+from core.search import INDEX_BATCH, normalize, trigrams
+
+
+def add_fulltext(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(
+        "ALTER TABLE core_search_document "
+        "ADD FULLTEXT INDEX search_document_ft (document) WITH PARSER ngram"
+    )
+
+
+def drop_fulltext(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute("ALTER TABLE core_search_document DROP INDEX search_document_ft")
+
+
+def backfill_documents(apps, schema_editor):
+    # як core.search.index_equipment, але по історичних моделях
+    Equipment = apps.get_model("core", "Equipment")
+    EquipmentSearchDocument = apps.get_model("core", "EquipmentSearchDocument")
+    SearchTrigram = apps.get_model("core", "SearchTrigram")
+    rows = Equipment.objects.order_by("id").values_list(
+        "id", "brigade_id", "inventory_number", "name", "description", "type",
+        "nomenclature__name", "nomenclature__category",
+    )
+    docs = [
+        EquipmentSearchDocument(equipment_id=eq_id, brigade_id=brigade_id, document=normalize(" ".join(p for p in parts if p)))
+        for eq_id, brigade_id, *parts in rows.iterator(chunk_size=INDEX_BATCH)
+    ]
+    EquipmentSearchDocument.objects.bulk_create(docs, batch_size=INDEX_BATCH)
+    if schema_editor.connection.vendor != "mysql":
+        SearchTrigram.objects.bulk_create(
+            (SearchTrigram(document_id=d.equipment_id, gram=g) for d in docs for g in trigrams(d.document)),
+            batch_size=INDEX_BATCH * 10,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_inspection_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentSearchDocument',
+            fields=[
+                ('equipment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='core.equipment')),
+                ('document', models.TextField()),
+                ('brigade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.brigade')),
+            ],
+            options={
+                'db_table': 'core_search_document',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='core.equipmentsearchdocument')),
+            ],
+            options={
+                'db_table': 'core_search_trigram',
+                'indexes': [models.Index(fields=['gram', 'document'], name='search_trigram_gram_idx')],
+            },
+        ),
+        migrations.RunPython(add_fulltext, drop_fulltext),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:41
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='testing',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.ActStorage(), upload_to=core.models.upload_testing_file),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_testing_act_storage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['expires_at'], name='user_session_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', 'created_at'], name='user_session_user_created_idx'),
+        ),
+    ]
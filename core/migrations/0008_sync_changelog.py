@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_user_session_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncStream',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('seq', models.BigIntegerField(default=0)),
+                ('floor', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'core_sync_stream',
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stream', models.PositiveIntegerField()),
+                ('seq', models.BigIntegerField()),
+                ('kind', models.CharField(max_length=1)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'core_sync_change',
+                'indexes': [models.Index(fields=['stream', 'seq'], name='sync_change_stream_seq_idx')],
+                'unique_together': {('stream', 'kind', 'object_id')},
+            },
+        ),
+    ]
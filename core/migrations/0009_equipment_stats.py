@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Coalesce
+
+
+def backfill_stats(apps, schema_editor):
+    # те саме, що core.stats.rebuild(), на історичних моделях
+    Equipment = apps.get_model("core", "Equipment")
+    EquipmentStat = apps.get_model("core", "EquipmentStat")
+    rows = (
+        Equipment.objects.annotate(stat_category=Coalesce("nomenclature__category", "type"))
+        .values("brigade_id", "detachment_id", "stat_category", "last_test_result")
+        .annotate(n=Count("id")).order_by()
+    )
+    EquipmentStat.objects.bulk_create([
+        EquipmentStat(
+            brigade_id=r["brigade_id"], detachment=r["detachment_id"] or 0,
+            category=r["stat_category"], result=r["last_test_result"] or "", count=r["n"],
+        )
+        for r in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_sync_changelog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('detachment', models.PositiveIntegerField(default=0)),
+                ('category', models.CharField(max_length=50)),
+                ('result', models.CharField(blank=True, default='', max_length=32)),
+                ('count', models.IntegerField(default=0)),
+                ('brigade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.brigade')),
+            ],
+            options={
+                'db_table': 'core_equipment_stat',
+                'unique_together': {('brigade', 'detachment', 'category', 'result')},
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
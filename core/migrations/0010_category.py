@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:01
+
+import hashlib
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# правило зіставлення назв мусить збігатися з рантаймом (core.categories); модуль без моделей
+from core.collation import fold
+
+BATCH_SIZE = 1000
+
+# копія core.serializers._guess_category на момент міграції: евристика в застосунку може змінитись, міграція — ні
+GUESS_CATEGORIES = (
+    ("драб", "драбини"),
+    ("мотуз", "мотузки"),
+    ("рукав", "рукавиці"),
+    ("ремен", "ремені"),
+)
+
+
+def _guess_category(name):
+    n = (name or "").lower()
+    for stem, category in GUESS_CATEGORIES:
+        if stem in n:
+            return category
+    return "інше"
+
+
+def backfill_categories(apps, schema_editor):
+    # те саме, що core.categories / сигнали, на історичних моделях
+    Category = apps.get_model("core", "Category")
+    Nomenclature = apps.get_model("core", "Nomenclature")
+    Equipment = apps.get_model("core", "Equipment")
+
+    nomenclature = {
+        pk: category or _guess_category(name)
+        for pk, category, name in Nomenclature.objects.values_list("id", "category", "name")
+    }
+    legacy = defaultdict(list)  # категорія з type → Equipment без номенклатури
+    for pk, type_name, name in Equipment.objects.filter(nomenclature__isnull=True).values_list("id", "type", "name").iterator():
+        legacy[type_name or _guess_category(name)].append(pk)
+
+    names = set(nomenclature.values()) | set(legacy)
+    Category.objects.bulk_create([Category(name=n) for n in sorted(names)], ignore_conflicts=True, batch_size=BATCH_SIZE)
+    ids = dict(Category.objects.values_list("name", "id"))
+    folded = {fold(k): v for k, v in ids.items()}
+
+    def category_id(name):
+        return ids.get(name) or folded[fold(name)]
+
+    by_category = defaultdict(list)
+    for pk, name in nomenclature.items():
+        by_category[category_id(name)].append(pk)
+    for cid, pks in by_category.items():
+        for i in range(0, len(pks), BATCH_SIZE):
+            chunk = pks[i:i + BATCH_SIZE]
+            Nomenclature.objects.filter(pk__in=chunk).update(category_ref_id=cid)
+            Equipment.objects.filter(nomenclature_id__in=chunk).update(category_ref_id=cid)
+    for name, pks in legacy.items():
+        cid = category_id(name)
+        for i in range(0, len(pks), BATCH_SIZE):
+            Equipment.objects.filter(pk__in=pks[i:i + BATCH_SIZE]).update(category_ref_id=cid)
+
+
+def rebuild_type_registry(apps, schema_editor):
+    # як core.type_registry.refresh_all: реєстр типів бригади — ефективні категорії, а не legacy type
+    Equipment = apps.get_model("core", "Equipment")
+    BrigadeEquipmentType = apps.get_model("core", "BrigadeEquipmentType")
+    pairs = set(
+        Equipment.objects.filter(category_ref__isnull=False).order_by()
+        .values_list("brigade_id", "category_ref__name").distinct()
+    )
+    BrigadeEquipmentType.objects.all().delete()
+    rows = [
+        BrigadeEquipmentType(
+            brigade_id=brigade_id,
+            type_id=int(hashlib.md5(name.encode("utf-8")).hexdigest()[:8], 16),
+            name=name,
+        )
+        for brigade_id, name in pairs if name
+    ]
+    BrigadeEquipmentType.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_equipment_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'db_table': 'core_category',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='equipments', to='core.category'),
+        ),
+        migrations.AddField(
+            model_name='nomenclature',
+            name='category_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='nomenclatures', to='core.category'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['brigade', 'category_ref'], name='equipment_brigade_category_idx'),
+        ),
+        migrations.RunPython(backfill_categories, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_type_registry, migrations.RunPython.noop),
+    ]
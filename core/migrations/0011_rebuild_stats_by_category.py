@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:11
+
+from django.db import migrations
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+
+
+def rebuild_stats(apps, schema_editor):
+    # зведення по ефективній категорії (category_ref), як core.stats.rebuild()
+    Equipment = apps.get_model("core", "Equipment")
+    EquipmentStat = apps.get_model("core", "EquipmentStat")
+    rows = (
+        Equipment.objects.annotate(stat_category=Coalesce("category_ref__name", Value("")))
+        .values("brigade_id", "detachment_id", "stat_category", "last_test_result")
+        .annotate(n=Count("id")).order_by()
+    )
+    EquipmentStat.objects.all().delete()
+    EquipmentStat.objects.bulk_create([
+        EquipmentStat(
+            brigade_id=r["brigade_id"], detachment=r["detachment_id"] or 0,
+            category=r["stat_category"], result=r["last_test_result"] or "", count=r["n"],
+        )
+        for r in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_category'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_stats, migrations.RunPython.noop),
+    ]
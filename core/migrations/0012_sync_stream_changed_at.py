@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:34
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stamp_streams(apps, schema_editor):
+    # без позначки каталог не мав би Last-Modified до першого запису
+    apps.get_model("core", "SyncStream").objects.update(changed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_rebuild_stats_by_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncstream',
+            name='changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(stamp_streams, migrations.RunPython.noop),
+    ]
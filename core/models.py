@@ -2,6 +2,8 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 
+from .storage import act_storage, content_name, file_digest
+
 # --- Core domain models ---
 
 class Brigade(models.Model):
@@ -51,16 +53,36 @@ class UserSession(models.Model):
 
     class Meta:
         db_table = "core_user_session"
+        indexes = [
+            # reap_sessions / планувальник у core.session_reaper
+            models.Index(fields=["expires_at"], name="user_session_expires_idx"),
+            # ліміт сесій на користувача при логіні
+            models.Index(fields=["user", "created_at"], name="user_session_user_created_idx"),
+        ]
 
     def is_active(self) -> bool:
         return timezone.now() < self.expires_at
 
 
+class Category(models.Model):
+    """Нормалізована категорія спорядження (core.categories)."""
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        db_table = "core_category"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
 # --- New: Nomenclature (catalog of items) ---
 
 class Nomenclature(models.Model):
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=50, db_index=True)  # "драбини" | "мотузки" | ...
+    # те саме, нормалізовано; підтримується сигналом з рядка category
+    category_ref = models.ForeignKey(Category, null=True, blank=True, editable=False, on_delete=models.PROTECT, related_name="nomenclatures")
     slug = models.SlugField(max_length=120, unique=True)
     unit = models.CharField(max_length=32, default="шт")
     active = models.BooleanField(default=True)
@@ -85,18 +107,70 @@ class Equipment(models.Model):
     nomenclature = models.ForeignKey(Nomenclature, null=True, blank=True, on_delete=models.SET_NULL, related_name="equipments")
     description = models.CharField(max_length=255, blank=True, default="")
     detachment = models.ForeignKey(Detachment, null=True, blank=True, on_delete=models.SET_NULL, related_name="equipments")
+    # Ефективна категорія (номенклатури, інакше type) — для фільтрів одним індексом, див. core.categories
+    category_ref = models.ForeignKey(Category, null=True, blank=True, editable=False, on_delete=models.PROTECT, related_name="equipments")
+
+    # Знімок останнього випробування (денормалізація, див. core.latest_testing)
+    last_test_date = models.DateField(null=True, blank=True)
+    last_test_result = models.CharField(max_length=32, blank=True, default="")
+    next_test_date = models.DateField(null=True, blank=True, db_index=True)
 
     class Meta:
         db_table = "core_equipment"
         unique_together = (("brigade", "inventory_number"),)
         ordering = ["inventory_number"]
+        indexes = [
+            models.Index(fields=["brigade", "next_test_date"], name="equipment_brigade_next_idx"),
+            models.Index(fields=["brigade", "category_ref"], name="equipment_brigade_category_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.inventory_number} — {self.name}"
 
 
+class BrigadeEquipmentType(models.Model):
+    """
+    Реєстр типів спорядження бригади: stable_id(назва категорії) → назва.
+    Підтримується сигналами (core.type_registry), щоб не сканувати Equipment на кожен запит.
+    """
+    brigade = models.ForeignKey(Brigade, on_delete=models.CASCADE, related_name="equipment_types")
+    type_id = models.BigIntegerField()
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        db_table = "core_brigade_equipment_type"
+        unique_together = (("brigade", "type_id"),)
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return f"{self.brigade_id}: {self.name}"
+
+
+class EquipmentSearchDocument(models.Model):
+    """
+    Денормалізований текст для пошуку (спорядження + номенклатура), див. core.search.
+    На MySQL має FULLTEXT-індекс (ngram), на інших БД — таблицю триграм SearchTrigram.
+    """
+    equipment = models.OneToOneField(Equipment, primary_key=True, on_delete=models.CASCADE, related_name="search_document")
+    brigade = models.ForeignKey(Brigade, on_delete=models.CASCADE, related_name="+")
+    document = models.TextField()
+
+    class Meta:
+        db_table = "core_search_document"
+
+
+class SearchTrigram(models.Model):
+    document = models.ForeignKey(EquipmentSearchDocument, on_delete=models.CASCADE, related_name="trigrams")
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        db_table = "core_search_trigram"
+        indexes = [models.Index(fields=["gram", "document"], name="search_trigram_gram_idx")]
+
+
 def upload_testing_file(instance, filename: str) -> str:
-    return f"acts/{instance.equipment_id}/{filename}"
+    # контент-адресоване ім'я (core.storage); вміст, що зберігається, — instance.file
+    return content_name(file_digest(instance.file.file), filename)
 
 
 class Testing(models.Model):
@@ -104,13 +178,68 @@ class Testing(models.Model):
     date = models.DateField()
     result = models.CharField(max_length=32)  # "придатно" / "непридатно"
     next_date = models.DateField(null=True, blank=True)
-    file = models.FileField(upload_to=upload_testing_file, null=True, blank=True)
+    file = models.FileField(upload_to=upload_testing_file, storage=act_storage, null=True, blank=True)
     external_url = models.URLField(max_length=500, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = "core_testing"
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(fields=["equipment", "date", "id"], name="testing_equipment_date_idx"),
+            models.Index(fields=["next_date"], name="testing_next_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.equipment.inventory_number} @ {self.date}: {self.result}"
+
+
+class SyncStream(models.Model):
+    """
+    Лічильник журналу змін (core.changelog): id = id бригади, 0 — спільний каталог
+    (номенклатура). Рядок блокується UPDATE-ом до коміту, тож номери змін
+    у межах потоку комітяться по порядку.
+    """
+    id = models.PositiveIntegerField(primary_key=True)
+    seq = models.BigIntegerField(default=0)
+    floor = models.BigIntegerField(default=0)  # до цього номера надгробки вже прибрані
+    changed_at = models.DateTimeField(null=True, blank=True)  # остання зміна (Last-Modified каталогу)
+
+    class Meta:
+        db_table = "core_sync_stream"
+
+
+class SyncChange(models.Model):
+    """Остання зміна об'єкта в потоці; deleted — надгробок (tombstone)."""
+    KIND_EQUIPMENT = "e"
+    KIND_TESTING = "t"
+    KIND_NOMENCLATURE = "n"
+
+    stream = models.PositiveIntegerField()
+    seq = models.BigIntegerField()
+    kind = models.CharField(max_length=1)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "core_sync_change"
+        unique_together = (("stream", "kind", "object_id"),)
+        indexes = [models.Index(fields=["stream", "seq"], name="sync_change_stream_seq_idx")]
+
+
+class EquipmentStat(models.Model):
+    """
+    Зведення для дашборду: кількість спорядження в комірці
+    (бригада, загін, категорія, результат останнього випробування).
+    Підтримується інкрементно (core.stats), повний перерахунок — rebuild_stats.
+    """
+    brigade = models.ForeignKey(Brigade, on_delete=models.CASCADE, related_name="+")
+    detachment = models.PositiveIntegerField(default=0)  # id загону, 0 — без загону
+    category = models.CharField(max_length=50)
+    result = models.CharField(max_length=32, blank=True, default="")  # "" — не випробовувалось
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "core_equipment_stat"
+        unique_together = (("brigade", "detachment", "category", "result"),)
@@ -0,0 +1,140 @@
+"""
+Keyset (cursor) пагінація для великих списків.
+
+Пагінація вмикається лише якщо клієнт передав `limit` або `cursor` —
+старі клієнти й далі отримують повний список. Курсор — непрозорий
+base64(JSON) з ключем останнього рядка сторінки, тож наступна сторінка
+береться умовою `(date, id) < (d, i)` по індексу, а не OFFSET.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class KeysetPagination(BasePagination):
+    ordering = ("-id",)
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 100
+    max_page_size = 1000
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.next_cursor = None
+
+    # --- cursor ---
+
+    @staticmethod
+    def encode_cursor(values) -> str:
+        raw = json.dumps([_plain(v) for v in values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw.decode("utf-8"))
+        except (ValueError, TypeError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(values, list):
+            raise NotFound("Invalid cursor")
+        return values
+
+    def _key(self, row):
+        names = [f.lstrip("-") for f in self.ordering]
+        if isinstance(row, dict):
+            return [row[n] for n in names]
+        return [getattr(row, n) for n in names]
+
+    def _typed(self, model, values):
+        """Значення курсора, приведені до типів полів ordering; чуже / зіпсоване — NotFound."""
+        if len(values) != len(self.ordering) or not all(isinstance(v, (str, int, float)) for v in values):
+            raise NotFound("Invalid cursor")
+        try:
+            typed = [model._meta.get_field(f.lstrip("-")).to_python(v) for f, v in zip(self.ordering, values)]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound("Invalid cursor")
+        if any(v is None for v in typed):
+            raise NotFound("Invalid cursor")
+        return typed
+
+    def _after(self, values):
+        """Q для рядків строго після ключа `values` у порядку self.ordering."""
+        if len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        cond = Q()
+        prefix = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            cond |= Q(**prefix, **{f"{name}__{lookup}": value})
+            prefix[name] = value
+        return cond
+
+    # --- DRF API ---
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            limit = self.page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def _page_queryset(self, queryset, request):
+        limit = self.get_limit(request)
+        qs = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            qs = qs.filter(self._after(self._typed(queryset.model, self.decode_cursor(cursor))))
+        return qs[:limit + 1], limit
+
+    def _cut(self, rows, limit):
+        if len(rows) > limit:
+            rows = rows[:limit]
+            self.next_cursor = self.encode_cursor(self._key(rows[-1]))
+        else:
+            self.next_cursor = None
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        qs, limit = self._page_queryset(queryset, request)
+        return self._cut(list(qs), limit)
+
+    async def apaginate_queryset(self, queryset, request):
+        if not self.is_requested(request):
+            return None
+        qs, limit = self._page_queryset(queryset, request)
+        return self._cut([row async for row in qs], limit)
+
+    def get_paginated_data(self, data) -> dict:
+        return {"next": self.next_cursor, "results": data}
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class EquipmentPagination(KeysetPagination):
+    ordering = ("inventory_number", "id")
+
+
+class TestingPagination(KeysetPagination):
+    ordering = ("-date", "-id")
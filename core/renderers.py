@@ -0,0 +1,33 @@
+"""
+JSON-рендерер на orjson (опційна залежність).
+
+Без orjson поводиться як звичайний rest_framework JSONRenderer.
+"""
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class OrjsonRenderer(JSONRenderer):
+    _fallback = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # відступи (?indent / Accept: ...; indent=) — рідкісний випадок, віддаємо стандартному
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self._fallback.default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class OrjsonResponse(HttpResponse):
+    """JSON-відповідь для async-view поза DRF; `.data` — як у DRF Response."""
+
+    def __init__(self, data, status=200):
+        self.data = data
+        super().__init__(OrjsonRenderer().render(data), status=status, content_type="application/json")
@@ -0,0 +1,87 @@
+"""
+Кеш відповідей per-brigade ендпоінтів.
+
+Ключ: бригада + її поточна версія (core.versioning) + view + шлях/параметри.
+Сигнали на Equipment / Testing / Nomenclature (і масові операції) інкрементують
+версію бригади, тож після будь-якого запису старі ключі просто перестають
+використовуватись — застарілі дані не віддаються.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .models import Equipment
+from .renderers import OrjsonResponse
+from .scoping import get_scope
+from .versioning import aget_version, bump_version, get_version
+
+
+def _brigade(brigade_id) -> str:
+    return f"brigade:{brigade_id}"
+
+
+def bump_brigade(*brigade_ids):
+    for brigade_id in {b for b in brigade_ids if b}:
+        bump_version(_brigade(brigade_id))
+
+
+def bump_equipment_brigades(equipment_ids):
+    ids = {i for i in equipment_ids if i}
+    if ids:
+        bump_brigade(*Equipment.objects.filter(id__in=ids).values_list("brigade_id", flat=True).distinct())
+
+
+def _key(view, request, brigade_id, version) -> str:
+    # async-варіант view ділить кеш із синхронним (однакова відповідь)
+    name = getattr(view, "cache_name", None) or type(view).__name__
+    # з фільтром загонів (core.scoping) відповідь залежить ще й від області користувача
+    path = request.get_full_path() + get_scope(request.user).cache_tag
+    digest = hashlib.md5(path.encode("utf-8")).hexdigest()
+    return f"core:resp:{brigade_id}:{version}:{name}:{digest}"
+
+
+def brigade_cached(get_brigade_id=None):
+    """
+    Декоратор методу APIView. `get_brigade_id(request, **kwargs)` — звідки брати
+    бригаду (за замовчуванням kwarg `brigade_id`). Кешуються лише 200-відповіді
+    DRF (не streaming).
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            brigade_id = get_brigade_id(request, **kwargs) if get_brigade_id else kwargs.get("brigade_id")
+            if not brigade_id:
+                return view_method(self, request, *args, **kwargs)
+            key = _key(self, request, brigade_id, get_version(_brigade(brigade_id)))
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view_method(self, request, *args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                cache.set(key, response.data, getattr(settings, "RESPONSE_CACHE_TTL", 300))
+            return response
+        return wrapper
+    return decorator
+
+
+def abrigade_cached(get_brigade_id=None):
+    """brigade_cached для async-методів view, що повертають OrjsonResponse."""
+    def decorator(view_method):
+        @wraps(view_method)
+        async def wrapper(self, request, *args, **kwargs):
+            brigade_id = get_brigade_id(request, **kwargs) if get_brigade_id else kwargs.get("brigade_id")
+            if not brigade_id:
+                return await view_method(self, request, *args, **kwargs)
+            key = _key(self, request, brigade_id, await aget_version(_brigade(brigade_id)))
+            data = await cache.aget(key)
+            if data is not None:
+                return OrjsonResponse(data)
+            response = await view_method(self, request, *args, **kwargs)
+            if isinstance(response, OrjsonResponse) and response.status_code == 200:
+                await cache.aset(key, response.data, getattr(settings, "RESPONSE_CACHE_TTL", 300))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,80 @@
+"""
+Область доступу користувача: дозволені бригади й загони.
+
+Визначається один раз на сесію (при завантаженні сесії в core.session_cache,
+а при логіні — одразу) і живе разом із закешованим користувачем, тож
+перевірки доступу не ходять у БД і не читають M2M User.detachments.
+
+Застосовується як фільтр `brigade_id IN (...)` у querysets (плюс
+`detachment_id IN (...)`, якщо увімкнено AUTH_SCOPE_DETACHMENTS і користувачу
+призначено загони) і як permission BrigadeScoped для маршрутів з бригадою.
+GOD / суперкористувач — без обмежень.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+from rest_framework.exceptions import PermissionDenied
+
+
+@dataclass(frozen=True)
+class Scope:
+    unrestricted: bool = False
+    brigade_ids: frozenset = frozenset()
+    detachment_ids: frozenset = frozenset()
+
+    @property
+    def by_detachment(self) -> bool:
+        return (
+            not self.unrestricted and bool(self.detachment_ids) and
+            getattr(settings, "AUTH_SCOPE_DETACHMENTS", False)
+        )
+
+    def allows_brigade(self, brigade_id) -> bool:
+        if self.unrestricted:
+            return True
+        try:
+            return int(brigade_id) in self.brigade_ids
+        except (TypeError, ValueError):
+            return False
+
+    def equipment(self, qs, prefix: str = ""):
+        """Фільтр для querysets Equipment (prefix "equipment__" — для Testing)."""
+        if self.unrestricted:
+            return qs
+        qs = qs.filter(**{f"{prefix}brigade_id__in": self.brigade_ids})
+        if self.by_detachment:
+            qs = qs.filter(**{f"{prefix}detachment_id__in": self.detachment_ids})
+        return qs
+
+    @property
+    def cache_tag(self) -> str:
+        """Частина ключа кешу відповідей: у межах бригади відповіді різняться лише з фільтром загонів."""
+        return "d" + ",".join(map(str, sorted(self.detachment_ids))) if self.by_detachment else ""
+
+
+def _scope(user, detachment_ids) -> Scope:
+    if user.is_superuser or user.mode == user.MODE_GOD:
+        return Scope(unrestricted=True, detachment_ids=detachment_ids)
+    return Scope(brigade_ids=frozenset([user.brigade_id] if user.brigade_id else []), detachment_ids=detachment_ids)
+
+
+def resolve_scope(user) -> Scope:
+    scope = user.scope = _scope(user, frozenset(user.detachments.values_list("id", flat=True)))
+    return scope
+
+
+async def aresolve_scope(user) -> Scope:
+    ids = frozenset([i async for i in user.detachments.values_list("id", flat=True)])
+    scope = user.scope = _scope(user, ids)
+    return scope
+
+
+def get_scope(user) -> Scope:
+    """Область з кешу сесії; для користувачів, автентифікованих інакше, — визначається тут."""
+    scope = getattr(user, "scope", None)
+    return scope if scope is not None else resolve_scope(user)
+
+
+def check_brigade(user, brigade_id):
+    if not get_scope(user).allows_brigade(brigade_id):
+        raise PermissionDenied("brigade is outside of user scope")
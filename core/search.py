@@ -0,0 +1,139 @@
+"""
+Пошук по спорядженню та номенклатурі.
+
+Для кожного Equipment зберігається нормалізований документ
+(інв. номер, назва, опис, назва та категорія номенклатури) в
+EquipmentSearchDocument:
+  * MySQL — FULLTEXT (ngram parser), запит MATCH ... AGAINST у BOOLEAN MODE
+    з префіксами `слово*`;
+  * інші БД (SQLite у тестах/локально) — таблиця триграм SearchTrigram,
+    ранжування за часткою збігів триграм запиту.
+Індекс оновлюється сигналами Equipment / Nomenclature і командою
+`rebuild_search_index`.
+"""
+import math
+import re
+
+from django.db import connection
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+
+from .models import Equipment, EquipmentSearchDocument, SearchTrigram
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# мінімальна частка триграм запиту, що мусять збігтися (fallback)
+TRIGRAM_THRESHOLD = 0.6
+INDEX_BATCH = 1000
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD_RE.findall((text or "").casefold()))
+
+
+def trigrams(text: str) -> set:
+    # пробіл на початку слова — щоб префікс слова мав власну триграму
+    grams = set()
+    for word in normalize(text).split():
+        padded = f" {word}"
+        if len(padded) <= 3:
+            grams.add(padded)
+            continue
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def use_fulltext() -> bool:
+    return connection.vendor == "mysql"
+
+
+# ===================== indexing =====================
+
+def _documents(equipment_ids):
+    rows = (
+        Equipment.objects.filter(id__in=equipment_ids)
+        .values_list("id", "brigade_id", "inventory_number", "name", "description", "type",
+                     "nomenclature__name", "nomenclature__category")
+    )
+    for eq_id, brigade_id, *parts in rows:
+        yield EquipmentSearchDocument(equipment_id=eq_id, brigade_id=brigade_id, document=normalize(" ".join(p for p in parts if p)))
+
+
+def index_equipment(equipment_ids) -> int:
+    ids = list({i for i in equipment_ids if i})
+    total = 0
+    for start in range(0, len(ids), INDEX_BATCH):
+        chunk = ids[start:start + INDEX_BATCH]
+        docs = list(_documents(chunk))
+        EquipmentSearchDocument.objects.filter(equipment_id__in=chunk).delete()  # каскадом і триграми
+        EquipmentSearchDocument.objects.bulk_create(docs, batch_size=INDEX_BATCH)
+        if not use_fulltext():
+            SearchTrigram.objects.bulk_create(
+                [SearchTrigram(document_id=d.equipment_id, gram=g) for d in docs for g in trigrams(d.document)],
+                batch_size=INDEX_BATCH * 10,
+            )
+        total += len(docs)
+    return total
+
+
+def index_brigade(brigade_id: int) -> int:
+    return index_equipment(Equipment.objects.filter(brigade_id=brigade_id).values_list("id", flat=True))
+
+
+# ===================== querying =====================
+
+def _fulltext_query(q: str) -> str:
+    return " ".join(f"+{w}*" for w in normalize(q).split())
+
+
+def search(q: str, brigade_id=None, limit: int = DEFAULT_LIMIT, scope=None) -> list:
+    """
+    [{equipment поля..., "score": float}] — найрелевантніші спершу.
+    `scope` (core.scoping) відсікає чуже спорядження ще до ранжування, щоб limit не з'їдали приховані рядки.
+    """
+    q = normalize(q)
+    if not q:
+        return []
+    docs = EquipmentSearchDocument.objects.all()
+    equipment = Equipment.objects.all()
+    if brigade_id:
+        docs = docs.filter(brigade_id=brigade_id)
+    if scope is not None:
+        docs = scope.equipment(docs, "equipment__")
+        equipment = scope.equipment(equipment)
+
+    if use_fulltext():
+        ranked = (
+            docs.annotate(score=RawSQL("MATCH(document) AGAINST (%s IN BOOLEAN MODE)", [_fulltext_query(q)]))
+            .filter(score__gt=0).order_by("-score").values_list("equipment_id", "score")[:limit]
+        )
+        scores = dict(ranked)
+    else:
+        grams = trigrams(q)
+        need = max(1, math.ceil(len(grams) * TRIGRAM_THRESHOLD))
+        ranked = (
+            SearchTrigram.objects.filter(gram__in=grams, document__in=docs)
+            .values("document_id").annotate(hits=Count("id")).filter(hits__gte=need)
+            .order_by("-hits", "document_id").values_list("document_id", "hits")[:limit]
+        )
+        scores = {doc_id: hits / len(grams) for doc_id, hits in ranked}
+
+    items = list(
+        equipment.filter(id__in=scores)
+        .values("id", "inventory_number", "name", "description", "type", "brigade_id",
+                "nomenclature_id", "category_ref__name")
+    )
+    for it in items:
+        score = float(scores[it["id"]])
+        inv = it["inventory_number"].casefold()
+        # точний / префіксний збіг інвентарного номера — вгору
+        if inv == q:
+            score += 10
+        elif inv.startswith(q):
+            score += 5
+        it["score"] = round(score, 4)
+        it["category"] = it.pop("category_ref__name") or ""
+    items.sort(key=lambda it: (-it["score"], it["inventory_number"]))
+    return items
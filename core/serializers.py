@@ -2,9 +2,12 @@ from rest_framework import serializers
 from django.utils import timezone
 from django.utils.text import slugify
 
+from .epoch import date_to_ms, ms_to_date
+from .file_serving import act_url_builder
 from .models import (
     Brigade, Detachment, User, UserSession, Nomenclature, Equipment, Testing
 )
+from .uploads import max_upload_size
 
 # ===================== helpers =====================
 
@@ -31,6 +34,42 @@ def _unique_slug(base: str) -> str:
     return slug
 
 
+def _unique_slugs(names) -> dict:
+    """
+    Пакетний варіант _unique_slug: {name: slug}.
+    Один запит на базові slug-и; лише для конфліктних — ще один на базу.
+    """
+    bases = {n: slugify(n or "item", allow_unicode=True) or "item" for n in names}
+    taken = set(Nomenclature.objects.filter(slug__in=set(bases.values())).values_list("slug", flat=True))
+    checked = set()
+    out = {}
+    for name, base in bases.items():
+        slug = base
+        if slug in taken:
+            if base not in checked:
+                taken |= set(Nomenclature.objects.filter(slug__startswith=f"{base}-").values_list("slug", flat=True))
+                checked.add(base)
+            i = 2
+            while slug in taken:
+                slug = f"{base}-{i}"
+                i += 1
+        taken.add(slug)
+        out[name] = slug
+    return out
+
+
+def java_testing_out(t, inventory_number: str) -> dict:
+    """Testing → dict у форматі Java-клієнта (дати в epoch ms)."""
+    return {
+        "testingId": t.id,
+        "deviceInventoryNumber": inventory_number,
+        "testingDate": date_to_ms(t.date),
+        "testingResult": t.result,
+        "nextTestingDate": date_to_ms(t.next_date),
+        "url": t.external_url or "",
+    }
+
+
 # ===================== Auth =====================
 
 class LoginSerializer(serializers.Serializer):
@@ -123,13 +162,15 @@ class EquipmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Equipment
-        fields = ("id","inventory_number","name","type","brigade","nomenclatureId","description","detachment")
+        fields = ("id","inventory_number","name","type","brigade","nomenclatureId","description","detachment",
+                  "last_test_date","last_test_result","next_test_date")
+        read_only_fields = ("last_test_date","last_test_result","next_test_date")
 
 
-class BrigadeEquipmentCreateSerializer(serializers.Serializer):
+class BrigadeEquipmentRowSerializer(serializers.Serializer):
     """
-    Приймає або `nomenclatureId`, або `nomenclatureName`.
-    Якщо передано name — знайдемо/створимо номенклатуру і підкладемо її в _nomenclature.
+    Один рядок спорядження бригади (без звернень до БД).
+    Використовується як є для масового імпорту (core.bulk).
     """
     nomenclatureId = serializers.IntegerField(required=False)
     nomenclatureName = serializers.CharField(required=False)
@@ -138,12 +179,22 @@ class BrigadeEquipmentCreateSerializer(serializers.Serializer):
     detachment = serializers.IntegerField(required=False, allow_null=True)
 
     def validate(self, attrs):
+        if not attrs.get("nomenclatureId") and not attrs.get("nomenclatureName"):
+            raise serializers.ValidationError({"nomenclatureId": "Передайте або nomenclatureId, або nomenclatureName"})
+        return attrs
+
+
+class BrigadeEquipmentCreateSerializer(BrigadeEquipmentRowSerializer):
+    """
+    Приймає або `nomenclatureId`, або `nomenclatureName`.
+    Якщо передано name — знайдемо/створимо номенклатуру і підкладемо її в _nomenclature.
+    """
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
         nom_id = attrs.get("nomenclatureId")
         nom_name = attrs.get("nomenclatureName")
 
-        if not nom_id and not nom_name:
-            raise serializers.ValidationError({"nomenclatureId": "Передайте або nomenclatureId, або nomenclatureName"})
-
         # знайти/створити номенклатуру
         if nom_id:
             try:
@@ -166,13 +217,43 @@ class BrigadeEquipmentCreateSerializer(serializers.Serializer):
 
 # ===================== Testing =====================
 
+class ActFileField(serializers.FileField):
+    """Вхід — завантаження акту; вихід — захищена адреса (TestingFileView), не /media/-URL."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return act_url_builder(self.context.get("request"))(value.instance.pk)
+
+
 class TestingSerializer(serializers.ModelSerializer):
     equipment = serializers.PrimaryKeyRelatedField(queryset=Equipment.objects.all())
+    file = ActFileField(max_length=100, required=False, allow_null=True)
 
     class Meta:
         model = Testing
         fields = ("id","equipment","date","result","next_date","external_url","file")
 
+    def validate_file(self, f):
+        if f and f.size > max_upload_size():
+            raise serializers.ValidationError("File too large")
+        return f
+
+
+class TestingTextOutSerializer(serializers.ModelSerializer):
+    """Рядок вкладки /testing/<тип>/ (дати дд.мм.рррр)."""
+    inventory_number = serializers.CharField(source="equipment.inventory_number")
+    date = serializers.DateField(format="%d.%m.%Y")
+    next_date = serializers.DateField(format="%d.%m.%Y", allow_null=True)
+    external_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Testing
+        fields = ("inventory_number","date","result","next_date","external_url","id")
+
+    def get_external_url(self, obj):
+        return obj.external_url or ""
+
 
 # Java style payload
 class JavaTestingInSerializer(serializers.Serializer):
@@ -184,14 +265,16 @@ class JavaTestingInSerializer(serializers.Serializer):
 
     def to_internal_value(self, data):
         obj = super().to_internal_value(data)
-        # convert ms to date
-        from datetime import datetime
-        obj["date"] = datetime.utcfromtimestamp(obj.pop("testingDate")/1000.0).date()
-        nd = obj.pop("nextTestingDate", None)
-        if nd:
-            obj["next_date"] = datetime.utcfromtimestamp(nd/1000.0).date()
-        else:
-            obj["next_date"] = None
+        # epoch ms → дата в TIME_ZONE (core.epoch); 0 у nextTestingDate, як і раніше, — «без дати»
+        values = {"testingDate": obj.pop("testingDate"), "nextTestingDate": obj.pop("nextTestingDate", None) or None}
+        errors = {}
+        for src, dst in (("testingDate", "date"), ("nextTestingDate", "next_date")):
+            try:
+                obj[dst] = ms_to_date(values[src])
+            except ValueError as e:
+                errors[src] = [str(e)]
+        if errors:
+            raise serializers.ValidationError(errors)
         obj["result"] = obj.pop("testingResult")
         obj["external_url"] = obj.pop("url", None)
         return obj
@@ -0,0 +1,321 @@
+"""
+Кеш сесій для SessionIDAuthentication.
+
+Два рівні:
+  * in-process LRU з TTL (завжди увімкнений);
+  * Django cache (AUTH_SESSION_CACHE_ALIAS), спільний між воркерами —
+    redis / memcached; LocMem відхиляє system check (core.checks).
+    None (за замовчуванням) — лише in-process.
+
+Зі спільним кешем відкликання (logout, видалення сесії, зміна області
+доступу) діє в усіх воркерах одразу: invalidate() пише нову версію сесії в
+спільний кеш, а кожне влучання (і локальне, і спільне) звіряє версію запису
+з поточною — один cache get на запит, БД не чіпаємо. Без нього інші воркери
+бачать відкликану сесію ще до AUTH_SESSION_CACHE_TTL секунд.
+
+Ковзне продовження `expires_at` (AUTH_SESSION_EXP_MIN) не пишеться в БД на
+кожен запит: нові значення накопичуються і скидаються пачкою (write-behind)
+не частіше ніж раз на AUTH_SESSION_FLUSH_SEC або при накопиченні
+AUTH_SESSION_FLUSH_BATCH записів.
+
+Разом із користувачем кешується його область доступу (core.scoping) —
+визначається при завантаженні сесії, а не на кожен запит.
+
+Для async-view (ASGI) є a*-варіанти: in-process рівень не блокує, БД і
+спільний кеш — через async ORM / async API кешу.
+"""
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import UserSession
+from .scoping import aresolve_scope, get_scope
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+@dataclass
+class CachedSession:
+    pk: int
+    user: object
+    expires_at: datetime
+    cached_at: float  # time.monotonic()
+    version: object = None  # версія сесії в спільному кеші на момент читання з БД
+
+
+class SessionCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+        self._pending: dict[int, datetime] = {}
+        self._last_flush = time.monotonic()
+
+    # --- settings ---
+
+    @property
+    def ttl(self) -> float:
+        return float(_setting("AUTH_SESSION_CACHE_TTL", 60))
+
+    @property
+    def max_size(self) -> int:
+        return int(_setting("AUTH_SESSION_CACHE_SIZE", 10000))
+
+    @property
+    def sliding(self) -> timedelta:
+        return timedelta(minutes=_setting("AUTH_SESSION_EXP_MIN", 10))
+
+    def _shared(self):
+        alias = _setting("AUTH_SESSION_CACHE_ALIAS", None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _shared_key(sid: str) -> str:
+        return f"auth:sid:{sid}"
+
+    @staticmethod
+    def _version_key(sid: str) -> str:
+        return f"auth:sidv:{sid}"
+
+    def _version(self, sid: str):
+        shared = self._shared()
+        return shared.get(self._version_key(sid)) if shared is not None else None
+
+    async def _aversion(self, sid: str):
+        shared = self._shared()
+        return await shared.aget(self._version_key(sid)) if shared is not None else None
+
+    # --- lookup ---
+
+    def _get_local(self, sid: str, now: float):
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is not None:
+                if now - entry.cached_at < self.ttl:
+                    self._entries.move_to_end(sid)
+                    return entry
+                del self._entries[sid]
+        return None
+
+    def _from_shared(self, sid: str, found: dict, now: float):
+        entry = found.get(self._shared_key(sid))
+        if entry is None or entry.version != found.get(self._version_key(sid)):
+            return None
+        entry.cached_at = now
+        self._put_local(sid, entry)
+        return entry
+
+    def get(self, sid: str):
+        """Повертає CachedSession або None (промах чи відкликана версія)."""
+        now = time.monotonic()
+        entry = self._get_local(sid, now)
+        shared = self._shared()
+        if shared is None:
+            return entry
+        if entry is not None:
+            if shared.get(self._version_key(sid)) == entry.version:
+                return entry
+            self._drop_local(sid)
+        return self._from_shared(sid, shared.get_many([self._shared_key(sid), self._version_key(sid)]), now)
+
+    async def aget(self, sid: str):
+        now = time.monotonic()
+        entry = self._get_local(sid, now)
+        shared = self._shared()
+        if shared is None:
+            return entry
+        if entry is not None:
+            if await shared.aget(self._version_key(sid)) == entry.version:
+                return entry
+            self._drop_local(sid)
+        return self._from_shared(sid, await shared.aget_many([self._shared_key(sid), self._version_key(sid)]), now)
+
+    @staticmethod
+    def _entry(s: UserSession, version) -> CachedSession:
+        get_scope(s.user)  # область доступу їде в кеш разом із користувачем
+        return CachedSession(pk=s.pk, user=s.user, expires_at=s.expires_at, cached_at=time.monotonic(), version=version)
+
+    def add(self, s: UserSession):
+        """Щойно створена сесія (логін): одразу в кеш, перший запит не йде в БД."""
+        self.put(s.session_id, self._entry(s, self._version(s.session_id)))
+
+    def load(self, sid: str):
+        """Промах кешу: читаємо з БД і кладемо в кеш. Кидає UserSession.DoesNotExist."""
+        version = self._version(sid)  # до читання БД: відкликання посеред load лишить запис застарілим
+        entry = self._entry(UserSession.objects.select_related("user").get(session_id=sid), version)
+        self.put(sid, entry)
+        return entry
+
+    async def aload(self, sid: str):
+        version = await self._aversion(sid)
+        s = await UserSession.objects.select_related("user").aget(session_id=sid)
+        await aresolve_scope(s.user)
+        entry = self._entry(s, version)
+        self._put_local(sid, entry)
+        shared = self._shared()
+        if shared is not None:
+            await shared.aset(self._shared_key(sid), entry, timeout=self.ttl)
+        return entry
+
+    def put(self, sid: str, entry: CachedSession):
+        self._put_local(sid, entry)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._shared_key(sid), entry, timeout=self.ttl)
+
+    def _put_local(self, sid: str, entry: CachedSession):
+        with self._lock:
+            self._entries[sid] = entry
+            self._entries.move_to_end(sid)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _drop_local(self, sid: str):
+        with self._lock:
+            entry = self._entries.pop(sid, None)
+            if entry is not None:
+                self._pending.pop(entry.pk, None)
+
+    def _revoke_timeout(self) -> float:
+        # локальний запис живе не довше TTL, тож версія має пережити його із запасом
+        return self.ttl * 2
+
+    def invalidate(self, sid: str):
+        """Скидає сесію в усіх воркерах: нова версія робить застарілими їхні локальні записи."""
+        self._drop_local(sid)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._version_key(sid), time.time_ns(), timeout=self._revoke_timeout())
+            shared.delete(self._shared_key(sid))
+
+    async def ainvalidate(self, sid: str):
+        self._drop_local(sid)
+        shared = self._shared()
+        if shared is not None:
+            await shared.aset(self._version_key(sid), time.time_ns(), timeout=self._revoke_timeout())
+            await shared.adelete(self._shared_key(sid))
+
+    # --- expiry ---
+
+    def _newest(self, entry: CachedSession, found, db_exp) -> bool:
+        # інший воркер міг продовжити сесію: його запис у спільному кеші або вже скинутий expires_at
+        latest = max([e for e in (getattr(found, "expires_at", None), db_exp) if e is not None], default=None)
+        if latest is None or latest <= entry.expires_at:
+            return False
+        entry.expires_at = latest
+        return True
+
+    def expired(self, sid: str, entry: CachedSession) -> bool:
+        """
+        Чи сесія протермінована. Локальний `expires_at` може відставати від
+        продовження в іншому воркері, тож перед видаленням перечитуємо спільний
+        кеш і БД; видаляємо лише рядок, протермінований і в БД.
+        """
+        now = timezone.now()
+        if now < entry.expires_at:
+            return False
+        shared = self._shared()
+        found = shared.get(self._shared_key(sid)) if shared is not None else None
+        db_exp = UserSession.objects.filter(pk=entry.pk).values_list("expires_at", flat=True).first()
+        if self._newest(entry, found, db_exp) and now < entry.expires_at:
+            self.put(sid, entry)
+            return False
+        self.invalidate(sid)
+        UserSession.objects.filter(pk=entry.pk, expires_at__lte=now).delete()
+        return True
+
+    async def aexpired(self, sid: str, entry: CachedSession) -> bool:
+        now = timezone.now()
+        if now < entry.expires_at:
+            return False
+        shared = self._shared()
+        found = await shared.aget(self._shared_key(sid)) if shared is not None else None
+        db_exp = await UserSession.objects.filter(pk=entry.pk).values_list("expires_at", flat=True).afirst()
+        if self._newest(entry, found, db_exp) and now < entry.expires_at:
+            self._put_local(sid, entry)
+            if shared is not None:
+                await shared.aset(self._shared_key(sid), entry, timeout=self.ttl)
+            return False
+        await self.ainvalidate(sid)
+        await UserSession.objects.filter(pk=entry.pk, expires_at__lte=now).adelete()
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    # --- sliding expiry (write-behind) ---
+
+    def _extend(self, entry: CachedSession) -> bool:
+        new_exp = timezone.now() + self.sliding
+        if new_exp <= entry.expires_at:
+            return False
+        entry.expires_at = new_exp
+        with self._lock:
+            self._pending[entry.pk] = new_exp
+        return True
+
+    def touch(self, sid: str, entry: CachedSession):
+        """Продовжує сесію на AUTH_SESSION_EXP_MIN (тільки вперед) і ставить запис у чергу."""
+        if not self._extend(entry):
+            return
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._shared_key(sid), entry, timeout=self.ttl)
+        self.maybe_flush()
+
+    async def atouch(self, sid: str, entry: CachedSession):
+        if not self._extend(entry):
+            return
+        shared = self._shared()
+        if shared is not None:
+            await shared.aset(self._shared_key(sid), entry, timeout=self.ttl)
+        if self._flush_due():
+            await sync_to_async(self.flush)()
+
+    def _flush_due(self) -> bool:
+        interval = float(_setting("AUTH_SESSION_FLUSH_SEC", 30))
+        batch = int(_setting("AUTH_SESSION_FLUSH_BATCH", 500))
+        with self._lock:
+            return bool(
+                len(self._pending) >= batch or
+                (self._pending and time.monotonic() - self._last_flush >= interval)
+            )
+
+    def maybe_flush(self):
+        if self._flush_due():
+            self.flush()
+
+    def flush(self) -> int:
+        """Скидає накопичені `expires_at` одним bulk_update. Повертає кількість рядків."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        rows = [UserSession(pk=pk, expires_at=exp) for pk, exp in pending.items()]
+        UserSession.objects.bulk_update(rows, ["expires_at"], batch_size=500)
+        return len(rows)
+
+
+session_cache = SessionCache()
+
+
+def _flush_on_exit():
+    try:
+        session_cache.flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_on_exit)
@@ -0,0 +1,115 @@
+"""
+Прибирання таблиці core_user_session.
+
+Кожен логін додає рядок, а протерміновані сесії раніше видалялись лише
+тоді, коли хтось пред'являв їхній id. Тут:
+
+  * reap_expired() — видаляє протерміновані сесії пачками (короткі
+    транзакції, без довгих блокувань таблиці);
+  * enforce_session_cap() — при логіні лишає користувачу не більше
+    AUTH_MAX_SESSIONS_PER_USER найновіших сесій;
+  * start_scheduler() — опційний фоновий потік у процесі сервера
+    (AUTH_SESSION_REAP_INTERVAL); те саме робить команда reap_sessions.
+
+Продовження expires_at пишеться в БД із запізненням (write-behind у
+core.session_cache, до того ж в інших воркерах), тож в БД значення може
+відставати не більше ніж на AUTH_SESSION_EXP_MIN — на стільки й відступаємо.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import UserSession
+from .session_cache import session_cache
+
+logger = logging.getLogger(__name__)
+
+REAP_BATCH_SIZE = 1000
+
+
+def expired_cutoff():
+    return timezone.now() - timedelta(minutes=getattr(settings, "AUTH_SESSION_EXP_MIN", 10))
+
+
+def _delete(pks) -> int:
+    # через ORM, а не сирий DELETE: post_delete скидає сесію з кешу (core.signals)
+    with transaction.atomic():
+        return UserSession.objects.filter(pk__in=pks).delete()[0]
+
+
+def reap_expired(batch_size: int = REAP_BATCH_SIZE, max_batches: int | None = None) -> int:
+    """Видаляє сесії, протерміновані до expired_cutoff(). Повертає кількість рядків."""
+    session_cache.flush()  # свої відкладені продовження — в БД до вибірки
+    cutoff = expired_cutoff()
+    removed = batches = 0
+    while max_batches is None or batches < max_batches:
+        pks = list(
+            UserSession.objects.filter(expires_at__lt=cutoff)
+            .order_by("expires_at").values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+        removed += _delete(pks)
+        batches += 1
+    return removed
+
+
+def enforce_session_cap(user) -> int:
+    """Лишає користувачу AUTH_MAX_SESSIONS_PER_USER найновіших сесій (None — без ліміту)."""
+    cap = getattr(settings, "AUTH_MAX_SESSIONS_PER_USER", None)
+    if not cap:
+        return 0
+    stale = list(
+        UserSession.objects.filter(user=user)
+        .order_by("-created_at", "-id").values_list("pk", flat=True)[cap:]
+    )
+    return _delete(stale) if stale else 0
+
+
+# --- фоновий планувальник ---
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class _Reaper(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="session-reaper", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                removed = reap_expired()
+                if removed:
+                    logger.info("session reaper: removed %d expired sessions", removed)
+            except Exception:
+                logger.exception("session reaper failed")
+            finally:
+                close_old_connections()
+
+
+def start_scheduler():
+    """Запускає фоновий потік, якщо задано AUTH_SESSION_REAP_INTERVAL (секунд); ідемпотентно."""
+    global _scheduler
+    interval = getattr(settings, "AUTH_SESSION_REAP_INTERVAL", None)
+    if not interval:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = _Reaper(float(interval))
+            _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.stopped.set()
+            _scheduler = None
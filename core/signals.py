@@ -0,0 +1,280 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import categories, changelog, search, stats, type_registry
+from .admin_tree import invalidate_admin_tree
+from .latest_testing import refresh_latest_testing
+from .models import Brigade, Category, Detachment, Equipment, Nomenclature, Testing, User, UserSession
+from .response_cache import bump_brigade, bump_equipment_brigades
+from .session_cache import session_cache
+
+
+@receiver(post_delete, sender=UserSession)
+def _session_deleted(sender, instance, **kwargs):
+    session_cache.invalidate(instance.session_id)
+
+
+# у кеші сесій лежить область доступу (core.scoping): бригада / режим / загони змінились — скидаємо
+
+def _invalidate_user_sessions(user_ids):
+    for sid in UserSession.objects.filter(user_id__in=user_ids).values_list("session_id", flat=True):
+        session_cache.invalidate(sid)
+
+
+@receiver(post_save, sender=User)
+def _user_scope_changed(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate_user_sessions([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.detachments.through)
+def _user_detachments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _invalidate_user_sessions([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        _invalidate_user_sessions(pk_set)
+    elif action == "pre_clear":
+        _invalidate_user_sessions(list(instance.users.values_list("id", flat=True)))
+
+
+@receiver([post_save, post_delete], sender=Brigade)
+@receiver([post_save, post_delete], sender=Detachment)
+@receiver([post_save, post_delete], sender=Equipment)
+def _admin_tree_changed(sender, **kwargs):
+    invalidate_admin_tree()
+
+
+# --- нормалізовані категорії (core.categories) ---
+
+@receiver(pre_save, sender=Nomenclature)
+def _nomenclature_category(sender, instance, **kwargs):
+    instance.category_ref_id = categories.category_id(categories.category_name(instance.category, instance.name))
+
+
+@receiver(pre_save, sender=Equipment)
+def _equipment_category(sender, instance, **kwargs):
+    instance.category_ref_id, instance._category_name = categories.equipment_category(instance)
+
+
+@receiver(post_save, sender=Nomenclature)
+def _nomenclature_category_changed(sender, instance, created, **kwargs):
+    if not created:
+        Equipment.objects.filter(nomenclature=instance).exclude(
+            category_ref_id=instance.category_ref_id
+        ).update(category_ref_id=instance.category_ref_id)
+
+
+@receiver(pre_delete, sender=Nomenclature)
+def _nomenclature_category_unlinked(sender, instance, **kwargs):
+    # після SET_NULL ефективна категорія — з type
+    rows = list(Equipment.objects.filter(nomenclature=instance).values_list("id", "type", "name"))
+    names = {pk: categories.category_name(type_name, name) for pk, type_name, name in rows}
+    ids = categories.category_ids(names.values())
+    by_category = defaultdict(list)
+    for pk, name in names.items():
+        by_category[ids[name]].append(pk)
+    for category_id, pks in by_category.items():
+        Equipment.objects.filter(pk__in=pks).update(category_ref_id=category_id)
+
+
+# --- реєстр типів спорядження ---
+
+@receiver(post_save, sender=Equipment)
+def _equipment_saved(sender, instance, created, **kwargs):
+    if created:
+        type_registry.register_names(instance.brigade_id, [instance._category_name])
+    else:
+        brigade_id = instance.brigade_id
+        transaction.on_commit(lambda: type_registry.refresh_brigade(brigade_id))
+
+
+@receiver(post_delete, sender=Equipment)
+def _equipment_deleted(sender, instance, **kwargs):
+    brigade_id = instance.brigade_id
+    transaction.on_commit(lambda: type_registry.refresh_brigade(brigade_id))
+
+
+def _refresh_nomenclature_brigades(nomenclature, reindex: bool = False):
+    rows = list(Equipment.objects.filter(nomenclature=nomenclature).values_list("id", "brigade_id"))
+    brigade_ids = {b for _, b in rows}
+    def refresh():
+        for brigade_id in brigade_ids:
+            type_registry.refresh_brigade(brigade_id)
+        # категорія номенклатури змінилась / SET_NULL — комірки зведення зсуваються без сигналів
+        stats.rebuild(brigade_ids)
+        if reindex:
+            search.index_equipment([i for i, _ in rows])
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Nomenclature)
+def _nomenclature_saved(sender, instance, created, **kwargs):
+    if not created:
+        _refresh_nomenclature_brigades(instance, reindex=True)
+
+
+@receiver(pre_delete, sender=Nomenclature)
+def _nomenclature_deleted(sender, instance, **kwargs):
+    # бригади треба зібрати до SET_NULL на Equipment
+    _refresh_nomenclature_brigades(instance)
+
+
+# --- версії бригад (кеш відповідей) ---
+
+@receiver(pre_save, sender=Equipment)
+def _equipment_remember_brigade(sender, instance, **kwargs):
+    # при перенесенні в іншу бригаду треба скинути кеш обох; старий ключ — для зведення (core.stats)
+    if instance.pk:
+        instance._old_stat_key = stats.equipment_key(instance.pk)
+        instance._old_brigade_id = instance._old_stat_key[0] if instance._old_stat_key else None
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+def _equipment_brigade_changed(sender, instance, **kwargs):
+    bump_brigade(instance.brigade_id, getattr(instance, "_old_brigade_id", None))
+
+
+@receiver([post_save, post_delete], sender=Testing)
+def _testing_brigade_changed(sender, instance, **kwargs):
+    bump_equipment_brigades([instance.equipment_id])
+
+
+@receiver(post_save, sender=Nomenclature)
+@receiver(pre_delete, sender=Nomenclature)
+def _nomenclature_brigades_changed(sender, instance, **kwargs):
+    if instance.pk:
+        bump_brigade(*Equipment.objects.filter(nomenclature=instance).values_list("brigade_id", flat=True).distinct())
+
+
+@receiver(pre_delete, sender=Detachment)
+def _detachment_brigades_changed(sender, instance, **kwargs):
+    # SET_NULL на Equipment іде UPDATE-ом без сигналів, а detachment є в закешованих списках
+    bump_brigade(*Equipment.objects.filter(detachment=instance).values_list("brigade_id", flat=True).distinct())
+
+
+# --- пошуковий індекс ---
+
+@receiver(post_save, sender=Equipment)
+def _equipment_reindex(sender, instance, **kwargs):
+    equipment_id = instance.pk
+    transaction.on_commit(lambda: search.index_equipment([equipment_id]))
+
+
+# --- знімок останнього випробування ---
+
+@receiver([post_save, post_delete], sender=Testing)
+def _testing_changed(sender, instance, **kwargs):
+    refresh_latest_testing([instance.equipment_id])
+
+
+# --- зведена статистика ---
+
+@receiver(post_save, sender=Equipment)
+def _equipment_stats(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, "_old_stat_key", None)
+    stats.apply(Counter([old] if old else []), stats.snapshot([instance.pk]))
+
+
+@receiver(post_delete, sender=Equipment)
+def _equipment_stats_deleted(sender, instance, **kwargs):
+    # каскад уже видалив випробування, тож знімок (а з ним і зведення) — «без результату»
+    category = Category.objects.filter(pk=instance.category_ref_id).values_list("name", flat=True).first() or ""
+    stats.apply(Counter([stats.stat_key(instance.brigade_id, instance.detachment_id, category, "")]), Counter())
+
+
+@receiver(pre_delete, sender=Detachment)
+def _detachment_stats(sender, instance, **kwargs):
+    # SET_NULL на Equipment іде UPDATE-ом без сигналів
+    brigade_ids = set(Equipment.objects.filter(detachment=instance).values_list("brigade_id", flat=True).distinct())
+    if brigade_ids:
+        transaction.on_commit(lambda: stats.rebuild(brigade_ids))
+
+
+# --- журнал змін (дельта-синхронізація) ---
+
+@receiver(post_save, sender=Equipment)
+def _equipment_logged(sender, instance, created, **kwargs):
+    changelog.record(instance.brigade_id, [(changelog.EQUIPMENT, instance.pk, False)], fresh=created)
+    old = getattr(instance, "_old_brigade_id", None)
+    old_key = getattr(instance, "_old_stat_key", None)
+    if old and old != instance.brigade_id:
+        # перенесення: у старій бригаді — надгробки, у новій — і його випробування
+        testing_ids = list(Testing.objects.filter(equipment_id=instance.pk).values_list("id", flat=True))
+        changelog.record(old, [(changelog.EQUIPMENT, instance.pk, True)] +
+                         [(changelog.TESTING, t, True) for t in testing_ids])
+        changelog.record_testings(instance.brigade_id, [(t, instance.pk) for t in testing_ids])
+    elif old_key and old_key[1] != (instance.detachment_id or 0):
+        # інший загін: клієнти з областю за загонами отримують випробування або їх видалення
+        testing_ids = Testing.objects.filter(equipment_id=instance.pk).values_list("id", flat=True)
+        changelog.record_testings(instance.brigade_id, [(t, instance.pk) for t in testing_ids])
+
+
+@receiver(post_delete, sender=Equipment)
+def _equipment_delete_logged(sender, instance, **kwargs):
+    changelog.record(instance.brigade_id, [(changelog.EQUIPMENT, instance.pk, True)])
+
+
+@receiver(post_save, sender=Testing)
+@receiver(post_delete, sender=Testing)
+def _testing_logged(sender, instance, **kwargs):
+    brigade_id = Equipment.objects.filter(pk=instance.equipment_id).values_list("brigade_id", flat=True).first()
+    changelog.record_testings(brigade_id, [(instance.pk, instance.equipment_id)], deleted=kwargs["signal"] is post_delete)
+
+
+@receiver(post_save, sender=Nomenclature)
+@receiver(post_delete, sender=Nomenclature)
+def _nomenclature_logged(sender, instance, **kwargs):
+    changelog.record(
+        changelog.CATALOG_STREAM, [(changelog.NOMENCLATURE, instance.pk, kwargs["signal"] is post_delete)],
+        fresh=kwargs.get("created", False),
+    )
+
+
+def _log_unlinked(equipment, with_testings: bool = False):
+    # SET_NULL на Equipment іде UPDATE-ом без сигналів — зміну пишемо за нього
+    by_brigade = defaultdict(list)
+    for equipment_id, brigade_id in equipment.values_list("id", "brigade_id"):
+        by_brigade[brigade_id].append((changelog.EQUIPMENT, equipment_id, False))
+    if with_testings:
+        rows = Testing.objects.filter(equipment__in=equipment).values_list("id", "equipment__brigade_id")
+        for testing_id, brigade_id in rows:
+            by_brigade[brigade_id].append((changelog.TESTING, testing_id, False))
+    for brigade_id, changes in by_brigade.items():
+        changelog.record(brigade_id, changes)
+
+
+@receiver(pre_delete, sender=Nomenclature)
+def _nomenclature_unlink_logged(sender, instance, **kwargs):
+    _log_unlinked(Equipment.objects.filter(nomenclature=instance))
+
+
+@receiver(pre_delete, sender=Detachment)
+def _detachment_unlink_logged(sender, instance, **kwargs):
+    # загін зникає з області доступу — випробування теж (див. _equipment_logged)
+    _log_unlinked(Equipment.objects.filter(detachment=instance), with_testings=True)
+
+
+@receiver(post_delete, sender=Brigade)
+def _brigade_stream_dropped(sender, instance, **kwargs):
+    changelog.drop_stream(instance.pk)
+
+
+def bulk_equipment_changed(brigade_id: int):
+    """
+    bulk_create/update не шлють сигналів — масові операції викликають це вручну,
+    щоб оновити все, що залежить від Equipment бригади.
+    """
+    invalidate_admin_tree()
+    bump_brigade(brigade_id)
+    type_registry.refresh_brigade(brigade_id)
+    search.index_brigade(brigade_id)
+
+
+def bulk_testing_changed(equipment_ids):
+    """Аналог bulk_equipment_changed для масових змін Testing (викликати в транзакції)."""
+    refresh_latest_testing(equipment_ids)
+    bump_equipment_brigades(equipment_ids)
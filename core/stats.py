@@ -0,0 +1,126 @@
+"""
+Зведена статистика спорядження (дашборд командира, /api/stats).
+
+Замість GROUP BY по core_equipment на кожен запит — таблиця EquipmentStat
+з лічильниками по комірках (бригада, загін, категорія, результат останнього
+випробування). Кожен запис Equipment / Testing зсуває лічильники: знімаємо
+ключі зачеплених рядків до і після зміни й застосовуємо різницю
+`UPDATE count = count + d`. Читання — лише рядки бригади в зведенні,
+їх кількість не залежить від розміру інвентарю.
+
+Зміни без сигналів (SET_NULL при видаленні номенклатури / загону, зміна
+категорії номенклатури) перераховують зачеплені бригади повністю; дрейф
+після ручних правок у БД лагодить команда rebuild_stats.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+
+from .models import Equipment, EquipmentStat
+
+# ефективна категорія (core.categories) — та сама, що у фільтрах, реєстрі типів та інспекціях
+CATEGORY = Coalesce("category_ref__name", Value(""))
+
+
+def _key_rows(qs):
+    return qs.annotate(stat_category=CATEGORY).values_list(
+        "brigade_id", "detachment_id", "stat_category", "last_test_result",
+    )
+
+
+def stat_key(brigade_id, detachment_id, category, result) -> tuple:
+    return (brigade_id, detachment_id or 0, category, result or "")
+
+
+def snapshot(equipment_ids) -> Counter:
+    """Ключі комірок для набору Equipment, як вони зараз у БД."""
+    ids = {i for i in equipment_ids if i}
+    if not ids:
+        return Counter()
+    return Counter(stat_key(*row) for row in _key_rows(Equipment.objects.filter(id__in=ids)))
+
+
+def equipment_key(equipment_id):
+    return next(iter(snapshot([equipment_id])), None)
+
+
+def apply(before: Counter, after: Counter):
+    """Зсуває лічильники на різницю `after - before` (викликати в транзакції зміни)."""
+    delta = Counter(after)
+    delta.subtract(before)
+    for (brigade_id, detachment, category, result), d in delta.items():
+        if not d:
+            continue
+        cell = EquipmentStat.objects.filter(brigade_id=brigade_id, detachment=detachment, category=category, result=result)
+        if cell.update(count=F("count") + d) or d < 0:
+            continue
+        try:
+            with transaction.atomic():
+                EquipmentStat.objects.create(
+                    brigade_id=brigade_id, detachment=detachment, category=category, result=result, count=d,
+                )
+        except IntegrityError:
+            # комірку паралельно створила інша транзакція
+            cell.update(count=F("count") + d)
+
+
+def rebuild(brigade_ids=None) -> int:
+    """Повний перерахунок зведення для бригад (None — для всіх). Повертає кількість комірок."""
+    qs = Equipment.objects.all()
+    cells = EquipmentStat.objects.all()
+    if brigade_ids is not None:
+        brigade_ids = {b for b in brigade_ids if b}
+        if not brigade_ids:
+            return 0
+        qs, cells = qs.filter(brigade_id__in=brigade_ids), cells.filter(brigade_id__in=brigade_ids)
+    rows = (
+        qs.annotate(stat_category=CATEGORY)
+        .values("brigade_id", "detachment_id", "stat_category", "last_test_result")
+        .annotate(n=Count("id")).order_by()
+    )
+    with transaction.atomic():
+        cells.delete()
+        objs = [
+            EquipmentStat(
+                brigade_id=r["brigade_id"], detachment=r["detachment_id"] or 0,
+                category=r["stat_category"], result=r["last_test_result"] or "", count=r["n"],
+            )
+            for r in rows
+        ]
+        EquipmentStat.objects.bulk_create(objs, batch_size=1000)
+    return len(objs)
+
+
+def brigade_stats(brigade_id: int, detachment_id=None, scope=None) -> dict:
+    """Дашборд бригади з комірок зведення: разом і по загонах, по категоріях і результатах."""
+    cells = EquipmentStat.objects.filter(brigade_id=brigade_id, count__gt=0)
+    if detachment_id is not None:
+        cells = cells.filter(detachment=detachment_id)
+    if scope is not None and scope.by_detachment:
+        cells = cells.filter(detachment__in=scope.detachment_ids)
+
+    def bucket():
+        return {"total": 0, "byCategory": Counter(), "byResult": Counter()}
+
+    total, detachments = bucket(), {}
+    for detachment, category, result, count in cells.values_list("detachment", "category", "result", "count"):
+        for b in (total, detachments.setdefault(detachment, bucket())):
+            b["total"] += count
+            b["byCategory"][category] += count
+            b["byResult"][result] += count
+
+    def out(b):
+        return {
+            "total": b["total"],
+            "byCategory": [{"category": k, "count": v} for k, v in sorted(b["byCategory"].items())],
+            # "" — ще не випробовувалось
+            "byResult": [{"result": k or None, "count": v} for k, v in sorted(b["byResult"].items())],
+        }
+
+    return {
+        "brigade": brigade_id,
+        **out(total),
+        "detachments": [{"detachment": d or None, **out(b)} for d, b in sorted(detachments.items())],
+    }
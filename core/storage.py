@@ -0,0 +1,54 @@
+"""
+Контент-адресоване сховище файлів актів випробувань.
+
+Файл лежить як acts/sha256/<2 символи>/<sha256><.ext>: той самий скан,
+завантажений для десятків одиниць спорядження, зберігається один раз, а
+всі Testing.file посилаються на нього. Хеш рахується під час прийому запиту
+(core.uploads.HashingUploadHandler), для інших шляхів (адмінка тощо) — тут,
+по чанках. Осиротілі файли прибирає manage.py gc_act_files.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+CONTENT_PREFIX = "acts/sha256/"
+_EXT_RE = re.compile(r"^\.[a-z0-9]{1,8}$")
+
+
+def file_digest(f) -> str:
+    digest = getattr(f, "sha256", None)
+    if digest:
+        return digest
+    h = hashlib.sha256()
+    for chunk in f.chunks():
+        h.update(chunk)
+    f.seek(0)
+    return h.hexdigest()
+
+
+def content_name(digest: str, filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if not _EXT_RE.match(ext):
+        ext = ""
+    return f"{CONTENT_PREFIX}{digest[:2]}/{digest}{ext}"
+
+
+@deconstructible
+class ActStorage(FileSystemStorage):
+    """Однакове контент-адресоване ім'я = однаковий вміст, тож повторний save нічого не пише."""
+
+    def save(self, name, content, max_length=None):
+        if name and name.startswith(CONTENT_PREFIX) and self.exists(name):
+            # файл міг бути осиротілим: свіжий mtime тримає його в межах grace gc_act_files
+            try:
+                os.utime(self.path(name))
+            except OSError:
+                pass
+            return name
+        return super().save(name, content, max_length)
+
+
+act_storage = ActStorage()
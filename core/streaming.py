@@ -0,0 +1,92 @@
+"""
+Потокові (streaming) відповіді для великих вибірок.
+
+Рядки читаються keyset-пачками по ordering пагінатора (`WHERE ключ > останній
+LIMIT n`, як core.exports) і віддаються клієнту по одному. `.iterator()` тут
+не годиться: MySQL-драйвер буферизує весь результат на клієнті, тож пам'ять
+росла б з розміром вибірки; з пачками вона стала.
+
+Під ASGI Django не ітерує синхронне тіло StreamingHttpResponse / FileResponse
+поступово, а спершу збирає його цілим у список (`sync_to_async(list)`).
+asgi_streaming() для таких відповідей підміняє тіло async-ітератором, що
+тягне синхронне тіло пачками по ASYNC_PULL_SIZE елементів через sync_to_async.
+"""
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_QUERY_PARAM = "stream"
+STREAM_CHUNK_SIZE = 2000
+ASYNC_PULL_SIZE = 256  # елементів тіла (рядків / блоків файлу) за один перехід у потік
+
+
+def wants_ndjson(request) -> bool:
+    return request.query_params.get(STREAM_QUERY_PARAM) == "ndjson"
+
+
+def keyset_chunks(queryset, paginator, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Списки рядків у порядку paginator.ordering; рядки мають містити поля ключа (named / dict / модель)."""
+    base = queryset.order_by(*paginator.ordering)
+    qs = base
+    while True:
+        chunk = list(qs[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        qs = base.filter(paginator._after(paginator._key(chunk[-1])))
+
+
+def iter_rows(queryset, to_row, paginator, chunk_size: int = STREAM_CHUNK_SIZE):
+    for chunk in keyset_chunks(queryset, paginator, chunk_size):
+        for obj in chunk:
+            yield to_row(obj)
+
+
+async def aiter_rows(queryset, to_row, paginator, chunk_size: int = STREAM_CHUNK_SIZE):
+    # не QuerySet.aiterator(): для values_list він виконує SQL прямо в event loop
+    chunks = keyset_chunks(queryset, paginator, chunk_size)
+    next_chunk = sync_to_async(lambda: next(chunks, None))
+    while chunk := await next_chunk():
+        for obj in chunk:
+            yield to_row(obj)
+
+
+def is_asgi(request) -> bool:
+    return isinstance(getattr(request, "_request", request), ASGIRequest)  # DRF Request або HttpRequest
+
+
+async def _apull(iterator, size: int):
+    pull = sync_to_async(lambda: list(islice(iterator, size)))
+    while part := await pull():
+        for item in part:
+            yield item
+
+
+def asgi_streaming(request, response):
+    """Синхронне потокове тіло під ASGI → async-ітератор пачок; інші відповіді — без змін."""
+    if response.streaming and not response.is_async and is_asgi(request):
+        # FileResponse: заголовки вже виставлені, файл закриється через _resource_closers
+        response.streaming_content = _apull(response.streaming_content, ASYNC_PULL_SIZE)
+    return response
+
+
+def _line(row) -> str:
+    return json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+def ndjson_response(rows) -> StreamingHttpResponse:
+    """`rows` — ітератор (або async-ітератор під ASGI) dict; кожен рядок — окремий JSON + '\\n'."""
+    if hasattr(rows, "__aiter__"):
+        async def lines():
+            async for row in rows:
+                yield _line(row)
+    else:
+        def lines():
+            for row in rows:
+                yield _line(row)
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson; charset=utf-8")
@@ -1,3 +1,785 @@
-from django.test import TestCase
+import base64
+import importlib
+import importlib.util
+import io
+import json
+import shutil
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.checks import run_checks
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework.request import Request
+
+from . import bulk, categories, search, stats, type_registry
+from .authentication import SessionIDAuthentication, aauthenticate_session
+from .collation import fold
+from .epoch import date_to_ms
+from .fast_serializers import FastEquipmentSerializer, FastTestingSerializer
+from .instrumentation import QueryBudgetExceeded
+from .models import Brigade, Detachment, Equipment, EquipmentStat, Nomenclature, Testing, User, UserSession
+from .pagination import KeysetPagination, TestingPagination
+from .serializers import EquipmentSerializer, TestingSerializer
+from .session_cache import session_cache
+from .storage import CONTENT_PREFIX, act_storage
+from .streaming import iter_rows
+from .type_registry import stable_id
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class ApiTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        session_cache.clear()
+
+    def login(self, username, mode=User.MODE_RW, brigade=None, detachments=()):
+        user = User(username=username, mode=mode, brigade=brigade)
+        user.set_password("p")
+        user.save()
+        user.detachments.set(detachments)
+        r = self.client.post("/api/login", {"username": username, "password": "p"}, content_type="application/json")
+        self.assertEqual(r.status_code, 200)
+        return r.json()["sessionId"]
+
+    def get(self, sid, url, **params):
+        return self.client.get(url, params, HTTP_SESSION_ID=sid)
+
+
+class QueryBudgetTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sid = self.login("u")
+
+    def test_strict_in_tests(self):
+        with mock.patch("core.instrumentation._budget_for", return_value=0):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get(self.sid, "/api/nomenclature/categories")
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_warns_otherwise(self):
+        with mock.patch("core.instrumentation._budget_for", return_value=0):
+            with self.assertLogs("core.instrumentation", "WARNING"):
+                self.assertEqual(self.get(self.sid, "/api/nomenclature/categories").status_code, 200)
+
+
+class SessionCacheTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sid = self.login("u")
+        self.request = RequestFactory().get("/", HTTP_SESSION_ID=self.sid)
+
+    def auth(self):
+        return SessionIDAuthentication().authenticate(self.request)
+
+    def expire_locally(self):
+        session_cache.get(self.sid).expires_at = timezone.now() - timedelta(seconds=1)
+
+    def test_hit_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.auth()[0].username, "u")
+
+    def test_logout_revokes(self):
+        self.assertEqual(self.client.post("/api/logout", HTTP_SESSION_ID=self.sid).status_code, 200)
+        self.assertIsNone(session_cache.get(self.sid))
+        with self.assertRaises(AuthenticationFailed):
+            self.auth()
+
+    def test_expiry_extended_elsewhere(self):
+        # локальний запис застарів, а інший воркер уже скинув продовження в БД
+        self.expire_locally()
+        self.assertEqual(self.auth()[0].username, "u")
+        self.assertTrue(UserSession.objects.filter(session_id=self.sid).exists())
+        self.assertGreater(session_cache.get(self.sid).expires_at, timezone.now())
+
+    @override_settings(AUTH_SESSION_CACHE_ALIAS="default")
+    def test_expiry_extended_in_shared_cache(self):
+        # продовження ще не в БД, але вже в спільному кеші
+        session_cache.clear()
+        entry = session_cache.load(self.sid)
+        UserSession.objects.filter(session_id=self.sid).update(expires_at=timezone.now() - timedelta(seconds=1))
+        entry.expires_at = timezone.now() - timedelta(seconds=1)
+        stored = caches["default"].get(f"auth:sid:{self.sid}")
+        stored.expires_at = timezone.now() + timedelta(minutes=5)
+        caches["default"].set(f"auth:sid:{self.sid}", stored)
+        self.assertEqual(self.auth()[0].username, "u")
+        self.assertTrue(UserSession.objects.filter(session_id=self.sid).exists())
+
+    def test_expired_session_deleted(self):
+        UserSession.objects.filter(session_id=self.sid).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.expire_locally()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth()
+        self.assertFalse(UserSession.objects.filter(session_id=self.sid).exists())
+
+    async def test_async_expiry_extended_elsewhere(self):
+        self.expire_locally()
+        user = await aauthenticate_session(self.request)
+        self.assertEqual(user.username, "u")
+        self.assertTrue(await UserSession.objects.filter(session_id=self.sid).aexists())
+
+    def test_locmem_alias_rejected(self):
+        with override_settings(AUTH_SESSION_CACHE_ALIAS="default"):
+            self.assertIn("core.E001", [e.id for e in run_checks()])
+        self.assertNotIn("core.E001", [e.id for e in run_checks()])
+
+
+class CursorTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.brigade = Brigade.objects.create(name="Б1")
+        eq = Equipment.objects.create(brigade=self.brigade, inventory_number="1", name="мотузка", type="мотузки")
+        # однакові дати — курсор мусить розрізняти рядки за id
+        for day in (1, 1, 1, 2, 3):
+            Testing.objects.create(equipment=eq, date=date(2024, 1, day), result="ok")
+        self.sid = self.login("rw", brigade=self.brigade)
+
+    def test_encode_decode_round_trip(self):
+        p = TestingPagination()
+        values = p._typed(Testing, p.decode_cursor(p.encode_cursor([date(2024, 1, 2), 7])))
+        self.assertEqual(values, [date(2024, 1, 2), 7])
+
+    def test_pages_cover_list_once(self):
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = self.get(self.sid, "/api/testing/", **params).json()
+            ids += [row["id"] for row in body["results"]]
+            cursor = body["next"]
+            if cursor is None:
+                break
+        expected = list(Testing.objects.order_by("-date", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_malformed_cursor_is_not_found(self):
+        for cursor in (
+            "!!!",
+            _raw_cursor({"a": 1}),
+            _raw_cursor(["2024-01-01"]),
+            _raw_cursor(["2024-01-01", 1, 2]),
+            _raw_cursor(["not-a-date", 1]),
+            _raw_cursor(["2024-01-01", "x"]),
+            _raw_cursor([None, 1]),
+            _raw_cursor([{"a": 1}, 2]),
+        ):
+            with self.subTest(cursor=cursor):
+                r = self.get(self.sid, "/api/testing/", cursor=cursor)
+                self.assertEqual(r.status_code, 404)
+
+    def test_stream_chunks_cover_list_once(self):
+        ids = list(iter_rows(Testing.objects.all(), lambda t: t.id, TestingPagination(), chunk_size=2))
+        self.assertEqual(ids, list(Testing.objects.order_by("-date", "-id").values_list("id", flat=True)))
+
+    def ndjson(self, body: bytes):
+        return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+    def test_ndjson_matches_list(self):
+        r = self.get(self.sid, "/api/testing/", stream="ndjson")
+        self.assertEqual(r["Content-Type"], "application/x-ndjson; charset=utf-8")
+        self.assertEqual(self.ndjson(b"".join(r.streaming_content)), self.get(self.sid, "/api/testing/").json())
+
+    async def test_ndjson_asgi_body_is_async(self):
+        r = await AsyncClient().get("/api/testing/", {"stream": "ndjson"}, headers={"session-id": self.sid})
+        self.assertTrue(r.is_async)
+        rows = self.ndjson(b"".join([part async for part in r.streaming_content]))
+        self.assertEqual([row["id"] for row in rows], [i async for i in Testing.objects.values_list("id", flat=True)])
+
+    def test_ordering_length_checked(self):
+        with self.assertRaises(NotFound):
+            KeysetPagination()._after([1, 2])
+
+
+class BulkTestingTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.b1, self.b2 = Brigade.objects.create(name="Б1"), Brigade.objects.create(name="Б2")
+        self.eq = Equipment.objects.create(brigade=self.b1, inventory_number="1", name="мотузка", type="мотузки")
+        other = Equipment.objects.create(brigade=self.b2, inventory_number="1", name="мотузка", type="мотузки")
+        self.t = Testing.objects.create(equipment=self.eq, date=date(2024, 1, 1), result="ok")
+        self.foreign = Testing.objects.create(equipment=other, date=date(2024, 1, 1), result="ok")
+
+    def item(self, **extra):
+        return {"deviceInventoryNumber": "1", "testingDate": date_to_ms(date(2024, 2, 1)), "testingResult": "bad", **extra}
+
+    def test_update_reports_each_item(self):
+        out = bulk.update_testings(self.b1.id, [
+            self.item(testingId=self.t.id),
+            self.item(),
+            self.item(testingId="abc"),
+            self.item(testingId=True),
+            self.item(testingId=10 ** 9),
+            self.item(testingId=self.foreign.id),
+            self.item(testingId=str(self.t.id), testingDate=10 ** 20),
+        ])
+        self.assertEqual([o["status"] for o in out], ["updated"] + ["error"] * 6)
+        self.assertEqual(out[1]["message"], "testingId required")
+        self.assertEqual(out[2]["message"], "testingId must be an integer")
+        self.assertEqual(out[3]["message"], "testingId must be an integer")
+        self.assertEqual(out[4]["message"], "testing not found")
+        self.assertEqual(out[5]["message"], "testing belongs to another equipment/brigade")
+        self.assertIn("testingDate", out[6]["errors"])
+        self.t.refresh_from_db()
+        self.assertEqual((self.t.date, self.t.result), (date(2024, 2, 1), "bad"))
+
+    def test_ingest_reports_each_item(self):
+        out = bulk.ingest_testings(self.b1.id, "мотузки", [
+            self.item(),
+            self.item(deviceInventoryNumber="404"),
+            self.item(testingDate=-10 ** 20),
+            {"deviceInventoryNumber": "1"},
+        ])
+        self.assertEqual([o["status"] for o in out], ["created", "error", "error", "error"])
+        self.assertEqual(out[0]["testingId"], Testing.objects.latest("id").id)
+        self.assertEqual(out[1]["message"], "equipment not found for brigade/type/inventory")
+        self.assertEqual(Testing.objects.filter(equipment=self.eq).count(), 2)
+
+    def test_bulk_endpoint_non_numeric_id(self):
+        type_registry.refresh_brigade(self.b1.id)
+        sid = self.login("rw", brigade=self.b1)
+        url = f"/api/testing/brigade/{self.b1.id}/equipment/{stable_id('мотузки')}/bulk"
+        r = self.client.put(url, [self.item(testingId="x")], content_type="application/json", HTTP_SESSION_ID=sid)
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json()["testingItems"][0]["message"], "testingId must be an integer")
+
+
+class ScopeTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.b1, self.b2 = Brigade.objects.create(name="Б1"), Brigade.objects.create(name="Б2")
+        self.d1, self.d2 = Detachment.objects.create(name="З1"), Detachment.objects.create(name="З2")
+        overdue = timezone.localdate() - timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.own = self.equipment(self.b1, "own", self.d1, overdue)
+            self.sibling = self.equipment(self.b1, "sibling", self.d2, overdue)
+            self.foreign = self.equipment(self.b2, "foreign", None, overdue)
+        self.sid = self.login("rw", brigade=self.b1, detachments=[self.d1])
+
+    def equipment(self, brigade, inv, detachment, next_date):
+        eq = Equipment.objects.create(
+            brigade=brigade, inventory_number=inv, name="мотузка страхувальна", type="мотузки", detachment=detachment,
+        )
+        Testing.objects.create(equipment=eq, date=next_date - timedelta(days=365), result="ok", next_date=next_date)
+        return eq
+
+    def visible(self, sid):
+        """Інвентарні номери, видимі через кожен ендпоінт читання."""
+        b = self.b1.id
+        due = self.get(sid, "/api/inspections/due", brigade=b).json()
+        return {
+            "equipment": {e["inventory_number"] for e in self.get(sid, "/api/equipment/").json()},
+            "brigade list": {e["inventory_number"] for e in self.get(sid, f"/api/brigade/{b}/equipment/list").json()},
+            "testing": {Testing.objects.get(id=t["id"]).equipment.inventory_number
+                        for t in self.get(sid, "/api/testing/").json()},
+            "text tab": {t["inventory_number"] for t in self.get(sid, "/api/testing/мотуз/").json()},
+            "search": {e["inventory_number"] for e in self.get(sid, "/api/search", q="мотузка").json()},
+            "inspections": {e["inventory_number"] for e in due["overdue"]},
+        }
+
+    def test_brigade_scope(self):
+        for endpoint, invs in self.visible(self.sid).items():
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(invs, {"own", "sibling"})
+
+    @override_settings(AUTH_SCOPE_DETACHMENTS=True)
+    def test_detachment_scope(self):
+        for endpoint, invs in self.visible(self.sid).items():
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(invs, {"own"})
+        body = self.get(self.sid, "/api/stats", brigade=self.b1.id).json()
+        self.assertEqual(body["total"], 1)
+
+    def test_foreign_brigade_forbidden(self):
+        b2 = self.b2.id
+        for url, params in (
+            (f"/api/brigade/{b2}/equipment/list", {}),
+            ("/api/search", {"q": "мотузка", "brigade": b2}),
+            ("/api/inspections/due", {"brigade": b2}),
+            ("/api/stats", {"brigade": b2}),
+            (f"/api/brigade/{b2}/testing/export.csv", {}),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.get(self.sid, url, **params).status_code, 403)
+
+    def test_search_unrestricted_sees_all(self):
+        sid = self.login("god", mode=User.MODE_GOD)
+        found = {e["inventory_number"] for e in self.get(sid, "/api/search", q="мотузка").json()}
+        self.assertEqual(found, {"own", "sibling", "foreign"})
+
+    def test_non_integer_brigade_param(self):
+        for url in ("/api/search", "/api/inspections/due", "/api/stats"):
+            with self.subTest(url=url):
+                self.assertEqual(self.get(self.sid, url, q="x", brigade="abc").status_code, 403)
+        sid = self.login("god", mode=User.MODE_GOD)
+        for url in ("/api/search", "/api/inspections/due", "/api/stats"):
+            with self.subTest(url=url, user="god"):
+                self.assertEqual(self.get(sid, url, q="x", brigade="abc").status_code, 400)
+
+
+def _cells():
+    return Counter({
+        (b, d, c, r): n for b, d, c, r, n in
+        EquipmentStat.objects.filter(count__gt=0).values_list("brigade_id", "detachment", "category", "result", "count")
+    })
+
+
+class StatsTests(TestCase):
+    def test_incremental_matches_rebuild(self):
+        b1, b2 = Brigade.objects.create(name="Б1"), Brigade.objects.create(name="Б2")
+        d1 = Detachment.objects.create(name="З1")
+        ropes = Nomenclature.objects.create(name="Мотузка 30 м", category="мотузки", slug="rope")
+        with self.captureOnCommitCallbacks(execute=True):
+            a = Equipment.objects.create(brigade=b1, inventory_number="a", name="драбина", type="драбини")
+            b = Equipment.objects.create(brigade=b1, inventory_number="b", name="x", type="", nomenclature=ropes)
+            c = Equipment.objects.create(brigade=b2, inventory_number="c", name="рукавиці", type="рукавиці", detachment=d1)
+            Equipment.objects.create(brigade=b1, inventory_number="d", name="щось", type="")
+            t = Testing.objects.create(equipment=a, date=date(2024, 1, 1), result="ok")
+            Testing.objects.create(equipment=a, date=date(2024, 2, 1), result="bad")
+            Testing.objects.create(equipment=b, date=date(2024, 1, 1), result="ok")
+            t.delete()
+            b.refresh_from_db()
+            b.detachment = d1
+            b.save()
+            ropes.category = "ремені"
+            ropes.save()
+            c.delete()
+        incremental = _cells()
+        stats.rebuild()
+        self.assertEqual(incremental, _cells())
+        self.assertIn((b1.id, d1.id, "ремені", "ok"), incremental)
+
+
+class CategoryFoldTests(TestCase):
+    def test_fold_matches_mysql_collation(self):
+        self.assertEqual(fold("Драбини  "), fold("драбини"))
+        self.assertNotEqual(fold(" драбини"), fold("драбини"))  # PAD SPACE — лише пробіли в кінці
+
+    def test_migration_shares_fold(self):
+        migration = importlib.import_module("core.migrations.0010_category")
+        self.assertIs(migration.fold, fold)
+
+    def test_category_ids_resolves_collated_row(self):
+        # MySQL за "Драбини " повертає рядок "драбини": id має знайтись, а не лишитись None
+        with mock.patch.object(categories, "Category") as model:
+            model.objects.filter.return_value.values_list.return_value = [("драбини", 7)]
+            self.assertEqual(categories.category_ids(["Драбини "]), {"Драбини ": 7})
+
+
+class CategoryBackfillMigrationTests(TransactionTestCase):
+    before = [("core", "0009_equipment_stats")]
+    after = [("core", "0011_rebuild_stats_by_category")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        brigade = apps.get_model("core", "Brigade").objects.create(name="Б1")
+        Nomenclature = apps.get_model("core", "Nomenclature")
+        Equipment = apps.get_model("core", "Equipment")
+        ropes = Nomenclature.objects.create(name="Мотузка", category="мотузки", slug="rope")
+        guessed = Nomenclature.objects.create(name="Драбина висувна", category="", slug="ladder")
+        Equipment.objects.create(brigade=brigade, inventory_number="1", name="x", type="інше", nomenclature=ropes)
+        Equipment.objects.create(brigade=brigade, inventory_number="2", name="x", type="", nomenclature=guessed)
+        Equipment.objects.create(brigade=brigade, inventory_number="3", name="пара рукавиць", type="")
+        Equipment.objects.create(brigade=brigade, inventory_number="4", name="x", type="Мотузки ")
+        # реєстр типів, як його лишила 0002: legacy type
+        apps.get_model("core", "BrigadeEquipmentType").objects.create(brigade=brigade, type_id=stable_id("інше"), name="інше")
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        Equipment = apps.get_model("core", "Equipment")
+        categories = dict(Equipment.objects.values_list("inventory_number", "category_ref__name"))
+        self.assertEqual(categories["1"], "мотузки")
+        self.assertEqual(categories["2"], "драбини")
+        self.assertEqual(categories["3"], "рукавиці")
+        self.assertIsNotNone(categories["4"])
+        self.assertEqual(apps.get_model("core", "Nomenclature").objects.filter(category_ref__isnull=True).count(), 0)
+        stat = dict(apps.get_model("core", "EquipmentStat").objects.values_list("category", "count"))
+        self.assertEqual(sum(stat.values()), 4)
+        self.assertEqual(stat["драбини"], 1)
+        registry = dict(apps.get_model("core", "BrigadeEquipmentType").objects.values_list("type_id", "name"))
+        self.assertEqual(registry, {stable_id(n): n for n in categories.values()})
+
+
+class SearchBackfillMigrationTests(TransactionTestCase):
+    before = [("core", "0004_inspection_indexes")]
+    after = [("core", "0005_search_index")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        brigade = apps.get_model("core", "Brigade").objects.create(name="Б1")
+        ropes = apps.get_model("core", "Nomenclature").objects.create(name="Мотузка рятувальна", category="мотузки", slug="rope")
+        apps.get_model("core", "Equipment").objects.create(
+            brigade=brigade, inventory_number="INV-7", name="x", type="", nomenclature=ropes, description="Червона")
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        doc = apps.get_model("core", "EquipmentSearchDocument").objects.get()
+        self.assertEqual(doc.document, "inv 7 x червона мотузка рятувальна мотузки")
+        grams = set(apps.get_model("core", "SearchTrigram").objects.values_list("gram", flat=True))
+        self.assertEqual(grams, search.trigrams(doc.document))
+
+
+class ExportTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.brigade = Brigade.objects.create(name="Б1")
+        self.d1 = Detachment.objects.create(name="З1")
+        a = Equipment.objects.create(brigade=self.brigade, inventory_number="a", name="x", type="мотузки", detachment=self.d1)
+        b = Equipment.objects.create(brigade=self.brigade, inventory_number="b", name="y", type="драбини")
+        for eq, day in ((a, 3), (b, 1), (a, 2)):
+            Testing.objects.create(equipment=eq, date=date(2024, 1, day), result="ok")
+        self.sid = self.login("rw", brigade=self.brigade)
+        self.url = f"/api/brigade/{self.brigade.id}/testing/export"
+
+    def csv_rows(self, response):
+        self.assertEqual(response.status_code, 200)
+        text = b"".join(response.streaming_content).decode("utf-8").lstrip("﻿")
+        return [line.split(",") for line in text.splitlines()]
+
+    def test_csv(self):
+        rows = self.csv_rows(self.get(self.sid, self.url + ".csv"))
+        self.assertEqual(rows[0][:3], ["testing_id", "date", "inventory_number"])
+        self.assertEqual([(r[1], r[2], r[4]) for r in rows[1:]], [
+            ("2024-01-01", "b", "драбини"), ("2024-01-02", "a", "мотузки"), ("2024-01-03", "a", "мотузки"),
+        ])
+
+    def test_filters(self):
+        rows = self.csv_rows(self.get(self.sid, self.url + ".csv", detachment=self.d1.id, **{"from": "2024-01-03"}))
+        self.assertEqual([(r[1], r[5]) for r in rows[1:]], [("2024-01-03", "З1")])
+
+    def test_bad_params(self):
+        for params in ({"detachment": "abc"}, {"from": "01.01.2024"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(self.sid, self.url + ".csv", **params).status_code, 400)
+        self.assertEqual(self.get(self.sid, self.url + ".pdf").status_code, 404)
+
+    async def test_asgi_body_is_async(self):
+        # синхронне тіло під ASGI Django зібрав би в список цілим
+        r = await AsyncClient().get(self.url + ".csv", headers={"session-id": self.sid})
+        self.assertTrue(r.is_async)
+        body = b"".join([part async for part in r.streaming_content])
+        expected = await sync_to_async(lambda: b"".join(self.get(self.sid, self.url + ".csv").streaming_content))()
+        self.assertEqual(body, expected)
+
+    @skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl не встановлено")
+    async def test_asgi_xlsx_is_async(self):
+        r = await AsyncClient().get(self.url + ".xlsx", headers={"session-id": self.sid})
+        self.assertTrue(r.is_async)
+        self.assertTrue(r["Content-Disposition"].startswith("attachment"))
+        self.assertEqual(len(b"".join([part async for part in r.streaming_content])), int(r["Content-Length"]))
+
+    @skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl не встановлено")
+    def test_xlsx(self):
+        from openpyxl import load_workbook
+
+        r = self.get(self.sid, self.url + ".xlsx")
+        self.assertEqual(r.status_code, 200)
+        ws = load_workbook(io.BytesIO(b"".join(r.streaming_content)), read_only=True).active
+        self.assertEqual(len(list(ws.values)), 4)
+
+
+class ActFileTests(ApiTestCase):
+    content = b"%PDF-1.4 act 0123456789"
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_root = override_settings(MEDIA_ROOT=media)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.brigade = Brigade.objects.create(name="Б1")
+        self.eq = Equipment.objects.create(brigade=self.brigade, inventory_number="1", name="x", type="мотузки")
+        self.sid = self.login("rw", brigade=self.brigade)
+        self.testing_id = self.upload("a.PDF")
+
+    def upload(self, filename, content=None):
+        data = {"equipment": self.eq.id, "date": "2024-01-01", "result": "ok",
+                "file": SimpleUploadedFile(filename, content or self.content)}
+        r = self.client.post("/api/testing/", data, HTTP_SESSION_ID=self.sid)
+        self.assertEqual(r.status_code, 201)
+        return r.json()["id"]
+
+    def download(self, sid=None, **headers):
+        return self.client.get(f"/api/testing/{self.testing_id}/file", HTTP_SESSION_ID=sid or self.sid, **headers)
+
+    def test_upload_is_content_addressed(self):
+        other = self.upload("b.pdf")
+        name, same = (Testing.objects.get(id=i).file.name for i in (self.testing_id, other))
+        self.assertEqual(name, same)
+        self.assertTrue(name.startswith(CONTENT_PREFIX) and name.endswith(".pdf"))
+        self.assertNotEqual(Testing.objects.get(id=self.upload("c.pdf", b"other")).file.name, name)
+
+    def test_serialized_url_is_protected(self):
+        url = f"http://testserver/api/testing/{self.testing_id}/file"
+        created = self.client.post("/api/testing/", {
+            "equipment": self.eq.id, "date": "2024-01-02", "result": "ok", "file": SimpleUploadedFile("a.pdf", b"x"),
+        }, HTTP_SESSION_ID=self.sid).json()
+        self.assertEqual(created["file"], f"http://testserver/api/testing/{created['id']}/file")
+        listed = {t["id"]: t["file"] for t in self.get(self.sid, "/api/testing/").json()}
+        self.assertEqual(listed[self.testing_id], url)
+        r = self.client.get(url, HTTP_SESSION_ID=self.sid)
+        self.assertEqual(b"".join(r.streaming_content), self.content)
+
+    def test_full_download(self):
+        r = self.download()
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(b"".join(r.streaming_content), self.content)
+        self.assertEqual(r["Accept-Ranges"], "bytes")
+        self.assertIn(f"act-{self.testing_id}.pdf", r["Content-Disposition"])
+
+    def test_ranges(self):
+        size = len(self.content)
+        for header, status, body, content_range in (
+            ("bytes=2-5", 206, self.content[2:6], f"bytes 2-5/{size}"),
+            ("bytes=-3", 206, self.content[-3:], f"bytes {size - 3}-{size - 1}/{size}"),
+            ("bytes=20-", 206, self.content[20:], f"bytes 20-{size - 1}/{size}"),
+            (f"bytes={size}-", 416, b"", f"bytes */{size}"),
+            ("bytes=1-2,4-5", 200, self.content, None),
+        ):
+            with self.subTest(range=header):
+                r = self.download(HTTP_RANGE=header)
+                self.assertEqual(r.status_code, status)
+                self.assertEqual(b"".join(r.streaming_content) if r.streaming else r.content, body)
+                self.assertEqual(r.get("Content-Range"), content_range)
+
+    def test_accel_headers(self):
+        name = Testing.objects.get(id=self.testing_id).file.name
+        with override_settings(PROTECTED_MEDIA_SERVER="nginx"):
+            self.assertEqual(self.download()["X-Accel-Redirect"], "/protected-media/" + name)
+        with override_settings(PROTECTED_MEDIA_SERVER="apache"):
+            self.assertEqual(self.download()["X-Sendfile"], act_storage.path(name))
+
+    def test_outside_scope_is_not_found(self):
+        other = Brigade.objects.create(name="Б2")
+        self.assertEqual(self.download(sid=self.login("other", brigade=other)).status_code, 404)
+
+    async def test_asgi_body_is_async(self):
+        r = await AsyncClient().get(
+            f"/api/testing/{self.testing_id}/file", headers={"session-id": self.sid, "range": "bytes=2-5"},
+        )
+        self.assertEqual(r.status_code, 206)
+        self.assertTrue(r.is_async)
+        self.assertEqual(b"".join([part async for part in r.streaming_content]), self.content[2:6])
+
+
+class FastSerializerParityTests(TestCase):
+    def setUp(self):
+        brigade = Brigade.objects.create(name="Б1")
+        detachment = Detachment.objects.create(name="З1")
+        eq = Equipment.objects.create(brigade=brigade, inventory_number="1", name="x", type="мотузки", detachment=detachment)
+        Equipment.objects.create(brigade=brigade, inventory_number="2", name="y", type="драбини")
+        Testing.objects.create(equipment=eq, date=date(2024, 1, 1), result="ok", next_date=date(2025, 1, 1),
+                               file=CONTENT_PREFIX + "ab/ab.pdf", external_url="https://example.com/a")
+        Testing.objects.create(equipment=eq, date=date(2024, 2, 1), result="bad")
+        self.request = Request(RequestFactory().get("/api/testing/"))
+
+    def assert_same(self, fast, slow, queryset):
+        drf = json.loads(json.dumps(slow(queryset, many=True, context={"request": self.request}).data))
+        self.assertEqual(fast(self.request).serialize(queryset), drf)
+
+    def test_testing(self):
+        self.assert_same(FastTestingSerializer, TestingSerializer, Testing.objects.all())
+
+    def test_equipment(self):
+        self.assert_same(FastEquipmentSerializer, EquipmentSerializer, Equipment.objects.all())
+
+
+class ConditionalTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.brigade = Brigade.objects.create(name="Б1")
+        Nomenclature.objects.create(name="Мотузка", category="мотузки", slug="rope")
+        Equipment.objects.create(brigade=self.brigade, inventory_number="1", name="x", type="мотузки")
+        self.sid = self.login("rw", brigade=self.brigade)
+
+    def test_not_modified_skips_query(self):
+        r = self.get(self.sid, "/api/nomenclature")
+        self.assertEqual(r.status_code, 200)
+        with self.assertNumQueries(1):  # лише версія каталогу
+            again = self.client.get("/api/nomenclature", HTTP_SESSION_ID=self.sid, HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(again.status_code, 304)
+        since = self.client.get("/api/nomenclature", HTTP_SESSION_ID=self.sid, HTTP_IF_MODIFIED_SINCE=r["Last-Modified"])
+        self.assertEqual(since.status_code, 304)
+
+    def test_version_lives_in_db(self):
+        # інший воркер = інший in-process кеш: ETag не залежить від нього
+        etag = self.get(self.sid, "/api/nomenclature")["ETag"]
+        caches["default"].clear()
+        self.assertEqual(self.get(self.sid, "/api/nomenclature")["ETag"], etag)
+
+    def test_writes_change_etag(self):
+        for url, write in (
+            ("/api/nomenclature", lambda: Nomenclature.objects.create(name="Драбина", category="драбини", slug="ladder")),
+            ("/api/testing/equipments", lambda: Equipment.objects.create(
+                brigade=self.brigade, inventory_number="2", name="y", type="драбини")),
+        ):
+            etag = self.get(self.sid, url)["ETag"]
+            write()
+            r = self.client.get(url, HTTP_SESSION_ID=self.sid, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 200)
+            self.assertNotEqual(r["ETag"], etag)
+
+    async def test_async_not_modified(self):
+        client = AsyncClient()
+        r = await client.get("/api/testing/equipments", headers={"session-id": self.sid})
+        self.assertEqual(r.status_code, 200)
+        again = await client.get("/api/testing/equipments", headers={"session-id": self.sid, "if-none-match": r["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+
+class ResponseCacheTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.brigade = Brigade.objects.create(name="Б1")
+        self.d1, self.d2 = Detachment.objects.create(name="З1"), Detachment.objects.create(name="З2")
+        self.eq = Equipment.objects.create(brigade=self.brigade, inventory_number="1", name="x", type="мотузки", detachment=self.d1)
+        Equipment.objects.create(brigade=self.brigade, inventory_number="2", name="y", type="мотузки", detachment=self.d2)
+        self.sid = self.login("rw", brigade=self.brigade)
+        self.url = f"/api/brigade/{self.brigade.id}/equipment/list"
+
+    def listed(self, sid=None):
+        return {e["inventory_number"]: e for e in self.get(sid or self.sid, self.url).json()}
+
+    def test_hit_skips_db(self):
+        first = self.listed()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.listed(), first)
+
+    def test_writes_invalidate(self):
+        self.listed()
+        self.eq.name = "z"
+        self.eq.save()
+        self.assertEqual(self.listed()["1"]["name"], "z")
+        Testing.objects.create(equipment=self.eq, date=date(2024, 1, 1), result="bad")
+        self.assertEqual(self.listed()["1"]["last_test_result"], "bad")
+        Equipment.objects.filter(pk=self.eq.pk).delete()
+        self.assertNotIn("1", self.listed())
+
+    def test_detachment_delete_invalidates(self):
+        self.assertEqual(self.listed()["1"]["detachment"], self.d1.id)
+        self.d1.delete()
+        self.assertIsNone(self.listed()["1"]["detachment"])
+
+    @override_settings(AUTH_SCOPE_DETACHMENTS=True)
+    def test_scoped_users_do_not_share_entries(self):
+        self.assertEqual(set(self.listed()), {"1", "2"})
+        scoped = self.login("scoped", brigade=self.brigade, detachments=[self.d2])
+        self.assertEqual(set(self.listed(scoped)), {"2"})
+
+
+class SyncTests(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.brigade = Brigade.objects.create(name="Б1")
+        self.d1 = Detachment.objects.create(name="З1")
+        self.eq = Equipment.objects.create(brigade=self.brigade, inventory_number="1", name="x", type="мотузки", detachment=self.d1)
+        self.sid = self.login("rw", brigade=self.brigade)
+
+    def sync(self, since=None, sid=None, **params):
+        params = {"brigade": self.brigade.id, **({"since": since} if since else {}), **params}
+        return self.get(sid or self.sid, "/api/sync", **params)
+
+    def token(self, sid=None):
+        body = self.sync(sid=sid).json()
+        self.assertTrue(body["reset"])
+        return body["token"]
+
+    @staticmethod
+    def ids(table) -> list:
+        i = table["fields"].index("id")
+        return [row[i] for row in table["rows"]]
+
+    def test_changes_since_token(self):
+        token = self.token()
+        self.eq.name = "y"
+        self.eq.save()
+        t = Testing.objects.create(equipment=self.eq, date=date(2024, 1, 1), result="ok")
+        gone = Equipment.objects.create(brigade=self.brigade, inventory_number="2", name="z", type="мотузки").pk
+        Equipment.objects.filter(pk=gone).delete()
+        body = self.sync(token).json()
+        self.assertFalse(body["reset"])
+        self.assertEqual(self.ids(body["equipment"]), [self.eq.id])
+        self.assertEqual(self.ids(body["testing"]), [t.id])
+        self.assertEqual(body["deleted"]["equipment"], [gone])
+        # з новим токеном — нічого
+        again = self.sync(body["token"]).json()
+        self.assertEqual((again["equipment"]["rows"], again["deleted"]["equipment"]), ([], []))
+
+    def test_more_in_pages(self):
+        token = self.token()
+        for i in range(3):
+            Equipment.objects.create(brigade=self.brigade, inventory_number=f"n{i}", name="z", type="мотузки")
+        seen = []
+        with override_settings(SYNC_MAX_CHANGES=2):
+            while True:
+                body = self.sync(token).json()
+                seen += self.ids(body["equipment"])
+                token = body["token"]
+                if not body["more"]:
+                    break
+        self.assertEqual(sorted(seen), sorted(Equipment.objects.exclude(pk=self.eq.pk).values_list("id", flat=True)))
+
+    def test_bad_tokens(self):
+        other = Brigade.objects.create(name="Б2")
+        foreign = self.sync(sid=self.login("god", mode=User.MODE_GOD), brigade=other.id).json()["token"]
+        for token in ("!!!", _raw_cursor([self.brigade.id, "x", 0]), foreign):
+            with self.subTest(token=token):
+                self.assertEqual(self.sync(token).status_code, 400)
+
+    def test_detachment_delete_is_logged(self):
+        token = self.token()
+        self.d1.delete()
+        body = self.sync(token).json()
+        self.assertEqual(self.ids(body["equipment"]), [self.eq.id])
+        i = body["equipment"]["fields"].index("detachment")
+        self.assertIsNone(body["equipment"]["rows"][0][i])
+
+    @override_settings(AUTH_SCOPE_DETACHMENTS=True)
+    def test_scope_leavers_are_deleted(self):
+        d2 = Detachment.objects.create(name="З2")
+        t = Testing.objects.create(equipment=self.eq, date=date(2024, 1, 1), result="ok")
+        scoped = self.login("scoped", brigade=self.brigade, detachments=[self.d1])
+        token, full = self.token(scoped), self.token()
+        self.eq.detachment = d2
+        self.eq.save()
+        body = self.sync(token, sid=scoped).json()
+        self.assertEqual((body["equipment"]["rows"], body["testing"]["rows"]), ([], []))
+        self.assertEqual((body["deleted"]["equipment"], body["deleted"]["testing"]), ([self.eq.id], [t.id]))
+        # без фільтра загонів — звичайна зміна
+        body = self.sync(full).json()
+        self.assertEqual((self.ids(body["equipment"]), body["deleted"]["equipment"]), ([self.eq.id], []))
+        # повернення в загін: клієнт знову отримує і спорядження, і його випробування
+        self.eq.detachment = self.d1
+        self.eq.save()
+        body = self.sync(token, sid=scoped).json()
+        self.assertEqual((self.ids(body["equipment"]), self.ids(body["testing"])), ([self.eq.id], [t.id]))
+        self.assertEqual(body["deleted"]["equipment"], [])
@@ -0,0 +1,83 @@
+"""
+Реєстр типів спорядження (BrigadeEquipmentType).
+
+Java-клієнт адресує тип числовим id = stable_id(назва категорії). Раніше мапа
+будувалась скануванням Equipment на кожен запит; тепер вона зберігається в
+таблиці й оновлюється на запис (сигнали Equipment / Nomenclature).
+"""
+import hashlib
+
+from .models import BrigadeEquipmentType, Equipment, Nomenclature
+
+
+def stable_id(name: str) -> int:
+    # детермінований позитивний int з назви (стабільний id для типу)
+    h = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
+    return int(h, 16)
+
+
+def build_type_map(brigade_id: int):
+    # ефективні категорії спорядження (core.categories) — саме за ними фільтрують Java-ендпоінти
+    names = set(
+        Equipment.objects.filter(brigade_id=brigade_id).order_by()
+        .values_list("category_ref__name", flat=True).distinct()
+    )
+    names = {n for n in names if n}
+    mapping = {stable_id(n): n for n in sorted(names)}
+    return mapping
+
+
+def resolve_type(brigade_id: int, type_id: int):
+    """Назва типу для бригади або None — один індексований запит."""
+    return (
+        BrigadeEquipmentType.objects.filter(brigade_id=brigade_id, type_id=type_id)
+        .values_list("name", flat=True)
+        .first()
+    )
+
+
+async def aresolve_type(brigade_id: int, type_id: int):
+    return await (
+        BrigadeEquipmentType.objects.filter(brigade_id=brigade_id, type_id=type_id)
+        .values_list("name", flat=True)
+        .afirst()
+    )
+
+
+def _type_name_querysets():
+    return (
+        Nomenclature.objects.filter(active=True).values_list("category", flat=True).distinct(),
+        BrigadeEquipmentType.objects.values_list("name", flat=True).distinct(),
+    )
+
+
+def all_type_names() -> set:
+    return {n for qs in _type_name_querysets() for n in qs if n}
+
+
+async def aall_type_names() -> set:
+    return {n for qs in _type_name_querysets() async for n in qs if n}
+
+
+def register_names(brigade_id: int, names):
+    rows = [
+        BrigadeEquipmentType(brigade_id=brigade_id, type_id=stable_id(n), name=n)
+        for n in set(names) if n
+    ]
+    if rows:
+        BrigadeEquipmentType.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def refresh_brigade(brigade_id: int):
+    """Повний перерахунок реєстру однієї бригади (після оновлень/видалень)."""
+    mapping = build_type_map(brigade_id)
+    BrigadeEquipmentType.objects.filter(brigade_id=brigade_id).exclude(type_id__in=list(mapping)).delete()
+    register_names(brigade_id, mapping.values())
+
+
+def refresh_all():
+    for brigade_id in Equipment.objects.values_list("brigade_id", flat=True).order_by().distinct():
+        refresh_brigade(brigade_id)
+    BrigadeEquipmentType.objects.exclude(
+        brigade_id__in=Equipment.objects.values("brigade_id")
+    ).delete()
@@ -0,0 +1,66 @@
+"""
+Потоковий прийом файлів актів (multipart).
+
+SHA-256 і ліміт розміру (ACT_FILE_MAX_SIZE) рахуються по чанках під час
+парсингу, вміст одразу пишеться у тимчасовий файл — цілим у пам'яті файл
+не буває ніколи. Хеш кладеться в `uploaded_file.sha256` для core.storage.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import MultiPartParser
+
+MULTIPART_OVERHEAD = 64 * 1024  # заголовки частин і текстові поля форми
+
+
+def max_upload_size() -> int:
+    return getattr(settings, "ACT_FILE_MAX_SIZE", 25 * 1024 * 1024)
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "File too large"
+    default_code = "file_too_large"
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.limit = max_upload_size()
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # явно завеликий запит відхиляємо ще до читання тіла
+        if content_length and content_length > self.limit + MULTIPART_OVERHEAD:
+            raise UploadTooLarge()
+        return super().handle_raw_input(input_data, META, content_length, boundary, encoding)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            self.file.close()
+            raise UploadTooLarge()
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class HashingMultiPartParser(MultiPartParser):
+    """MultiPartParser, що приймає файли через HashingUploadHandler."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context["request"]
+        request._request.upload_handlers = [HashingUploadHandler(request._request)]
+        return super().parse(stream, media_type, parser_context)
@@ -1,13 +1,17 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import (
+    AsyncBrigadeEquipmentList, AsyncEquipmentTypesPseudoView, AsyncJavaTestingEquipmentView,
+    AsyncTestingByTypeTextView, read_view,
+)
 from .views import (
     LoginView, LogoutView,
-    RegistrationView, BrigadeAdminView, DetachmentAdminView,
+    RegistrationView, AdminTreeView, BrigadeAdminView, DetachmentAdminView,
     NomenclatureListCreate, NomenclatureCategories,
-    EquipmentViewSet, BrigadeEquipmentCreate, BrigadeEquipmentList,
-    EquipmentTypesPseudoView, JavaTestingEquipmentView, TestingByTypeTextView,
-    TestingViewSet,
+    EquipmentViewSet, BrigadeEquipmentCreate, BrigadeEquipmentBulkCreate, BrigadeEquipmentList,
+    EquipmentTypesPseudoView, JavaTestingEquipmentView, JavaTestingBulkView, TestingByTypeTextView,
+    TestingViewSet, TestingFileView, BrigadeTestingExportView, InspectionDueView, SearchView, StatsView, SyncView, MetricsView,
 )
 
 router = DefaultRouter()
@@ -22,6 +26,7 @@ urlpatterns = [
     path('admin/registration', RegistrationView.as_view()),
     path('admin/brigade', BrigadeAdminView.as_view()),
     path('admin/detachment', DetachmentAdminView.as_view()),
+    path('admin/tree', AdminTreeView.as_view()),
 
     # nomenclature
     path('nomenclature', NomenclatureListCreate.as_view()),
@@ -29,14 +34,38 @@ urlpatterns = [
 
     # brigade equipment via nomenclature
     path('brigade/<int:brigade_id>/equipment', BrigadeEquipmentCreate.as_view()),
-    path('brigade/<int:brigade_id>/equipment/list', BrigadeEquipmentList.as_view()),
+    path('brigade/<int:brigade_id>/equipment/bulk', BrigadeEquipmentBulkCreate.as_view()),
+    path('brigade/<int:brigade_id>/equipment/list', read_view(BrigadeEquipmentList, AsyncBrigadeEquipmentList)),
 
     # java-style testing
-    path('testing/equipments', EquipmentTypesPseudoView.as_view()),
-    path('testing/brigade/<int:brigade_id>/equipment/<int:equip_type_id>', JavaTestingEquipmentView.as_view()),
+    path('testing/equipments', read_view(EquipmentTypesPseudoView, AsyncEquipmentTypesPseudoView)),
+    path('testing/brigade/<int:brigade_id>/equipment/<int:equip_type_id>',
+         read_view(JavaTestingEquipmentView, AsyncJavaTestingEquipmentView)),
+    path('testing/brigade/<int:brigade_id>/equipment/<int:equip_type_id>/bulk', JavaTestingBulkView.as_view()),
+
+    # audit export (csv / xlsx)
+    path('brigade/<int:brigade_id>/testing/export.<str:fmt>', BrigadeTestingExportView.as_view()),
+
+    # act files (auth + X-Accel-Redirect / X-Sendfile)
+    path('testing/<int:testing_id>/file', TestingFileView.as_view(), name='testing-file'),
+
+    # search
+    path('search', SearchView.as_view()),
+
+    # overdue / due-soon
+    path('inspections/due', InspectionDueView.as_view()),
+
+    # dashboard rollups
+    path('stats', StatsView.as_view()),
+
+    # delta sync for offline clients
+    path('sync', SyncView.as_view()),
+
+    # prometheus
+    path('metrics', MetricsView.as_view()),
 
     # text tabs
-    path('testing/<str:type_text>/', TestingByTypeTextView.as_view()),
+    path('testing/<str:type_text>/', read_view(TestingByTypeTextView, AsyncTestingByTypeTextView)),
 ]
 
 urlpatterns += router.urls
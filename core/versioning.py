@@ -0,0 +1,51 @@
+"""
+Лічильники версій даних у Django cache.
+
+Кожен запис (сигнали / масові операції) інкрементує версію; читачі
+використовують її як частину ключа кешу відповіді (core.response_cache).
+Початкове значення — поточний час у мс, тож після очищення кешу чи
+рестарту версії не повторюються і старі записи не «оживають».
+
+Версії мають бути спільними для всіх воркерів — у проді CACHES['default']
+має вказувати на спільний бекенд (memcached / redis): з LocMem воркер, що не
+обробляв запис, віддає з кешу застарілу відповідь (`check --deploy` про це
+попереджає, core.checks). Валідатори каталогу (core.conditional) від кешу не
+залежать — їх версія береться з БД.
+"""
+import time
+
+from django.core.cache import cache
+
+VERSION_TIMEOUT = None  # без протухання
+
+
+def _key(name: str) -> str:
+    return f"core:ver:{name}"
+
+
+def get_version(name: str) -> int:
+    key = _key(name)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, int(time.time() * 1000), VERSION_TIMEOUT)
+        value = cache.get(key)
+    return value
+
+
+async def aget_version(name: str) -> int:
+    key = _key(name)
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, int(time.time() * 1000), VERSION_TIMEOUT)
+        value = await cache.aget(key)
+    return value
+
+
+def bump_version(name: str) -> int:
+    key = _key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        value = int(time.time() * 1000)
+        cache.set(key, value, VERSION_TIMEOUT)
+        return value
@@ -1,19 +1,46 @@
+import os
 import uuid
-import hashlib
-from datetime import timedelta, datetime
+from datetime import date, timedelta
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, permissions
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import FormParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .authentication import SessionIDAuthentication
+from . import categories, changelog, search, stats
+from .authentication import SessionIDAuthentication, get_session_id
 from .models import (
     Brigade, Detachment, User, UserSession, Nomenclature, Equipment, Testing
 )
+from .admin_tree import get_admin_tree
+from .bulk import (
+    ImportFormatError, import_equipment, ingest_testings, parse_import_rows, parse_item_list, update_testings,
+)
+from .conditional import catalog_conditional
+from .fast_serializers import (
+    FastEquipmentSerializer, FastJavaTestingSerializer, FastTestingSerializer, FastTestingTextSerializer,
+    ModelSerializerLister,
+)
+from .exports import EXPORTERS, ExportFormatError, export_queryset, iter_export_rows
+from .file_serving import protected_file_response
+from .inspections import DEFAULT_DAYS, inspection_queryset, inspection_report
+from .instrumentation import query_budget, registry
+from .pagination import EquipmentPagination, TestingPagination
+from .renderers import OrjsonRenderer
+from .response_cache import brigade_cached
+from .session_cache import session_cache
+from .scoping import check_brigade, get_scope, resolve_scope
+from .session_reaper import enforce_session_cap
+from .streaming import asgi_streaming, iter_rows, ndjson_response, wants_ndjson
+from .type_registry import all_type_names, resolve_type, stable_id
+from .uploads import HashingMultiPartParser
 from .serializers import (
     # auth
     LoginSerializer, SessionOutSerializer,
@@ -24,8 +51,8 @@ from .serializers import (
     # equipment
     EquipmentSerializer, BrigadeEquipmentCreateSerializer,
     # testing
-    TestingSerializer, JavaTestingInSerializer, JavaTestingOutSerializer,
-    JavaTestingListOutSerializer, JavaEquipmentTypeOutSerializer
+    TestingSerializer, TestingTextOutSerializer, JavaTestingInSerializer, JavaTestingOutSerializer,
+    JavaTestingListOutSerializer, JavaEquipmentTypeOutSerializer, java_testing_out
 )
 
 # --- Permissions -------------------------------------------------------------
@@ -45,11 +72,48 @@ class IsRWOrGod(permissions.BasePermission):
             (request.user.is_superuser or request.user.mode in ("RW","GOD"))
         )
 
+class BrigadeScoped(permissions.BasePermission):
+    """Бригада з маршруту (brigade_id) або ?brigade= — в області доступу користувача (core.scoping)."""
+    message = "brigade is outside of user scope"
+
+    def has_permission(self, request, view):
+        brigade_id = view.kwargs.get("brigade_id") or request.query_params.get("brigade")
+        return brigade_id is None or get_scope(request.user).allows_brigade(brigade_id)
+
+# --- Fast lists ---------------------------------------------------------------
+
+class FastListMixin:
+    """
+    fast_serializer_class = None → звичайний DRF-серіалізатор (slow_serializer_class);
+    інакше values_list + core.fast_serializers і orjson-рендерер.
+    """
+    renderer_classes = [OrjsonRenderer, BrowsableAPIRenderer]
+    fast_serializer_class = None
+    slow_serializer_class = None
+
+    def get_lister(self, request):
+        if self.fast_serializer_class is not None:
+            return self.fast_serializer_class(request)
+        return ModelSerializerLister(self.slow_serializer_class, request)
+
+
+def list_response(request, qs, lister, paginator, view=None):
+    """NDJSON-стрім, keyset-сторінка або повний список — залежно від параметрів."""
+    if wants_ndjson(request):
+        rows = iter_rows(lister.rows(qs, named=True), lister.to_representation, paginator)
+        return asgi_streaming(request, ndjson_response(rows))
+    page = paginator.paginate_queryset(lister.rows(qs, named=True), request, view=view)
+    if page is not None:
+        return paginator.get_paginated_response(lister.many(page))
+    return Response(lister.serialize(qs))
+
+
 # --- Auth -------------------------------------------------------------------
 
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
 
+    @query_budget(10)
     def post(self, request):
         ser = LoginSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -64,16 +128,19 @@ class LoginView(APIView):
 
         sid = uuid.uuid4().hex
         ttl_hours = 8
-        UserSession.objects.create(
+        session = UserSession.objects.create(
             user=user,
             session_id=sid,
             expires_at=timezone.now() + timedelta(hours=ttl_hours)
         )
+        enforce_session_cap(user)
+        scope = resolve_scope(user)
+        session_cache.add(session)
 
         payload = {
             "sessionId": sid,
             "brigadeId": user.brigade_id,
-            "detachments": list(user.detachments.values_list("id", flat=True)),
+            "detachments": sorted(scope.detachment_ids),
         }
 
         # Якщо адмін (суперкористувач або GOD-режим) —
@@ -81,31 +148,12 @@ class LoginView(APIView):
         if user.is_superuser or user.mode == User.MODE_GOD:
             payload["isAdmin"] = True
 
-            brigades = Brigade.objects.all().order_by("id")
-            brigades_data = []
-
-            for b in brigades:
-                # Загони, які мають хоч якесь спорядження у цій бригаді
-                dets_qs = Detachment.objects.filter(
-                    equipments__brigade=b
-                ).distinct().order_by("id")
-
-                brigades_data.append({
-                    "id": b.id,
-                    "name": b.name,
-                    "detachments": DetachmentSerializer(dets_qs, many=True).data,
-                })
-
-            payload["brigades"] = brigades_data
-
-            # Загони, які взагалі ні до якої бригади не "підв’язані" через Equipment
-            unassigned_qs = Detachment.objects.filter(
-                equipments__isnull=True
-            ).distinct().order_by("id")
-            if unassigned_qs.exists():
-                payload["unassignedDetachments"] = DetachmentSerializer(
-                    unassigned_qs, many=True
-                ).data
+            # нові клієнти беруть дерево з /api/admin/tree
+            if getattr(settings, "AUTH_LOGIN_ADMIN_TREE", True):
+                tree = get_admin_tree()
+                payload["brigades"] = tree["brigades"]
+                if tree["unassignedDetachments"]:
+                    payload["unassignedDetachments"] = tree["unassignedDetachments"]
 
         return Response(payload)
 
@@ -115,8 +163,9 @@ class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        sid = request.META.get("HTTP_SESSION_ID") or request.headers.get("session-id")
+        sid = get_session_id(request)
         if sid:
+            session_cache.invalidate(sid)
             UserSession.objects.filter(session_id=sid).delete()
         return Response({"ok": True})
 
@@ -143,6 +192,16 @@ class RegistrationView(APIView):
         return Response({"id": user.id}, status=201)
 
 
+class AdminTreeView(APIView):
+    """Бригади з їхніми загонами + загони без спорядження (кешується)."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [IsGod]
+
+    @query_budget(6)
+    def get(self, request):
+        return Response(get_admin_tree())
+
+
 class BrigadeAdminView(APIView):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [IsGod]
@@ -204,6 +263,8 @@ class NomenclatureListCreate(APIView):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [IsRWOrGod]
 
+    @query_budget(5)
+    @catalog_conditional
     def get(self, request):
         category = request.query_params.get("category")
         qs = Nomenclature.objects.filter(active=True)
@@ -211,6 +272,7 @@ class NomenclatureListCreate(APIView):
             qs = qs.filter(category=category)
         return Response(NomenclatureOutSerializer(qs, many=True).data)
 
+    @query_budget(12)
     def post(self, request):
         # тільки name є обов’язковим
         ser = NomenclatureCreateSerializer(data=request.data)
@@ -223,6 +285,8 @@ class NomenclatureCategories(APIView):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    @query_budget(5)
+    @catalog_conditional
     def get(self, request):
         cats = Nomenclature.objects.filter(active=True).values_list("category", flat=True).distinct()
         payload = [{"code": c, "slug": c, "name": c} for c in cats]
@@ -231,14 +295,22 @@ class NomenclatureCategories(APIView):
 
 # --- Equipment CRUD ----------------------------------------------
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(FastListMixin, viewsets.ModelViewSet):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [IsRWOrGod]
     serializer_class = EquipmentSerializer
+    slow_serializer_class = EquipmentSerializer
+    fast_serializer_class = FastEquipmentSerializer
     queryset = Equipment.objects.all()
+    pagination_class = EquipmentPagination
+    query_budgets = {"list": 4, "retrieve": 4, "partial_update": 14, "update": 14}
+
+    def list(self, request, *args, **kwargs):
+        qs = self.filter_queryset(self.get_queryset())
+        return list_response(request, qs, self.get_lister(request), self.paginator, view=self)
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = get_scope(self.request.user).equipment(super().get_queryset())
         brigade = self.request.query_params.get("brigade")
         inv = self.request.query_params.get("inventory_number")
         if brigade:
@@ -247,12 +319,22 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             qs = qs.filter(inventory_number=inv)
         return qs
 
+    def perform_create(self, serializer):
+        check_brigade(self.request.user, serializer.validated_data["brigade"].pk)
+        serializer.save()
+
+    def perform_update(self, serializer):
+        if "brigade" in serializer.validated_data:
+            check_brigade(self.request.user, serializer.validated_data["brigade"].pk)
+        serializer.save()
+
 
 # Створення через бригаду + номенклатуру
 class BrigadeEquipmentCreate(APIView):
     authentication_classes = [SessionIDAuthentication]
-    permission_classes = [IsRWOrGod]
+    permission_classes = [IsRWOrGod, BrigadeScoped]
 
+    @query_budget(13)
     def post(self, request, brigade_id: int):
         ser = BrigadeEquipmentCreateSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -272,99 +354,94 @@ class BrigadeEquipmentCreate(APIView):
 
 
 
-class BrigadeEquipmentList(APIView):
+class BrigadeEquipmentBulkCreate(APIView):
+    """Масовий імпорт: JSON-масив рядків або файл CSV/XLSX у полі `file`."""
     authentication_classes = [SessionIDAuthentication]
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [IsRWOrGod, BrigadeScoped]
 
+    @query_budget(23)
+    def post(self, request, brigade_id: int):
+        get_object_or_404(Brigade, id=brigade_id)
+        try:
+            rows = parse_import_rows(request)
+        except ImportFormatError as exc:
+            return Response({"message": str(exc)}, status=400)
+        created, errors = import_equipment(brigade_id, rows)
+        status = 201 if created or not errors else 400
+        return Response({"created": created, "errors": errors}, status=status)
+
+
+class BrigadeEquipmentList(FastListMixin, APIView):
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+    slow_serializer_class = EquipmentSerializer
+    fast_serializer_class = FastEquipmentSerializer
+
+    @query_budget(5)
+    @brigade_cached()
     def get(self, request, brigade_id: int):
         category_id = request.query_params.get("category_id")
         category = request.query_params.get("category")
-        qs = Equipment.objects.filter(brigade_id=brigade_id)
+        qs = get_scope(request.user).equipment(Equipment.objects.filter(brigade_id=brigade_id))
 
 
         if category_id:
             qs = qs.filter(nomenclature_id=category_id)
         elif category:
 
-            qs = qs.filter(Q(type=category) | Q(nomenclature__category=category))
-
-        return Response(EquipmentSerializer(qs, many=True).data)
+            qs = categories.filter_category(qs, category)
 
+        return list_response(request, qs, self.get_lister(request), EquipmentPagination(), view=self)
 
 
-def stable_id(name: str) -> int:
-    # детермінований позитивний int з назви (стабільний id для типу)
-    h = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
-    return int(h, 16)
-
-
-def build_type_map(brigade_id: int):
-    # Категорії з номенклатури + запасний варіант з текстового поля type
-    names = set(
-        Equipment.objects.filter(brigade_id=brigade_id, nomenclature__isnull=False)
-        .values_list("nomenclature__category", flat=True)
-    )
-    names |= set(Equipment.objects.filter(brigade_id=brigade_id).values_list("type", flat=True))
-    names = {n for n in names if n}
-    mapping = {stable_id(n): n for n in sorted(names)}
-    return mapping
-
 
 class EquipmentTypesPseudoView(APIView):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    @query_budget(6)
+    @catalog_conditional
     def get(self, request):
-        names = set(Nomenclature.objects.filter(active=True).values_list("category", flat=True))
-        names |= set(Equipment.objects.values_list("type", flat=True))
-        names = {n for n in names if n}
+        names = all_type_names()
         data = [{"id": stable_id(n), "name": n, "slug": ""} for n in sorted(names)]
         ser = JavaEquipmentTypeOutSerializer(data, many=True)
         return Response(ser.data)
 
 
-class JavaTestingEquipmentView(APIView):
+class JavaTestingEquipmentView(FastListMixin, APIView):
     authentication_classes = [SessionIDAuthentication]
-    permission_classes = [IsRWOrGod]
+    permission_classes = [IsRWOrGod, BrigadeScoped]
+    fast_serializer_class = FastJavaTestingSerializer
 
+    @query_budget(6)
+    @brigade_cached()
     def get(self, request, brigade_id: int, equip_type_id: int):
-        type_map = build_type_map(brigade_id)
-        if equip_type_id not in type_map:
+        type_name = resolve_type(brigade_id, equip_type_id)
+        if type_name is None:
             return Response({"message":"equipment type not found"}, status=404)
-        type_name = type_map[equip_type_id]
-        qs = Testing.objects.filter(
+        qs = categories.filter_category(get_scope(request.user).equipment(Testing.objects.filter(
             equipment__brigade_id=brigade_id
-        ).filter(
-            Q(equipment__nomenclature__category=type_name) | Q(equipment__type=type_name)
-        ).select_related("equipment")
-        items = []
-        for t in qs:
-            items.append({
-                "testingId": t.id,
-                "deviceInventoryNumber": t.equipment.inventory_number,
-                "testingDate": int(datetime.combine(t.date, datetime.min.time()).timestamp()*1000),
-                "testingResult": t.result,
-                "nextTestingDate": int(datetime.combine(t.next_date, datetime.min.time()).timestamp()*1000) if t.next_date else None,
-                "url": t.external_url or "",
-            })
+        ), "equipment__"), type_name, "equipment__").select_related("equipment")
+        if self.fast_serializer_class is not None:
+            return Response({"testingItems": self.get_lister(request).serialize(qs)})
+        items = [java_testing_out(t, t.equipment.inventory_number) for t in qs]
         return Response(JavaTestingListOutSerializer({"testingItems": items}).data)
 
+    @query_budget(20)
+    @transaction.atomic
     def post(self, request, brigade_id: int, equip_type_id: int):
-        type_map = build_type_map(brigade_id)
-        if equip_type_id not in type_map:
+        type_name = resolve_type(brigade_id, equip_type_id)
+        if type_name is None:
             return Response({"message":"equipment type not found"}, status=404)
-        type_name = type_map[equip_type_id]
         ser = JavaTestingInSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
         d = ser.validated_data
 
         inv = request.data.get("deviceInventoryNumber")
-        eq = Equipment.objects.filter(
+        eq = categories.filter_category(Equipment.objects.filter(
             brigade_id=brigade_id,
             inventory_number=inv
-        ).filter(
-            Q(nomenclature__category=type_name) | Q(type=type_name)
-        ).first()
+        ), type_name).first()
         if not eq:
             return Response({"message":"equipment not found for brigade/type/inventory"}, status=400)
 
@@ -375,19 +452,12 @@ class JavaTestingEquipmentView(APIView):
             next_date=d.get("next_date"),
             external_url=d.get("external_url"),
         )
-        out = {
-            "testingId": t.id,
-            "deviceInventoryNumber": eq.inventory_number,
-            "testingDate": int(datetime.combine(t.date, datetime.min.time()).timestamp()*1000),
-            "testingResult": t.result,
-            "nextTestingDate": int(datetime.combine(t.next_date, datetime.min.time()).timestamp()*1000) if t.next_date else None,
-            "url": t.external_url or "",
-        }
-        return Response(out, status=201)
+        return Response(java_testing_out(t, eq.inventory_number), status=201)
 
+    @query_budget(20)
+    @transaction.atomic
     def put(self, request, brigade_id: int, equip_type_id: int):
-        type_map = build_type_map(brigade_id)
-        if equip_type_id not in type_map:
+        if resolve_type(brigade_id, equip_type_id) is None:
             return Response({"message":"equipment type not found"}, status=404)
         ser = JavaTestingInSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -404,47 +474,248 @@ class JavaTestingEquipmentView(APIView):
         t.next_date = d.get("next_date")
         t.external_url = d.get("external_url")
         t.save()
-        out = {
-            "testingId": t.id,
-            "deviceInventoryNumber": t.equipment.inventory_number,
-            "testingDate": int(datetime.combine(t.date, datetime.min.time()).timestamp()*1000),
-            "testingResult": t.result,
-            "nextTestingDate": int(datetime.combine(t.next_date, datetime.min.time()).timestamp()*1000) if t.next_date else None,
-            "url": t.external_url or "",
-        }
-        return Response(out)
+        return Response(java_testing_out(t, t.equipment.inventory_number))
+
+
+class JavaTestingBulkView(APIView):
+    """
+    Пакетна версія JavaTestingEquipmentView: масив (або {"testingItems": [...]})
+    у тому ж форматі; POST створює, PUT виправляє (кожен елемент з testingId).
+    """
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [IsRWOrGod, BrigadeScoped]
+
+    def _items(self, request):
+        try:
+            return parse_item_list(request.data, "testingItems"), None
+        except ImportFormatError as exc:
+            return None, Response({"message": str(exc)}, status=400)
+
+    @query_budget(21)
+    def post(self, request, brigade_id: int, equip_type_id: int):
+        type_name = resolve_type(brigade_id, equip_type_id)
+        if type_name is None:
+            return Response({"message":"equipment type not found"}, status=404)
+        items, error = self._items(request)
+        if error:
+            return error
+        outcomes = ingest_testings(brigade_id, type_name, items)
+        ok = any(o["status"] == "created" for o in outcomes)
+        return Response({"testingItems": outcomes}, status=201 if ok or not items else 400)
+
+    @query_budget(20)
+    def put(self, request, brigade_id: int, equip_type_id: int):
+        if resolve_type(brigade_id, equip_type_id) is None:
+            return Response({"message":"equipment type not found"}, status=404)
+        items, error = self._items(request)
+        if error:
+            return error
+        outcomes = update_testings(brigade_id, items)
+        ok = any(o["status"] == "updated" for o in outcomes)
+        return Response({"testingItems": outcomes}, status=200 if ok or not items else 400)
 
 
 # Текстові ендпоінти для вкладок: /testing/мотуз/ тощо
-class TestingByTypeTextView(APIView):
+class TestingByTypeTextView(FastListMixin, APIView):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    slow_serializer_class = TestingTextOutSerializer
+    fast_serializer_class = FastTestingTextSerializer
 
+    @query_budget(4)
+    @brigade_cached(lambda request, **kwargs: request.user.brigade_id)
     def get(self, request, type_text: str):
         brigade_id = request.user.brigade_id
-        qs = Testing.objects.filter(equipment__brigade_id=brigade_id).select_related("equipment")
+        qs = get_scope(request.user).equipment(
+            Testing.objects.filter(equipment__brigade_id=brigade_id), "equipment__"
+        ).select_related("equipment")
         tt = type_text.lower()
-        filtered = qs.filter(
-            Q(equipment__type__icontains=tt) |
-            Q(equipment__nomenclature__category__icontains=tt)
-        )
-        items = []
-        for t in filtered:
-            items.append({
-                "inventory_number": t.equipment.inventory_number,
-                "date": t.date.strftime("%d.%m.%Y"),
-                "result": t.result,
-                "next_date": t.next_date.strftime("%d.%m.%Y") if t.next_date else None,
-                "external_url": t.external_url or "",
-                "id": t.id,
-            })
-        return Response(items)
+        # як і раніше — підрядок legacy type або категорії
+        filtered = qs.filter(Q(equipment__type__icontains=tt) | Q(equipment__category_ref__name__icontains=tt))
+        return list_response(request, filtered, self.get_lister(request), TestingPagination(), view=self)
+
+
+class SearchView(APIView):
+    """Повнотекстовий / префіксний пошук спорядження: ?q=&brigade=&limit="""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+
+    @query_budget(5)
+    def get(self, request):
+        q = request.query_params.get("q", "")
+        try:
+            brigade_id = int(request.query_params.get("brigade") or request.user.brigade_id or 0)
+        except ValueError:
+            return Response({"message":"brigade must be an integer"}, status=400)
+        if not brigade_id and not get_scope(request.user).unrestricted:
+            return Response([])  # без бригади шукати по всіх може лише GOD
+        try:
+            limit = int(request.query_params.get("limit", search.DEFAULT_LIMIT))
+        except ValueError:
+            limit = search.DEFAULT_LIMIT
+        limit = max(1, min(limit, search.MAX_LIMIT))
+        return Response(search.search(q, brigade_id=brigade_id, limit=limit, scope=get_scope(request.user)))
+
+
+class InspectionDueView(APIView):
+    """Прострочені та найближчі (days) випробування по бригаді / загону / категорії."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+
+    @query_budget(8)
+    def get(self, request):
+        try:
+            brigade_id = int(request.query_params.get("brigade") or request.user.brigade_id or 0)
+            detachment = request.query_params.get("detachment")
+            detachment_id = int(detachment) if detachment else None
+        except ValueError:
+            return Response({"message":"brigade and detachment must be integers"}, status=400)
+        if not brigade_id:
+            return Response({"message":"brigade required"}, status=400)
+        try:
+            days = int(request.query_params.get("days", DEFAULT_DAYS))
+        except ValueError:
+            return Response({"message":"days must be an integer"}, status=400)
+        qs = get_scope(request.user).equipment(inspection_queryset(
+            brigade_id,
+            detachment_id=detachment_id,
+            category=request.query_params.get("category"),
+        ))
+        return Response(inspection_report(qs, days=max(0, days)))
+
+
+class TestingFileView(APIView):
+    """Файл акту: доступ — за областю користувача (core.scoping), передачу робить веб-сервер (core.file_serving)."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @query_budget(3)
+    def get(self, request, testing_id: int):
+        # поза областю доступу — як відсутній
+        qs = get_scope(request.user).equipment(Testing.objects.filter(id=testing_id), "equipment__")
+        name = qs.values_list("file", flat=True).first()
+        if not name:
+            return Response({"message":"file not found"}, status=404)
+        storage = Testing._meta.get_field("file").storage
+        response = protected_file_response(request, name, f"act-{testing_id}{os.path.splitext(name)[1]}", storage)
+        if response is None:
+            return Response({"message":"file not found"}, status=404)
+        return response
+
+
+class BrigadeTestingExportView(APIView):
+    """Історія випробувань бригади для аудиту: CSV (потоком) або XLSX, фільтри from / to / detachment / category."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+
+    @query_budget(4)
+    def get(self, request, brigade_id: int, fmt: str):
+        exporter = EXPORTERS.get(fmt)
+        if exporter is None:
+            return Response({"message":"unsupported format, expected csv or xlsx"}, status=404)
+        get_object_or_404(Brigade, id=brigade_id)
+        params = request.query_params
+        bounds = {}
+        for key in ("from", "to"):
+            if params.get(key):
+                try:
+                    bounds[key] = date.fromisoformat(params[key])
+                except ValueError:
+                    return Response({"message":f"{key} must be YYYY-MM-DD"}, status=400)
+        try:
+            detachment_id = int(params["detachment"]) if params.get("detachment") else None
+        except ValueError:
+            return Response({"message":"detachment must be an integer"}, status=400)
+        qs = get_scope(request.user).equipment(export_queryset(
+            brigade_id, bounds.get("from"), bounds.get("to"),
+            detachment_id=detachment_id, category=params.get("category"),
+        ), "equipment__")
+        filename = f"testing-brigade-{brigade_id}.{fmt}"
+        try:
+            return asgi_streaming(request, exporter(iter_export_rows(qs), filename))
+        except ExportFormatError as exc:
+            return Response({"message": str(exc)}, status=400)
+
+
+class StatsView(APIView):
+    """Дашборд: спорядження бригади / загонів за категоріями і результатом останнього випробування (core.stats)."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+
+    @query_budget(3)
+    def get(self, request):
+        try:
+            brigade_id = int(request.query_params.get("brigade") or request.user.brigade_id or 0)
+            detachment = request.query_params.get("detachment")
+            detachment_id = int(detachment) if detachment else None
+        except ValueError:
+            return Response({"message":"brigade and detachment must be integers"}, status=400)
+        if not brigade_id:
+            return Response({"message":"brigade required"}, status=400)
+        return Response(stats.brigade_stats(brigade_id, detachment_id, get_scope(request.user)))
+
+
+class SyncView(APIView):
+    """Дельта-синхронізація офлайн-клієнтів: зміни бригади й каталогу після токена `since` (core.changelog)."""
+    authentication_classes = [SessionIDAuthentication]
+    permission_classes = [permissions.IsAuthenticated, BrigadeScoped]
+    renderer_classes = [OrjsonRenderer, BrowsableAPIRenderer]
 
+    @query_budget(8)
+    def get(self, request):
+        try:
+            brigade_id = int(request.query_params.get("brigade") or request.user.brigade_id or 0)
+        except ValueError:
+            return Response({"message":"brigade must be an integer"}, status=400)
+        if not brigade_id:
+            return Response({"message":"brigade required"}, status=400)
+        return Response(changelog.sync_payload(
+            request, brigade_id, request.query_params.get("since"), scope=get_scope(request.user),
+        ))
+
+
+class MetricsView(APIView):
+    """Метрики запитів у текстовому форматі Prometheus (per-worker)."""
+    authentication_classes = [SessionIDAuthentication]
 
+    def get_permissions(self):
+        return [permissions.AllowAny() if settings.METRICS_PUBLIC else IsGod()]
 
-class TestingViewSet(viewsets.ModelViewSet):
+    @query_budget(2)
+    def get(self, request):
+        return HttpResponse(registry.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class TestingViewSet(FastListMixin, viewsets.ModelViewSet):
     authentication_classes = [SessionIDAuthentication]
     permission_classes = [IsRWOrGod]
     serializer_class = TestingSerializer
+    slow_serializer_class = TestingSerializer
+    fast_serializer_class = FastTestingSerializer
     queryset = Testing.objects.all()
-    parser_classes = [MultiPartParser, FormParser]
+    parser_classes = [HashingMultiPartParser, FormParser]
+    pagination_class = TestingPagination
+    query_budgets = {"list": 4, "retrieve": 4, "create": 18, "partial_update": 18, "update": 18}
+
+    def list(self, request, *args, **kwargs):
+        qs = self.filter_queryset(self.get_queryset())
+        return list_response(request, qs, self.get_lister(request), self.paginator, view=self)
+
+    def get_queryset(self):
+        return get_scope(self.request.user).equipment(super().get_queryset(), "equipment__")
+
+    # знімок last_test_* на Equipment оновлюється сигналом у тій самій транзакції
+    @transaction.atomic
+    def perform_create(self, serializer):
+        check_brigade(self.request.user, serializer.validated_data["equipment"].brigade_id)
+        serializer.save()
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        if "equipment" in serializer.validated_data:
+            check_brigade(self.request.user, serializer.validated_data["equipment"].brigade_id)
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
@@ -1,2 +1,7 @@
-import pymysql
-pymysql.install_as_MySQLdb()
+# C-драйвер mysqlclient (якщо встановлений) помітно швидший;
+# чистий Python pymysql — запасний варіант
+try:
+    import MySQLdb  # noqa: F401
+except ImportError:
+    import pymysql
+    pymysql.install_as_MySQLdb()
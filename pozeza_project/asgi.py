@@ -12,5 +12,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pozeza_project.settings')
+# GET-ендпоінти списків обслуговують async-view (core.async_views); POZEZA_ASYNC_VIEWS=0 — вимкнути
+os.environ.setdefault('POZEZA_ASYNC_VIEWS', '1')
+# постійні з'єднання під ASGI не працюють як слід — замість них пул (core.backends.mysql)
+os.environ.setdefault('POZEZA_DB_POOL', '1')
 
 application = get_asgi_application()
+
+# фонове прибирання сесій, якщо задано AUTH_SESSION_REAP_INTERVAL
+from core.session_reaper import start_scheduler  # noqa: E402
+
+start_scheduler()
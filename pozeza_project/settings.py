@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -50,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.QueryMetricsMiddleware',  # першим: міряє весь запит
     'corsheaders.middleware.CorsMiddleware',  # має бути високо в списку
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -84,16 +86,36 @@ WSGI_APPLICATION = 'pozeza_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# З'єднання (core.backends.mysql):
+#  * WSGI — постійні з'єднання на CONN_MAX_AGE секунд з перевіркою перед повторним використанням;
+#  * ASGI — CONN_MAX_AGE=0 + in-process пул (POZEZA_DB_POOL=1 ставить asgi.py).
+DB_POOL = os.environ.get('POZEZA_DB_POOL', '0') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE':   'django.db.backends.mysql',
+        'ENGINE':   'core.backends.mysql',
         'NAME':     'dsns',
         'USER':     'root',
         'PASSWORD': 'test_pass',
         'HOST':     '127.0.0.1',
         'PORT':     '3307',
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('POZEZA_DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {'max_size': 10, 'max_idle': 300, 'check_after': 10} if DB_POOL else None,
+    }
+}
+
+
+# Cache
+# Версії кешу відповідей (core.versioning) живуть тут — при кількох воркерах
+# потрібен спільний бекенд (memcached / redis), `check --deploy` попереджає (core.W002).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pozeza',
     }
 }
+RESPONSE_CACHE_TTL = 300  # секунд, кеш per-brigade відповідей (core.response_cache)
 
 
 # Password validation
@@ -166,5 +188,49 @@ CORS_ALLOW_ALL_ORIGINS = True
 # ковзна (sliding) сесія, хвилин
 AUTH_SESSION_EXP_MIN = 10
 
+# кеш сесій (core.session_cache)
+AUTH_SESSION_CACHE_TTL = 60        # секунд, скільки запис живе в кеші без звернення до БД
+AUTH_SESSION_CACHE_SIZE = 10000    # LRU-ліміт in-process кешу
+# спільний між воркерами кеш (і версії для відкликання), лише redis / memcached —
+# LocMem не пройде system check; None — лише in-process: logout у інших воркерах
+# діє із затримкою до AUTH_SESSION_CACHE_TTL
+AUTH_SESSION_CACHE_ALIAS = os.environ.get('POZEZA_SESSION_CACHE_ALIAS') or None
+AUTH_SESSION_FLUSH_SEC = 30        # write-behind: як часто скидати продовження expires_at
+AUTH_SESSION_FLUSH_BATCH = 500
+
+# прибирання протермінованих сесій (core.session_reaper, команда reap_sessions)
+AUTH_SESSION_REAP_INTERVAL = int(os.environ.get('POZEZA_SESSION_REAP_SEC', '0')) or None  # секунд; None — лише cron
+AUTH_MAX_SESSIONS_PER_USER = 20    # старші сесії видаляються при логіні; None — без ліміту
+
+# область доступу (core.scoping): RO/RW бачать лише свою бригаду; з True — ще й лише
+# призначені їм загони (User.detachments; без призначених — уся бригада)
+AUTH_SCOPE_DETACHMENTS = False
+
+# дельта-синхронізація (core.changelog, /api/sync)
+SYNC_MAX_CHANGES = 5000            # змін на відповідь на потік; далі more=true
+SYNC_TOMBSTONE_DAYS = 30           # prune_sync_log: старші надгробки прибираються, клієнти з давнім токеном — reset
+
+# віддавати дерево бригад у відповіді /api/login для адмінів (інакше — лише /api/admin/tree)
+AUTH_LOGIN_ADMIN_TREE = True
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# async read-view (core.async_views) — вмикається в asgi.py; під WSGI лише синхронні view
+ASYNC_READ_VIEWS = os.environ.get('POZEZA_ASYNC_VIEWS', '0') == '1'
+
+# файли актів (core.uploads): максимальний розмір одного файлу
+ACT_FILE_MAX_SIZE = 25 * 1024 * 1024
+
+# захищена віддача файлів актів (core.file_serving): None | "nginx" | "apache"
+PROTECTED_MEDIA_SERVER = None
+PROTECTED_MEDIA_INTERNAL_URL = '/protected-media/'  # internal location nginx → MEDIA_ROOT
+
+# масовий імпорт (core.bulk)
+BULK_IMPORT_MAX_ROWS = 20000
+
+# інструментація (core.instrumentation)
+SERVER_TIMING = True                        # заголовок Server-Timing у кожній відповіді
+# перевищення бюджету SQL: True — виняток (тести вмикають явно, core.tests.ApiTestCase), інакше warning
+QUERY_BUDGET_STRICT = os.environ.get('POZEZA_QUERY_BUDGET_STRICT') == '1'
+METRICS_PUBLIC = DEBUG                      # /api/metrics без авторизації (для Prometheus у мережі)
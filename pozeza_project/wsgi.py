@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pozeza_project.settings')
 
 application = get_wsgi_application()
+
+# фонове прибирання сесій, якщо задано AUTH_SESSION_REAP_INTERVAL
+from core.session_reaper import start_scheduler  # noqa: E402
+
+start_scheduler()